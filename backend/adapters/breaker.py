@@ -0,0 +1,247 @@
+"""Per-host circuit breakers for provider requests.
+
+A breaker starts ``closed``. After ``BREAKER_FAILURES`` consecutive
+failures (connection errors, timeouts, 5xx) it goes ``open`` and callers
+fail fast instead of retrying with backoff. Once ``BREAKER_RESET_SEC``
+has passed it is ``half_open``: a single probe request is let through,
+closing the breaker on success or opening it again on failure.
+"""
+
+import os
+import threading
+import time
+import typing as t
+from urllib.parse import urlsplit
+
+from .. import ledger
+from ..deadline import bounded
+from ..metrics import CIRCUIT_STATE, PROVIDER_REQUEST_SECONDS
+from ..tracing import record_call
+from .httpcache import HTTP_CACHE, Parse
+
+State = t.Literal["closed", "open", "half_open"]
+
+# consecutive failures that open a breaker
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", "5"))
+# seconds an open breaker waits before letting a probe through
+BREAKER_RESET_SEC = float(os.getenv("BREAKER_RESET_SEC", "30"))
+
+# gauge values per state
+_STATE_VALUES: dict[State, int] = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a host whose circuit is open."""
+
+
+class CircuitBreaker:  # pylint: disable=too-many-instance-attributes
+    """Closed / open / half-open breaker for one provider host.
+
+    :param host: Host name, used as the metrics label.
+    :param failures: Consecutive failures that open the breaker.
+    :param reset_sec: Seconds before an open breaker allows a probe.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        failures: int = BREAKER_FAILURES,
+        reset_sec: float = BREAKER_RESET_SEC,
+    ) -> None:
+        """Initialize a closed breaker."""
+        self.host = host
+        self.max_failures = failures
+        self.reset_sec = reset_sec
+        self.failures = 0
+        self.opened_at = 0.0
+        self._open = False
+        self._probing = False
+        # thread that claimed the probe, if any
+        self._prober: int | None = None
+        self._lock = threading.Lock()
+        self._report("closed")
+
+    def _report(self, state: State) -> None:
+        CIRCUIT_STATE.labels(host=self.host).set(_STATE_VALUES[state])
+
+    def _state(self) -> State:
+        if not self._open:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_sec:
+            return "open"
+        return "half_open"
+
+    @property
+    def state(self) -> State:
+        """Current state of the breaker.
+
+        :return: One of closed, open or half_open.
+        """
+        with self._lock:
+            return self._state()
+
+    def is_open(self) -> bool:
+        """Check whether requests to the host are being refused.
+
+        :return: True while the breaker is open.
+        """
+        return self.state == "open"
+
+    def allow(self) -> bool:
+        """Check whether a request may be made, claiming the probe.
+
+        :return: True if the caller may send the request.
+        """
+        with self._lock:
+            state = self._state()
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                self._prober = threading.get_ident()
+                self._report("half_open")
+                return True
+            return state == "closed"
+
+    def release(self) -> None:
+        """Give up a probe this thread claimed but did not send.
+
+        A caller that leaves without recording an outcome (deadline,
+        cancellation) must release its probe, or the breaker would stay
+        half-open with the probe taken forever. Does nothing once an
+        outcome was recorded or if another thread holds the probe.
+        """
+        with self._lock:
+            if self._probing and self._prober == threading.get_ident():
+                self._probing = False
+
+    def record_success(self) -> None:
+        """Record a response from the host, closing the breaker."""
+        with self._lock:
+            self.failures = 0
+            self._open = False
+            self._probing = False
+            self._report("closed")
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the breaker if needed."""
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.max_failures:
+                self._open = True
+                self.opened_at = time.monotonic()
+                self._report("open")
+            self._probing = False
+
+    def record_status(self, status: int) -> None:
+        """Record a response by status; only 5xx counts as a failure.
+
+        :param status: HTTP status code of the response.
+        """
+        if status >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def breaker_for(host: str) -> CircuitBreaker:
+    """Get the breaker of a host, creating a closed one.
+
+    :param host: The host name.
+    :return: The host's breaker.
+    """
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(host)
+        if breaker is None:
+            breaker = _BREAKERS[host] = CircuitBreaker(host)
+        return breaker
+
+
+def reset_breakers() -> None:
+    """Forget all breakers, closing every circuit."""
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
+
+
+def observe_request(
+    host: str,
+    status: str,
+    start: float,
+    response: t.Any = None,
+) -> None:
+    """Record a provider request in metrics and the job trace.
+
+    :param host: Provider host.
+    :param status: Response status, or ``error`` without a response.
+    :param start: ``time.monotonic()`` when the request was sent.
+    :param response: The response, if any.
+    """
+    seconds = time.monotonic() - start
+    PROVIDER_REQUEST_SECONDS.labels(host=host, status=status).observe(seconds)
+    record_call(host, status, seconds, response)
+
+
+def httpx_get_json(
+    url: str,
+    params: dict[str, t.Any],
+    timeout: float = 10.0,
+    parse: Parse | None = None,
+) -> t.Any:
+    """GET a JSON document with httpx through the host's breaker.
+
+    The request is conditional when a validated response is cached.
+
+    :param url: URL to fetch.
+    :param params: Query parameters.
+    :param timeout: Request timeout in seconds.
+    :param parse: Parser for the body text, instead of ``json()``.
+    :return: The decoded JSON body, or what ``parse`` made of it.
+    :raises CircuitOpenError: If the host's circuit is open.
+    :raises TimeoutError: If the fetch deadline has passed.
+    """
+    # loaded on first use; only the httpx-based adapters need it
+    import httpx  # pylint: disable=import-outside-toplevel
+
+    breaker = breaker_for(urlsplit(url).hostname or "")
+    if not breaker.allow():
+        raise CircuitOpenError(breaker.host)
+    try:
+        timeout = bounded(timeout)
+        if timeout <= 0:
+            raise TimeoutError(f"deadline exceeded for {url}")
+        ledger.record_call(breaker.host)
+        with httpx.Client(timeout=timeout) as client:
+            start = time.monotonic()
+            try:
+                response = client.get(
+                    url,
+                    params=params,
+                    headers=HTTP_CACHE.request_headers(url, params, parse),
+                )
+                if response.status_code != 304:
+                    response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                breaker.record_status(e.response.status_code)
+                observe_request(
+                    breaker.host,
+                    str(e.response.status_code),
+                    start,
+                    e.response,
+                )
+                raise
+            except httpx.RequestError:
+                breaker.record_failure()
+                observe_request(breaker.host, "error", start)
+                raise
+        observe_request(
+            breaker.host,
+            str(response.status_code),
+            start,
+            response,
+        )
+        breaker.record_success()
+    finally:
+        breaker.release()
+    return HTTP_CACHE.resolve(url, params, response, parse)
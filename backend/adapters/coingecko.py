@@ -1,11 +1,17 @@
 """CoinGecko adapter for fetching parent data."""
 
 import logging
-import time
-
-import httpx
+import os
 
+from ..deadline import bounded
+from ..interning import coin_url
+from ..jobs import cancellable_sleep
 from . import AdapterProtocol
+from .breaker import CircuitOpenError, httpx_get_json
+
+HOST = "api.coingecko.com"
+# seconds to wait for CoinGecko when fetched alongside other providers
+TIMEOUT_SEC = float(os.getenv("CG_TIMEOUT_SEC", "90"))
 
 
 class CoinGeckoAdapter(
@@ -60,15 +66,11 @@ class CoinGeckoAdapter(
 
             try:
                 # Rate limit: sleep ~250ms between requests
-                time.sleep(0.25)
+                cancellable_sleep(bounded(0.25))
 
-                url = "https://api.coingecko.com/api/v3/search"
+                url = f"https://{HOST}/api/v3/search"
                 params = {"query": term.strip()}
-
-                with httpx.Client(timeout=10.0) as client:
-                    response = client.get(url, params=params)
-                    response.raise_for_status()
-                    data = response.json() or {}
+                data = httpx_get_json(url, params) or {}
 
                 coins = data.get("coins", [])
                 # Limit to ~10 per term
@@ -81,6 +83,9 @@ class CoinGeckoAdapter(
                 ids_count = len([c for c in coins[:10] if c.get("id")])
                 logging.info("[CG] term=%s ids=%s", term, ids_count)
 
+            except CircuitOpenError:
+                # Provider is down; the remaining terms would fail too
+                break
             except Exception:  # pylint: disable=broad-exception-caught
                 # Continue with other terms if one fails
                 continue
@@ -99,9 +104,9 @@ class CoinGeckoAdapter(
 
         try:
             # Rate limit: sleep ~250ms before request
-            time.sleep(0.25)
+            cancellable_sleep(bounded(0.25))
 
-            url = "https://api.coingecko.com/api/v3/coins/markets"
+            url = f"https://{HOST}/api/v3/coins/markets"
             params = {
                 "vs_currency": "usd",
                 "ids": ",".join(coin_ids),
@@ -111,10 +116,7 @@ class CoinGeckoAdapter(
                 "sparkline": "false",
             }
 
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(url, params=params)
-                response.raise_for_status()
-                data = response.json() or []
+            data = httpx_get_json(url, params) or []
 
             rows = data if isinstance(data, list) else []
             # Log market data results
@@ -150,7 +152,7 @@ class CoinGeckoAdapter(
                 "name": item.get("name", ""),
                 "symbol": item.get("symbol", ""),
                 "source": "coingecko",
-                "url": f"https://www.coingecko.com/en/coins/{coin_id}",
+                "url": coin_url(coin_id),
                 "image": item.get("image", ""),
                 "marketCap": item.get("market_cap", 0) or 0,
                 "vol24h": volume,
@@ -158,7 +160,7 @@ class CoinGeckoAdapter(
                 "score": score,
                 "children": [
                     {
-                        "url": f"https://www.coingecko.com/en/coins/{coin_id}",
+                        "url": coin_url(coin_id),
                         "evidence": "coingecko_page",
                     },
                 ],
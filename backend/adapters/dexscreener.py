@@ -1,11 +1,19 @@
 """DexScreener adapter for fetching parent data."""
 
-import time
+import os
+from collections.abc import Iterable
 from typing import Any
 
-import httpx
-
+from ..deadline import bounded
+from ..interning import interned
+from ..jobs import cancellable_sleep
 from . import AdapterProtocol
+from .breaker import CircuitOpenError, httpx_get_json
+from .jsonstream import iter_array
+
+HOST = "api.dexscreener.com"
+# seconds to wait for DexScreener when fetched alongside other providers
+TIMEOUT_SEC = float(os.getenv("DS_TIMEOUT_SEC", "30"))
 
 
 class DexScreenerAdapter(
@@ -37,7 +45,7 @@ class DexScreenerAdapter(
         # Query each term with rate limiting
         for i, term in enumerate(capped_terms):
             if i > 0:  # Sleep between queries (except first)
-                time.sleep(0.2)  # 200ms rate limit
+                cancellable_sleep(bounded(0.2))  # 200ms rate limit
 
             pairs = self._query_dexscreener(term)
             all_pairs.extend(pairs)
@@ -54,20 +62,22 @@ class DexScreenerAdapter(
         :param query: Search query term.
         :return: List of pair data from API response.
         """
+        import httpx  # pylint: disable=import-outside-toplevel
+
         try:
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(
-                    "https://api.dexscreener.com/latest/dex/search",
-                    params={"q": query},
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                # Extract pairs from response
-                pairs = data.get("pairs", [])
-                return pairs if isinstance(pairs, list) else []
+            data = httpx_get_json(
+                f"https://{HOST}/latest/dex/search",
+                {"q": query},
+                parse=self._parse_search,
+            )
+
+            # Extract pairs from response
+            pairs = data.get("pairs", [])
+            return pairs if isinstance(pairs, list) else []
 
         except (
+            CircuitOpenError,
+            TimeoutError,
             httpx.RequestError,
             httpx.HTTPStatusError,
             KeyError,
@@ -76,13 +86,24 @@ class DexScreenerAdapter(
             # Return empty list on any API error
             return []
 
+    def _parse_search(self, text: str) -> dict[str, Any]:
+        """Stream a search response body, keeping only unique pairs.
+
+        Pairs are decoded one at a time and duplicates are dropped as they
+        are read, so the full pairs array is never held in memory.
+
+        :param text: Response body text.
+        :return: Search result with the deduplicated ``pairs``.
+        """
+        return {"pairs": self._deduplicate_pairs(iter_array(text, "pairs"))}
+
     def _deduplicate_pairs(
         self,
-        pairs: list[dict[str, Any]],
+        pairs: Iterable[dict[str, Any]],
     ) -> list[dict[str, Any]]:
         """Deduplicate pairs by token address and symbol.
 
-        :param pairs: List of pair data from API.
+        :param pairs: Pair data from API.
         :return: Deduplicated list of pairs.
         """
         seen = set()
@@ -162,7 +183,7 @@ class DexScreenerAdapter(
 
         # Get pair URL and chain info
         pair_url = pair.get("pairUrl", "")
-        chain_id = pair.get("chainId", "")
+        chain_id = interned(pair.get("chainId", ""))
 
         # Build children (evidence/pairs)
         children = self._build_children(pair, vol_24h)
@@ -190,7 +211,7 @@ class DexScreenerAdapter(
         :return: List of child dictionaries.
         """
         pair_url = pair.get("pairUrl", "")
-        chain_id = pair.get("chainId", "")
+        chain_id = interned(pair.get("chainId", ""))
 
         if not pair_url or not chain_id:
             return []
@@ -199,7 +220,7 @@ class DexScreenerAdapter(
             {
                 "pair": pair.get("pairAddress", ""),
                 "chain": chain_id,
-                "dex": pair.get("dexId", ""),
+                "dex": interned(pair.get("dexId", "")),
                 "url": pair_url,
                 "vol24h": vol_24h,
             },
@@ -0,0 +1,177 @@
+"""HTTP response cache for provider GETs.
+
+Responses that carry an ``ETag`` or ``Last-Modified`` validator are kept
+(up to ``HTTP_CACHE_MAX_ENTRIES``, least recently used first out) and the
+next request for the same URL and parameters is made conditional. A
+``304 Not Modified`` reuses the cached body, so unchanged provider data is
+neither downloaded nor parsed again. Bodies are parsed on first use only
+and the parsed value is shared, like the raw provider caches. A caller can
+pass its own ``parse`` function for the body text (e.g. one that streams
+and filters a large array); its results are cached under their own keys.
+"""
+
+import os
+import threading
+import typing as t
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from ..metrics import CACHE_EVENTS
+from ..tracing import record_cache
+
+HTTP_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "256"))
+
+Key = tuple[str, tuple[tuple[str, str], ...], str]
+Parse = t.Callable[[str], t.Any]
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).hostname or url
+
+
+def _event(url: str, event: str) -> None:
+    CACHE_EVENTS.labels(cache="http", provider=_host(url), event=event).inc()
+    if event != "eviction":
+        record_cache("http", event)
+
+
+class _Entry:  # pylint: disable=too-few-public-methods
+    __slots__ = (
+        "etag",
+        "last_modified",
+        "size",
+        "_response",
+        "_parse",
+        "_data",
+        "_lock",
+    )
+
+    def __init__(self, response: t.Any, parse: Parse | None) -> None:
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        content = getattr(response, "content", None)
+        # bytes downloaded for the body, 0 if unknown
+        self.size = len(content) if isinstance(content, bytes) else 0
+        self._response: t.Any = response
+        self._parse = parse
+        self._data: t.Any = None
+        # a 304 may resolve the entry while its 200 is still parsing
+        self._lock = threading.Lock()
+
+    def body(self) -> t.Any:
+        """Parse the body on first use.
+
+        :return: The decoded JSON body, or what ``parse`` made of it.
+        """
+        with self._lock:
+            if self._response is not None:
+                if self._parse is None:
+                    self._data = self._response.json()
+                else:
+                    self._data = self._parse(self._response.text)
+                # the parsed value replaces the raw body
+                self._response = None
+            return self._data
+
+
+class HttpCache:
+    """LRU cache of validated provider responses.
+
+    :param max_entries: Maximum number of cached responses.
+    """
+
+    def __init__(self, max_entries: int = HTTP_CACHE_MAX_ENTRIES) -> None:
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Key, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(
+        url: str,
+        params: t.Mapping[str, t.Any] | None,
+        parse: Parse | None,
+    ) -> Key:
+        items = sorted((k, str(v)) for k, v in (params or {}).items())
+        name = getattr(parse, "__qualname__", "") if parse else ""
+        return url, tuple(items), name
+
+    def request_headers(
+        self,
+        url: str,
+        params: t.Mapping[str, t.Any] | None,
+        parse: Parse | None = None,
+    ) -> dict[str, str]:
+        """Get conditional request headers for a cached response.
+
+        :param url: Request URL.
+        :param params: Query parameters.
+        :param parse: Body parser the response will be resolved with.
+        :return: ``If-None-Match``/``If-Modified-Since`` headers, if any.
+        """
+        with self._lock:
+            entry = self._entries.get(self._key(url, params, parse))
+        headers: dict[str, str] = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def resolve(
+        self,
+        url: str,
+        params: t.Mapping[str, t.Any] | None,
+        response: t.Any,
+        parse: Parse | None = None,
+    ) -> t.Any:
+        """Get the JSON body of a response, using the cache for a 304.
+
+        :param url: Request URL.
+        :param params: Query parameters.
+        :param response: The provider response.
+        :param parse: Parser for the body text, instead of ``json()``.
+        :return: The decoded JSON body, or what ``parse`` made of it.
+        :raises KeyError: On a 304 for a response no longer cached.
+        """
+        key = self._key(url, params, parse)
+        with self._lock:
+            if response.status_code == 304:
+                entry = self._entries[key]
+                self._entries.move_to_end(key)
+                _event(url, "hit")
+            else:
+                # a full response for a cached key means it changed
+                _event(url, "expired" if key in self._entries else "miss")
+                entry = _Entry(response, parse)
+                if entry.etag or entry.last_modified:
+                    self._entries[key] = entry
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        evicted, _ = self._entries.popitem(last=False)
+                        _event(evicted[0], "eviction")
+                else:
+                    self._entries.pop(key, None)
+        return entry.body()
+
+    def sizes(self) -> list[tuple[str, str, int, int]]:
+        """Get the entries and body bytes held for each host.
+
+        :return: ``(cache, host, entries, bytes)`` rows.
+        """
+        hosts: dict[str, list[int]] = {}
+        with self._lock:
+            for (url, _, _), entry in self._entries.items():
+                totals = hosts.setdefault(_host(url), [0, 0])
+                totals[0] += 1
+                totals[1] += entry.size
+        return [("http", h, n, size) for h, (n, size) in sorted(hosts.items())]
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+
+HTTP_CACHE = HttpCache()
@@ -0,0 +1,68 @@
+"""Incremental decoding of large JSON provider responses.
+
+Provider search responses are an object with one large array member
+(DexScreener's ``pairs``). ``iter_array`` walks the object and yields the
+array's items one at a time, so callers can filter them as they go and
+only hold on to the few they keep, instead of building the whole document
+first. Other members are decoded and dropped.
+"""
+
+import json
+import re
+import typing as t
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SPACES = frozenset(" \t\n\r")
+
+
+def _skip(text: str, idx: int) -> int:
+    # provider bodies are usually compact, so check before matching
+    if text[idx : idx + 1] in _SPACES:
+        match = _WHITESPACE.match(text, idx)
+        return match.end() if match else idx
+    return idx
+
+
+def _expect(text: str, idx: int, chars: str) -> tuple[str, int]:
+    # consume one of ``chars`` and the whitespace around it
+    idx = _skip(text, idx)
+    char = text[idx : idx + 1]
+    if not char or char not in chars:
+        raise ValueError(f"expected one of {chars!r} at char {idx}")
+    return char, _skip(text, idx + 1)
+
+
+def iter_array(text: str, key: str) -> t.Iterator[t.Any]:
+    """Yield the items of an array member of a JSON object one by one.
+
+    A missing member, or one that is not an array, yields nothing.
+
+    :param text: JSON text of an object.
+    :param key: Name of the array member.
+    :yield: The decoded array items, in order.
+    :raises ValueError: If the text is not a valid JSON object.
+    """
+    _, idx = _expect(text, 0, "{")
+    if text[idx : idx + 1] == "}":
+        return
+    while True:
+        name, idx = _DECODER.raw_decode(text, idx)
+        if not isinstance(name, str):
+            raise ValueError(f"expected a member name at char {idx}")
+        _, idx = _expect(text, idx, ":")
+        if name == key and text[idx : idx + 1] == "[":
+            idx = _skip(text, idx + 1)
+            char = ","
+            if text[idx : idx + 1] == "]":
+                char, idx = "]", idx + 1
+            while char == ",":
+                item, idx = _DECODER.raw_decode(text, idx)
+                yield item
+                char, idx = _expect(text, idx, ",]")
+        else:
+            # decoded only to find where it ends
+            _, idx = _DECODER.raw_decode(text, idx)
+        char, idx = _expect(text, idx, ",}")
+        if char == "}":
+            return
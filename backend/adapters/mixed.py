@@ -1,9 +1,13 @@
 """Mixed adapter that merges DexScreener and CoinGecko data."""
 
+import functools
 import logging
+import typing as t
 from dataclasses import dataclass
 
-from . import AdapterProtocol
+from ..executor import fan_out
+from . import AdapterProtocol, coingecko, dexscreener
+from .breaker import breaker_for
 from .coingecko import CoinGeckoAdapter
 from .dexscreener import DexScreenerAdapter
 
@@ -39,23 +43,43 @@ class MixedAdapter(AdapterProtocol):  # pylint: disable=too-few-public-methods
         if not terms:
             return []
 
-        # Fetch data from both sources with error handling
-        cg_data = []
-        ds_data = []
-        cg_error = None
-        ds_error = None
-
-        try:
-            cg_data = self.cg_adapter.fetch_parents(narrative, terms)
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            cg_error = str(e)
-            logger.warning("[MIXED] %s CG failed: %s", narrative, cg_error)
-
-        try:
-            ds_data = self.ds_adapter.fetch_parents(narrative, terms)
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            ds_error = str(e)
-            logger.warning("[MIXED] %s DS failed: %s", narrative, ds_error)
+        # Fetch both sources concurrently, skipping any whose circuit is
+        # open; a failed or timed out source contributes nothing
+        calls: dict[str, t.Callable[[], list[dict]]] = {}
+        if breaker_for(coingecko.HOST).is_open():
+            logger.warning("[MIXED] %s CG skipped: circuit open", narrative)
+        else:
+            calls["CG"] = functools.partial(
+                self.cg_adapter.fetch_parents,
+                narrative,
+                terms,
+            )
+        if breaker_for(dexscreener.HOST).is_open():
+            logger.warning("[MIXED] %s DS skipped: circuit open", narrative)
+        else:
+            calls["DS"] = functools.partial(
+                self.ds_adapter.fetch_parents,
+                narrative,
+                terms,
+            )
+
+        results = fan_out(
+            calls,
+            {"CG": coingecko.TIMEOUT_SEC, "DS": dexscreener.TIMEOUT_SEC},
+        )
+        data: dict[str, list[dict]] = {"CG": [], "DS": []}
+        for name, result in results.items():
+            if isinstance(result, Exception):
+                logger.warning(
+                    "[MIXED] %s %s failed: %s",
+                    narrative,
+                    name,
+                    str(result),
+                )
+            else:
+                data[name] = result
+        cg_data = data["CG"]
+        ds_data = data["DS"]
 
         # Merge the data according to the specified rules
         merged_data = self._merge_data(cg_data, ds_data, narrative, terms)
@@ -0,0 +1,206 @@
+"""Rate limiters for provider requests.
+
+``TokenBucket`` enforces a fixed rate. ``AdaptiveLimiter`` starts from a
+configured rate and moves it towards the provider's real limit (AIMD):
+every successful response adds a small step, every 429 halves it, and
+rate-limit headers pause or cap it. One limiter is kept per host so a
+busy provider never slows down another. Waits never outlast the current
+fetch deadline; the caller checks the budget before sending.
+"""
+
+import email.utils
+import os
+import threading
+import time
+import typing as t
+
+from ..deadline import bounded
+from ..jobs import cancellable_sleep
+from ..metrics import LIMITER_WAIT_SECONDS, RATE_LIMIT_RPS
+from ..tracing import record_wait
+
+# limits for hosts without a configured limiter
+RATE_DEFAULT_RPS = float(os.getenv("RATE_DEFAULT_RPS", "2"))
+RATE_DEFAULT_BURST = int(os.getenv("RATE_DEFAULT_BURST", "2"))
+
+# multiplicative decrease applied on 429
+DECREASE_FACTOR = 0.5
+# additive increase per success, as a fraction of the rate range
+INCREASE_STEPS = 20
+
+# reset values above this are epoch timestamps, not seconds
+_EPOCH_THRESHOLD = 1_000_000_000
+
+_REMAINING_HEADERS = ("x-ratelimit-remaining", "ratelimit-remaining")
+_RESET_HEADERS = ("x-ratelimit-reset", "ratelimit-reset")
+
+
+class TokenBucket:  # pylint: disable=too-few-public-methods
+    """Thread-safe token bucket rate limiter.
+
+    :param rps: Requests per second (tokens per second).
+    :param burst: Maximum burst capacity.
+    """
+
+    def __init__(self, rps: float, burst: int) -> None:
+        """Initialize token bucket."""
+        self.rps = rps
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.last_refill
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rps)
+        self.last_refill = now
+
+    def acquire(self) -> None:
+        """Acquire a token, blocking if necessary."""
+        with self._lock:
+            self._refill(time.monotonic())
+            # Reserve the token now so concurrent callers queue up
+            self.tokens -= 1.0
+            wait_time = -self.tokens / self.rps if self.tokens < 0 else 0.0
+        if wait_time > 0:
+            cancellable_sleep(bounded(wait_time))
+
+
+def _header(headers: t.Mapping[str, str], names: tuple[str, ...]) -> str:
+    lowered = {k.lower(): v for k, v in headers.items()}
+    for name in names:
+        if name in lowered:
+            return str(lowered[name]).strip()
+    return ""
+
+
+def _parse_seconds(value: str) -> float | None:
+    # seconds, epoch seconds or an HTTP date, relative to now
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, when.timestamp() - time.time())
+    if seconds > _EPOCH_THRESHOLD:
+        seconds -= time.time()
+    return max(0.0, seconds)
+
+
+class AdaptiveLimiter(TokenBucket):
+    """Token bucket whose rate follows provider feedback (AIMD).
+
+    :param host: Host name, used as the metrics label.
+    :param rps: Initial requests per second.
+    :param burst: Maximum burst capacity.
+    :param min_rps: Lowest rate a 429 can push the limiter to.
+    :param max_rps: Highest rate successes can raise the limiter to.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        rps: float,
+        burst: int,
+        *,
+        min_rps: float | None = None,
+        max_rps: float | None = None,
+    ) -> None:
+        """Initialize the limiter."""
+        super().__init__(rps, burst)
+        self.host = host
+        self.min_rps = min_rps if min_rps is not None else rps / 8
+        self.max_rps = max_rps if max_rps is not None else rps * 2
+        self.step = (self.max_rps - self.min_rps) / INCREASE_STEPS
+        self.paused_until = 0.0
+        RATE_LIMIT_RPS.labels(host=host).set(self.rps)
+
+    def acquire(self) -> None:
+        """Wait out any pause requested by the provider, then a token."""
+        start = time.monotonic()
+        with self._lock:
+            pause = self.paused_until - start
+        if pause > 0:
+            cancellable_sleep(bounded(pause))
+        super().acquire()
+        waited = time.monotonic() - start
+        LIMITER_WAIT_SECONDS.labels(host=self.host).observe(waited)
+        record_wait("limiter", waited)
+
+    def _set_rate(self, rps: float) -> None:
+        now = time.monotonic()
+        # tokens earned so far accrue at the old rate
+        self._refill(now)
+        self.rps = min(self.max_rps, max(self.min_rps, rps))
+        RATE_LIMIT_RPS.labels(host=self.host).set(self.rps)
+
+    def _pause(self, seconds: float) -> None:
+        self.paused_until = max(
+            self.paused_until,
+            time.monotonic() + seconds,
+        )
+
+    def feedback(self, status: int, headers: t.Mapping[str, str]) -> None:
+        """Adjust the rate from a provider response.
+
+        :param status: HTTP status code of the response.
+        :param headers: Response headers.
+        """
+        with self._lock:
+            if status == 429:
+                self._set_rate(self.rps * DECREASE_FACTOR)
+                retry_after = _parse_seconds(
+                    _header(headers, ("retry-after",)),
+                )
+                if retry_after:
+                    self._pause(retry_after)
+            elif 200 <= status < 300:
+                self._set_rate(self.rps + self.step)
+
+            remaining = _header(headers, _REMAINING_HEADERS)
+            reset = _parse_seconds(_header(headers, _RESET_HEADERS))
+            if not remaining.isdigit() or not reset:
+                return
+            if int(remaining) == 0:
+                # quota exhausted: hold every caller until the window resets
+                self._pause(reset)
+            elif int(remaining) / reset < self.rps:
+                # spread what is left of the quota over the window
+                self._set_rate(int(remaining) / reset)
+
+
+_LIMITERS: dict[str, AdaptiveLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def register_limiter(limiter: AdaptiveLimiter) -> AdaptiveLimiter:
+    """Use a limiter for its host, replacing any existing one.
+
+    :param limiter: The limiter to register.
+    :return: The registered limiter.
+    """
+    with _LIMITERS_LOCK:
+        _LIMITERS[limiter.host] = limiter
+    return limiter
+
+
+def limiter_for(host: str) -> AdaptiveLimiter:
+    """Get the limiter of a host, creating one with default limits.
+
+    :param host: The host name.
+    :return: The host's limiter.
+    """
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(host)
+        if limiter is None:
+            limiter = AdaptiveLimiter(
+                host,
+                RATE_DEFAULT_RPS,
+                RATE_DEFAULT_BURST,
+            )
+            _LIMITERS[host] = limiter
+        return limiter
@@ -0,0 +1,42 @@
+"""Retry policy for provider GETs.
+
+This is the only retry layer: the HTTP session does not retry on its
+own, so attempts and backoff never stack.
+"""
+
+import os
+import random
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with jitter for idempotent provider GETs."""
+
+    attempts: int = 3
+    base_delay: float = 0.8
+    max_backoff: float = 30.0
+    jitter: float = 0.3
+
+    def backoff(self, attempt: int) -> float:
+        """Get the delay before the attempt after ``attempt``.
+
+        :param attempt: Zero-based number of the attempt that failed.
+        :return: Delay in seconds.
+        """
+        return min(
+            self.base_delay * (2**attempt) + random.uniform(0, self.jitter),
+            self.max_backoff,
+        )
+
+    @staticmethod
+    def retryable(status: int) -> bool:
+        """Check whether a response status is worth retrying.
+
+        :param status: HTTP status code.
+        :return: True for 429 and 5xx.
+        """
+        return status == 429 or 500 <= status < 600
+
+
+RETRY = RetryPolicy(attempts=int(os.getenv("RETRY_ATTEMPTS", "3")))
@@ -3,25 +3,66 @@
 # pylint: disable=too-many-positional-arguments,too-many-lines
 # pylint: disable=broad-exception-caught
 
+import functools
+import json
 import logging
 import os
 import random
+import threading
 import time
 import typing as t
-
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-
+from urllib.parse import urlsplit
+
+from .. import ledger
+from ..deadline import bounded, remaining
+from ..executor import fan_out, hedged, map_concurrent
+from ..interning import coin_url, interned
+from ..jobs import cancellable_sleep, checkpoint
+from ..metrics import (
+    BACKOFF_SECONDS,
+    CACHE_EVENTS,
+    CACHE_SIZES,
+    RETRIES,
+    STAGE_SECONDS,
+)
+from ..tracing import record_cache, record_wait
+from .breaker import breaker_for, observe_request
+from .coingecko import HOST as CG_HOST
+from .coingecko import TIMEOUT_SEC as CG_TIMEOUT_SEC
+from .dexscreener import HOST as DS_HOST
+from .dexscreener import TIMEOUT_SEC as DS_TIMEOUT_SEC
+from .httpcache import HTTP_CACHE, Parse
+from .jsonstream import iter_array
+from .ratelimit import AdaptiveLimiter, limiter_for, register_limiter
 from .registry import get_adapter_names, make_adapter, register_adapter
+from .retry import RETRY
 
 # global ttl for raw provider results (seconds)
 TTL_SEC = int(os.getenv("SOURCE_TTL", "60"))
+# ttl for CoinGecko term searches (seconds)
+SEARCH_TTL_SEC = 900
 
 # Rate limiting configuration
 CG_RPS = float(os.getenv("CG_RPS", "0.5"))  # max requests per second
 CG_BURST = int(os.getenv("CG_BURST", "1"))  # allow short bursts
 CG_JITTER_MS = int(os.getenv("CG_JITTER_MS", "250"))  # jitter in milliseconds
+# per-attempt timeout, further capped by the fetch deadline (seconds)
+REQUEST_TIMEOUT_SEC = float(os.getenv("REQUEST_TIMEOUT_SEC", "10"))
+# race a second request after this many seconds, 0 disables hedging
+HEDGE_AFTER_SEC = float(os.getenv("HEDGE_AFTER_SEC", "0"))
+# bounds for the adaptive CoinGecko rate
+CG_RPS_MIN = float(os.getenv("CG_RPS_MIN", str(CG_RPS / 8)))
+CG_RPS_MAX = float(os.getenv("CG_RPS_MAX", str(CG_RPS * 2)))
+# DexScreener search rate (it allows 300 a minute); the burst lets a
+# narrative's searches go out together
+DS_RPS = float(os.getenv("DS_RPS", "4"))
+DS_BURST = int(os.getenv("DS_BURST", "3"))
+# DexScreener parents kept per narrative
+DS_MAX_PARENTS = 25
+# synthetic provider: parents per term set, latency per term, random seed
+SYNTHETIC_PARENTS = int(os.getenv("SYNTHETIC_PARENTS", "25"))
+SYNTHETIC_LATENCY_MS = int(os.getenv("SYNTHETIC_LATENCY_MS", "0"))
+SYNTHETIC_SEED = int(os.getenv("SYNTHETIC_SEED", "0"))
 
 # shared raw cache across providers: (provider, normalized_terms) ->
 # (ts, items)
@@ -29,204 +70,232 @@ _raw_cache: dict[tuple[str, tuple[str, ...]], tuple[float, list[dict]]] = {}
 # back-compat alias for older tests/helpers that expect `_cache`
 _cache = _raw_cache
 
+# approximate bytes of each raw cache entry, measured when the size gauges
+# are scraped rather than on every store; the entry is kept alongside so a
+# replaced value is measured again
+_raw_bytes: dict[
+    tuple[str, tuple[str, ...]],
+    tuple[tuple[float, list[dict]], int],
+] = {}
+# guards _raw_bytes between refresh threads and metrics scrapes
+_RAW_BYTES_LOCK = threading.Lock()
+
 # search cache for individual terms: term_lower -> (ts, coin_ids)
 _search_cache: dict[str, tuple[float, list[str]]] = {}
 
 # Module-level logger
 logger = logging.getLogger(__name__)
 
-# Module-level counter for CG API calls
-_CG_CALLS_COUNT = 0
+# Module-level rate limiter for CoinGecko, adapted from its responses
+_cg_limiter = register_limiter(
+    AdaptiveLimiter(
+        CG_HOST,
+        CG_RPS,
+        CG_BURST,
+        min_rps=CG_RPS_MIN,
+        max_rps=CG_RPS_MAX,
+    ),
+)
 
+# DexScreener searches are fanned out, so their pace is set here
+register_limiter(AdaptiveLimiter(DS_HOST, DS_RPS, DS_BURST))
 
-def get_cg_calls_count() -> int:
-    """Get the current number of CG API calls made.
+# Module-level Session for provider calls; _get_json does the retrying.
+# Created on first use, so importing the adapters does not load requests.
+sess: t.Any = None
+_SESSION_LOCK = threading.Lock()
 
-    :return: Current call count.
-    """
-    return _CG_CALLS_COUNT
 
+def _session() -> t.Any:
+    """Get the provider session, creating it on first use.
 
-def reset_cg_calls_count() -> None:
-    """Reset the CG API calls counter to zero."""
-    global _CG_CALLS_COUNT  # pylint: disable=global-statement
-    _CG_CALLS_COUNT = 0
+    :return: The shared requests session.
+    """
+    global sess  # pylint: disable=global-statement
+    with _SESSION_LOCK:
+        if sess is None:
+            import requests  # pylint: disable=import-outside-toplevel
+
+            sess = requests.Session()
+            sess.headers.update(
+                {
+                    "accept": "application/json",
+                    "user-agent": (
+                        "primecipher/0.0.0 (+https://primecipher.local)"
+                    ),
+                },
+            )
+        return sess
 
 
-class TokenBucket:  # pylint: disable=too-few-public-methods
-    """Simple token bucket rate limiter for CoinGecko requests.
+def _backoff(delay: float, host: str, reason: str) -> bool:
+    """Sleep before a retry unless that would overrun the fetch deadline.
 
-    :param rps: Requests per second (tokens per second).
-    :param burst: Maximum burst capacity.
+    :param delay: Seconds to sleep.
+    :param host: Provider host, for metrics.
+    :param reason: Why the request is retried (status or error).
+    :return: False if the retry should be abandoned instead.
     """
-
-    def __init__(self, rps: float, burst: int) -> None:
-        """Initialize token bucket."""
-        self.rps = rps
-        self.capacity = burst
-        self.tokens = float(burst)
-        self.last_refill = time.monotonic()
-
-    def acquire(self) -> None:
-        """Acquire a token, blocking if necessary."""
-        now = time.monotonic()
-        # Refill tokens based on time elapsed
-        elapsed = now - self.last_refill
-        self.tokens = min(self.capacity, self.tokens + elapsed * self.rps)
-        self.last_refill = now
-
-        # If no tokens available, wait
-        if self.tokens < 1.0:
-            wait_time = (1.0 - self.tokens) / self.rps
-            time.sleep(wait_time)
-            # Update tokens after waiting
-            now = time.monotonic()
-            elapsed = now - self.last_refill
-            self.tokens = min(self.capacity, self.tokens + elapsed * self.rps)
-            self.last_refill = now
-
-        # Consume one token
-        self.tokens -= 1.0
-
-
-# Module-level rate limiter for CoinGecko
-_cg_limiter = TokenBucket(CG_RPS, CG_BURST)
-
-# Module-level Session for CoinGecko calls
-sess = requests.Session()
-sess.headers.update(
-    {
-        "accept": "application/json",
-        "user-agent": "primecipher/0.0.0 (+https://primecipher.local)",
-    },
-)
-adapter = HTTPAdapter(
-    max_retries=Retry(
-        total=3,
-        connect=2,
-        read=2,
-        status=3,
-        backoff_factor=0.6,
-        status_forcelist=(429, 500, 502, 503, 504),
-        raise_on_status=False,
-        respect_retry_after_header=True,
-    ),
-)
-sess.mount("https://", adapter)
+    left = remaining()
+    if left is not None and delay >= left:
+        return False
+    RETRIES.labels(host=host, reason=reason).inc()
+    BACKOFF_SECONDS.labels(host=host).observe(delay)
+    record_wait("backoff", delay)
+    cancellable_sleep(delay)
+    return True
 
 
-def _get_json(
+def _get_json(  # pylint: disable=too-many-return-statements,too-many-branches
     url: str,
     params: dict[str, t.Any] | None = None,
+    parse: Parse | None = None,
 ) -> t.Optional[t.Union[dict, list]]:
-    """Get JSON data from URL with exponential backoff retry logic.
+    """Get JSON data from URL under the provider retry policy.
+
+    429s (honouring Retry-After), 5xx responses and transport errors are
+    retried with exponential backoff. Request timeouts and sleeps are
+    bounded by the current fetch deadline, and the call gives up once it
+    runs out. With ``HEDGE_AFTER_SEC`` set, a request that has not
+    answered by then is raced against a second identical one. Requests
+    are conditional when a validated response is cached. ``parse``, if
+    given, builds the result from the body text instead of ``json()``.
 
     Args:
         url: URL to fetch
         params: Query parameters
+        parse: Parser for the response body text
 
     Returns:
         JSON data or None on error
     """
-    # Backoff configuration
-    base_delay = 0.8  # base delay in seconds
-    max_backoff = 30.0  # maximum backoff in seconds
-    max_attempts = 3
-
-    for attempt in range(max_attempts):
+    import requests  # pylint: disable=import-outside-toplevel
+
+    host = urlsplit(url).hostname or ""
+    limiter = _cg_limiter if host == CG_HOST else limiter_for(host)
+    breaker = breaker_for(host)
+
+    def _hedge() -> None:
+        # the second request pays for its own token and call
+        limiter.acquire()
+        ledger.record_call(host)
+
+    for attempt in range(RETRY.attempts):
+        last = attempt == RETRY.attempts - 1
+        # Stop between provider calls once the refresh job is cancelled
+        checkpoint()
+        # Fail fast while the provider is down instead of backing off
+        if not breaker.allow():
+            logger.debug("[CG] circuit open for %s, skipping %s", host, url)
+            return None
         try:
-            # Rate limit: acquire token before making request
-            _cg_limiter.acquire()
-
-            # Increment CG calls counter
-            global _CG_CALLS_COUNT  # pylint: disable=global-statement
-            _CG_CALLS_COUNT += 1
+            # Rate limit: acquire token before making request; waits are
+            # cut short by the fetch deadline
+            limiter.acquire()
 
             # Add small random jitter after acquiring token
             jitter_ms = random.randint(0, CG_JITTER_MS)
-            time.sleep(jitter_ms / 1000.0)
+            cancellable_sleep(bounded(jitter_ms / 1000.0))
 
-            r = sess.get(url, params=params, timeout=10)
-
-            # Handle 429 (rate limited) with Retry-After header
-            if r.status_code == 429:
-                retry_after = r.headers.get("Retry-After")
-                if retry_after and retry_after.isdigit():
-                    sleep_time = int(retry_after)
-                    logger.debug(
-                        "[CG] 429 rate limited, sleeping %ds (Retry-After)",
-                        sleep_time,
-                    )
-                    time.sleep(sleep_time)
-                else:
-                    # Calculate exponential backoff with jitter
-                    jitter = random.uniform(0, 0.3)
-                    backoff_delay = min(
-                        base_delay * (2**attempt) + jitter,
-                        max_backoff,
-                    )
-                    logger.debug(
-                        "[CG] 429 rate limited, sleeping %.2fs (backoff)",
-                        backoff_delay,
-                    )
-                    time.sleep(backoff_delay)
-
-                # Continue to next attempt
-                continue
+            timeout = bounded(REQUEST_TIMEOUT_SEC)
+            if timeout <= 0:
+                logger.warning("[CG] deadline exceeded for url=%s", url)
+                return None
 
-            # Handle 5xx server errors with exponential backoff
-            if 500 <= r.status_code < 600 and attempt < max_attempts - 1:
-                # Don't sleep on last attempt
-                jitter = random.uniform(0, 0.3)
-                backoff_delay = min(
-                    base_delay * (2**attempt) + jitter,
-                    max_backoff,
+            # Count the call against the job's budget
+            ledger.record_call(host)
+
+            start = time.monotonic()
+            try:
+                r = hedged(
+                    functools.partial(
+                        _session().get,
+                        url,
+                        params=params,
+                        headers=HTTP_CACHE.request_headers(
+                            url,
+                            params,
+                            parse,
+                        ),
+                        timeout=timeout,
+                    ),
+                    HEDGE_AFTER_SEC,
+                    on_hedge=_hedge,
                 )
+            except requests.RequestException:
+                breaker.record_failure()
+                observe_request(host, "error", start)
+                raise
+            observe_request(host, str(r.status_code), start, r)
+            breaker.record_status(r.status_code)
+            limiter.feedback(r.status_code, r.headers)
+
+            if RETRY.retryable(r.status_code):
+                if last:
+                    break
+                delay = RETRY.backoff(attempt)
+                retry_after = r.headers.get("Retry-After")
+                if (
+                    r.status_code == 429
+                    and retry_after
+                    and retry_after.isdigit()
+                ):
+                    delay = int(retry_after)
                 logger.debug(
-                    "[CG] %d server error, sleeping %.2fs (backoff)",
+                    "[CG] %d response, sleeping %.2fs before retry %d/%d",
                     r.status_code,
-                    backoff_delay,
+                    delay,
+                    attempt + 2,
+                    RETRY.attempts,
                 )
-                time.sleep(backoff_delay)
+                if not _backoff(delay, host, "status"):
+                    logger.warning("[CG] deadline exceeded for url=%s", url)
+                    return None
                 continue
 
-            # For successful responses or non-retryable errors, raise
-            r.raise_for_status()
-            return r.json()
+            # For successful responses or non-retryable errors, raise;
+            # a 304 reuses the cached body of the conditional request
+            if r.status_code != 304:
+                r.raise_for_status()
+            return HTTP_CACHE.resolve(url, params, r, parse)
 
+        except requests.HTTPError as e:
+            # Non-retryable status: another attempt gets the same answer
+            logger.debug("[CG] giving up on %s: %s", url, e)
+            break
         except (requests.RequestException, ValueError, KeyError) as e:
             # Log debug for individual attempt failures
             logger.debug(
                 "[CG] attempt %d/%d failed: %s",
                 attempt + 1,
-                max_attempts,
+                RETRY.attempts,
                 e,
             )
 
-            # If this was the last attempt, log warning and return None
-            if attempt == max_attempts - 1:
-                logger.warning(
-                    "[CG] all %d attempts failed for url=%s params=%s",
-                    max_attempts,
-                    url,
-                    params,
-                )
-                return None
+            if last:
+                break
 
-            # Calculate backoff for next attempt
-            jitter = random.uniform(0, 0.3)
-            backoff_delay = min(
-                base_delay * (2**attempt) + jitter,
-                max_backoff,
-            )
+            # Back off before the next attempt
+            delay = RETRY.backoff(attempt)
             logger.debug(
                 "[CG] sleeping %.2fs before retry %d/%d",
-                backoff_delay,
+                delay,
                 attempt + 2,
-                max_attempts,
+                RETRY.attempts,
             )
-            time.sleep(backoff_delay)
-
+            if not _backoff(delay, host, "error"):
+                logger.warning("[CG] deadline exceeded for url=%s", url)
+                return None
+        finally:
+            # a probe left without an outcome must not block the host
+            breaker.release()
+
+    logger.warning(
+        "[CG] all %d attempts failed for url=%s params=%s",
+        RETRY.attempts,
+        url,
+        params,
+    )
     return None
 
 
@@ -239,20 +308,44 @@ def _normalize_terms(terms: list[str]) -> tuple[str, ...]:
     return tuple(sorted(norm))
 
 
+def _approx_bytes(value: t.Any) -> int:
+    # size of the compact JSON encoding, close to what a provider sent
+    return len(json.dumps(value, separators=(",", ":"), default=str))
+
+
+def _raw_event(provider: str, event: str) -> None:
+    CACHE_EVENTS.labels(cache="raw", provider=provider, event=event).inc()
+    record_cache("raw", event)
+
+
+def _search_event(event: str) -> None:
+    CACHE_EVENTS.labels(
+        cache="search",
+        provider="coingecko",
+        event=event,
+    ).inc()
+    record_cache("search", event)
+
+
 def _get_raw_cached(
     key: tuple[str, tuple[str, ...]],
 ) -> t.Optional[list[dict]]:
     hit = _raw_cache.get(key)
     if not hit:
+        _raw_event(key[0], "miss")
         return None
     ts, val = hit
     if _now() - ts > TTL_SEC:
+        _raw_event(key[0], "expired")
         return None
+    _raw_event(key[0], "hit")
     return val
 
 
 def _set_raw_cached(key: tuple[str, tuple[str, ...]], val: list[dict]) -> None:
     _raw_cache[key] = (_now(), val)
+    with _RAW_BYTES_LOCK:
+        _raw_bytes.pop(key, None)
 
 
 def _get_search_cached(term: str) -> t.Optional[list[str]]:
@@ -264,11 +357,13 @@ def _get_search_cached(term: str) -> t.Optional[list[str]]:
     term_lower = term.strip().lower()
     hit = _search_cache.get(term_lower)
     if not hit:
+        _search_event("miss")
         return None
     ts, coin_ids = hit
-    # TTL = 15 minutes = 900 seconds
-    if _now() - ts > 900:
+    if _now() - ts > SEARCH_TTL_SEC:
+        _search_event("expired")
         return None
+    _search_event("hit")
     return coin_ids
 
 
@@ -282,11 +377,101 @@ def _set_search_cached(term: str, coin_ids: list[str]) -> None:
     _search_cache[term_lower] = (_now(), coin_ids)
 
 
+def is_raw_cached(provider: str, terms: list[str]) -> bool:
+    """Check for fresh raw results without counting a lookup.
+
+    :param provider: Provider name of the raw cache key.
+    :param terms: Search terms.
+    :return: True if the next fetch would be served from the cache.
+    """
+    hit = _raw_cache.get((provider, _normalize_terms(terms)))
+    return hit is not None and _now() - hit[0] <= TTL_SEC
+
+
+def is_search_cached(term: str) -> bool:
+    """Check for fresh search results without counting a lookup.
+
+    :param term: Search term.
+    :return: True if the next search would be served from the cache.
+    """
+    hit = _search_cache.get(term.strip().lower())
+    return hit is not None and _now() - hit[0] <= SEARCH_TTL_SEC
+
+
+def _search_terms(terms: list[str], limit: int) -> list[str]:
+    # first ``limit`` terms, skipping short and generic ones
+    generic_terms = {"swap", "defi", "nft", "play", "fun", "meta"}
+    return [
+        term.strip()
+        for term in (terms or [])[:limit]
+        if term
+        and len(term.strip()) >= 3
+        and term.strip().lower() not in generic_terms
+    ]
+
+
+def cg_search_terms(terms: list[str]) -> list[str]:
+    """Get the terms the CoinGecko adapter searches for.
+
+    :param terms: Narrative terms.
+    :return: The first 2 terms, without short or generic ones.
+    """
+    return _search_terms(terms, 2)
+
+
+def ds_search_terms(terms: list[str]) -> list[str]:
+    """Get the terms DexScreener is searched for.
+
+    :param terms: Narrative terms.
+    :return: The first 3 terms, without short or generic ones.
+    """
+    return _search_terms(terms, 3)
+
+
 def clear_search_cache() -> None:
     """Clear the search cache. Used for testing."""
     _search_cache.clear()
 
 
+def _cache_sizes() -> list[tuple[str, str, int, int]]:
+    """Get the entries and approximate bytes of the provider caches.
+
+    :return: ``(cache, provider, entries, bytes)`` rows.
+    """
+    raw: dict[str, list[int]] = {}
+    entries = dict(_raw_cache)
+    with _RAW_BYTES_LOCK:
+        for key in [k for k in _raw_bytes if k not in entries]:
+            del _raw_bytes[key]
+        known = dict(_raw_bytes)
+    # measured outside the lock so stores are not held up by a scrape
+    fresh = {}
+    for key, entry in entries.items():
+        measured = known.get(key)
+        if measured is None or measured[0] is not entry:
+            measured = fresh[key] = (entry, _approx_bytes(entry[1]))
+        totals = raw.setdefault(key[0], [0, 0])
+        totals[0] += 1
+        totals[1] += measured[1]
+    with _RAW_BYTES_LOCK:
+        _raw_bytes.update(fresh)
+    rows = [("raw", p, n, size) for p, (n, size) in sorted(raw.items())]
+    searches = list(_search_cache.items())
+    if searches:
+        rows.append(
+            (
+                "search",
+                "coingecko",
+                len(searches),
+                sum(len(k) + _approx_bytes(v[1]) for k, v in searches),
+            ),
+        )
+    return rows + HTTP_CACHE.sizes()
+
+
+CACHE_SIZES.caches["provider"] = _cache_sizes
+
+
 def _memo_raw(
     provider: str,
     terms: list[str],
@@ -330,11 +515,83 @@ def _random_items(terms: list[str]) -> list[dict]:
     return out
 
 
+# chains of synthetic parents, weighted roughly like DexScreener results
+_SYNTHETIC_CHAINS = ("solana", "ethereum", "base", "bsc")
+_SYNTHETIC_CHAIN_WEIGHTS = (50, 25, 15, 10)
+_SYNTHETIC_SUFFIXES = (
+    "Inu",
+    "Coin",
+    "AI",
+    "Cat",
+    "Protocol",
+    "Finance",
+    "Swap",
+    "Moon",
+    "Token",
+    "Network",
+)
+# a few parents carry words seed block lists use
+_SYNTHETIC_SPAM = ("Fake", "Scam", "Rug")
+
+
+def _synthetic_items(
+    terms: list[str],
+    count: int,
+    seed: int = 0,
+) -> list[dict]:
+    """Generate provider-like parents for a set of terms.
+
+    The same terms and seed always give the same parents. Volume is
+    log-normal, so a few parents carry most of it; liquidity and market
+    cap follow volume with their own spread. Matches are scaled from
+    volume like DexScreener results.
+
+    :param terms: Search terms.
+    :param count: Number of parents.
+    :param seed: Random seed.
+    :return: Parent items, by matches desc.
+    """
+    words = list(_normalize_terms(terms)) or ["parent"]
+    rng = random.Random(f"{seed}:{','.join(words)}")
+    items: list[dict] = []
+    for i in range(count):
+        vol = round(rng.lognormvariate(11, 2.5), 2)
+        liquidity = round(vol * rng.lognormvariate(-1, 1), 2)
+        market_cap = round(liquidity * rng.lognormvariate(2.5, 1), 2)
+        chain = rng.choices(_SYNTHETIC_CHAINS, _SYNTHETIC_CHAIN_WEIGHTS)[0]
+        suffix = rng.choice(
+            _SYNTHETIC_SPAM if rng.random() < 0.05 else _SYNTHETIC_SUFFIXES,
+        )
+        word = words[i % len(words)]
+        address = f"0x{rng.getrandbits(160):040x}"
+        items.append(
+            {
+                "parent": f"{word.title()} {suffix} {i}",
+                "matches": 0,  # set below
+                "symbol": f"{word[:3]}{suffix[0]}{i}".upper(),
+                "source": "synthetic",
+                "chain": interned(chain),
+                "address": address,
+                "url": f"https://synthetic.invalid/{chain}/{address}",
+                "price": round(10 ** rng.uniform(-8, 3), 10),
+                "marketCap": market_cap,
+                "vol24h": vol,
+                "liquidityUsd": liquidity,
+            },
+        )
+    max_v = max((it["vol24h"] for it in items), default=0)
+    for it in items:
+        it["matches"] = int(round(100 * it["vol24h"] / max_v)) if max_v else 0
+    items.sort(key=lambda x: (-x["matches"], -x["vol24h"], x["parent"]))
+    return items
+
+
 # ---------------
 # seed semantics
 # ---------------
 
 
+@STAGE_SECONDS.labels(stage="seed_semantics").time()
 def _apply_seed_semantics(  # pylint: disable=too-many-positional-arguments
     narrative: str,
     terms: list[str],
@@ -435,6 +692,63 @@ def _make_dev() -> t.Any:
     return _DevAdapter()
 
 
+@register_adapter("synthetic")
+def _make_synthetic() -> t.Any:
+    class _SyntheticAdapter:  # pylint: disable=too-few-public-methods
+        # pylint: disable=too-many-positional-arguments
+        # pylint: disable=missing-function-docstring
+        def parents_for(
+            self,
+            narrative: str,
+            terms: list[str],
+            allow_name_match: bool = True,
+            block: list[str] | None = None,
+            require_all_terms: bool = False,
+        ) -> list[dict]:
+            def _fetch() -> list[dict]:
+                # one simulated provider request per term
+                for _ in terms:
+                    if SYNTHETIC_LATENCY_MS > 0:
+                        cancellable_sleep(
+                            bounded(SYNTHETIC_LATENCY_MS / 1000.0),
+                        )
+                return _synthetic_items(
+                    terms,
+                    SYNTHETIC_PARENTS,
+                    SYNTHETIC_SEED,
+                )
+
+            raw = _memo_raw(
+                f"synthetic:{SYNTHETIC_PARENTS}:{SYNTHETIC_SEED}",
+                terms,
+                _fetch,
+            )
+            return _apply_seed_semantics(
+                narrative,
+                terms,
+                allow_name_match,
+                block or [],
+                raw,
+                require_all_terms,
+                cap=None,
+            )
+
+        def fetch_parents(
+            self,
+            narrative: str,
+            terms: list[str],
+        ) -> list[dict]:
+            """Fetch parent data for a narrative and terms.
+
+            :param narrative: The narrative to get parent data for.
+            :param terms: The terms to get parent data for.
+            :return: Parent data.
+            """
+            return self.parents_for(narrative, terms)
+
+    return _SyntheticAdapter()
+
+
 @register_adapter("coingecko")
 def _make_cg() -> t.Any:
     class _CGAdapter:  # pylint: disable=too-few-public-methods
@@ -447,23 +761,7 @@ def _make_cg() -> t.Any:
             :param terms: List of search terms.
             :return: Filtered list of terms.
             """
-            if not terms:
-                return []
-
-            # Skip very generic/short terms
-            generic_terms = {"swap", "defi", "nft", "play", "fun", "meta"}
-            filtered = []
-
-            for term in terms[:2]:  # Take first 2 only
-                if (
-                    term
-                    and term.strip()
-                    and len(term.strip()) >= 3
-                    and term.strip().lower() not in generic_terms
-                ):
-                    filtered.append(term.strip())
-
-            return filtered
+            return cg_search_terms(terms)
 
         def _search_coins(self, terms: list[str]) -> list[str]:
             """Search for coins using terms and collect coin IDs.
@@ -487,7 +785,7 @@ def _make_cg() -> t.Any:
                     # Sleep ≥ 1.2s between /search calls
                     # (in addition to token-bucket)
                     if http_calls_made > 0:
-                        time.sleep(1.2)
+                        cancellable_sleep(bounded(1.2))
 
                     url = "https://api.coingecko.com/api/v3/search"
                     params = {"query": term.strip()}
@@ -576,7 +874,7 @@ def _make_cg() -> t.Any:
 
                 # Sleep ≥ 1.5s between batches (except for the last batch)
                 if i + batch_size < len(coin_ids):
-                    time.sleep(1.5)
+                    cancellable_sleep(bounded(1.5))
 
             return all_market_data
 
@@ -601,7 +899,7 @@ def _make_cg() -> t.Any:
                 market_cap = float(row.get("market_cap") or 0)
                 vol24h = float(row.get("total_volume") or 0)
                 image = row.get("image")
-                url = f"https://www.coingecko.com/en/coins/{row.get('id', '')}"
+                url = coin_url(row.get("id", ""))
 
                 item = {
                     "parent": name,
@@ -726,50 +1024,57 @@ def _make_blend() -> t.Any:
             require_all_terms: bool = False,
         ) -> list[dict]:
             def _fetch() -> list[dict]:
-                # Get both DexScreener and CoinGecko data
-                ds_items = []
-                cg_items = []
-
-                # Try DexScreener first
-                try:
-                    ds_items = parents_for_dexscreener(narrative, terms)
-                    logger.info(
-                        "[BLEND] %s DS: %d items",
-                        narrative,
-                        len(ds_items),
-                    )
-                except (
-                    Exception
-                ) as e:  # pylint: disable=broad-exception-caught
-                    logger.warning(
-                        "[BLEND] %s DS failed: %s",
-                        narrative,
-                        str(e),
-                    )
+                def _ds() -> list[dict]:
+                    return parents_for_dexscreener(narrative, terms)
 
-                # Try CoinGecko second
-                try:
-                    cg_adapter = _make_cg()
-                    cg_items = cg_adapter.parents_for(
+                def _cg() -> list[dict]:
+                    return _make_cg().parents_for(
                         narrative,
                         terms,
                         allow_name_match,
                         block or [],
                         require_all_terms,
                     )
-                    logger.info(
-                        "[BLEND] %s CG: %d items",
-                        narrative,
-                        len(cg_items),
-                    )
-                except (
-                    Exception
-                ) as e:  # pylint: disable=broad-exception-caught
-                    logger.warning(
-                        "[BLEND] %s CG failed: %s",
-                        narrative,
-                        str(e),
-                    )
+
+                # Fetch both providers concurrently, skipping any whose
+                # circuit is open; a failed or timed out one adds nothing
+                calls: dict[str, t.Callable[[], list[dict]]] = {}
+                for name, host, fn in (
+                    ("DS", DS_HOST, _ds),
+                    ("CG", CG_HOST, _cg),
+                ):
+                    if breaker_for(host).is_open():
+                        logger.warning(
+                            "[BLEND] %s %s skipped: circuit open",
+                            narrative,
+                            name,
+                        )
+                    else:
+                        calls[name] = fn
+
+                results = fan_out(
+                    calls,
+                    {"DS": DS_TIMEOUT_SEC, "CG": CG_TIMEOUT_SEC},
+                )
+                items: dict[str, list[dict]] = {"DS": [], "CG": []}
+                for name, result in results.items():
+                    if isinstance(result, Exception):
+                        logger.warning(
+                            "[BLEND] %s %s failed: %s",
+                            narrative,
+                            name,
+                            str(result),
+                        )
+                    else:
+                        items[name] = result
+                        logger.info(
+                            "[BLEND] %s %s: %d items",
+                            narrative,
+                            name,
+                            len(result),
+                        )
+                ds_items = items["DS"]
+                cg_items = items["CG"]
 
                 # Merge and deduplicate the lists
                 all_items = _merge_parents(ds_items, cg_items)
@@ -812,6 +1117,7 @@ def _make_blend() -> t.Any:
     return _BlendAdapter()
 
 
+@STAGE_SECONDS.labels(stage="merge").time()
 def _merge_parents(
     ds_items: list[dict],
     cg_items: list[dict],
@@ -996,134 +1302,191 @@ def _merge_single_parent(
     return merged
 
 
-def parents_for_dexscreener(  # pylint: disable=too-many-branches
-    narrative: str,
-    terms: list[str],
-) -> list[dict]:
-    """Get parent data from Dexscreener API for given terms.
+def _ds_volume(pair: dict) -> float | None:
+    """Get the 24h volume of a DexScreener pair.
 
-    :param narrative: The narrative name (for logging).
-    :param terms: List of search terms.
-    :return: List of parent items with dexscreener data.
+    :param pair: Pair data from the search response.
+    :return: volume.h24 or else volume24h, None if missing or invalid.
     """
-    # Keep only first 3 terms; skip terms with len<3 or generic ones
-    generic_terms = {"swap", "defi", "nft", "play", "fun", "meta"}
-    filtered_terms = []
+    try:
+        # Try volume.h24 first, then volume24h
+        volume = pair.get("volume", {})
+        if isinstance(volume, dict) and "h24" in volume:
+            return float(volume["h24"])
+        if "volume24h" in pair:
+            return float(pair["volume24h"])
+    except (ValueError, TypeError):
+        pass
+    return None
 
-    for term in terms[:3]:  # Take first 3 only
-        if (
-            term
-            and term.strip()
-            and len(term.strip()) >= 3
-            and term.strip().lower() not in generic_terms
-        ):
-            filtered_terms.append(term.strip())
 
-    if not filtered_terms:
-        logger.info("[DS] %s terms=0 parents=0", narrative)
-        return []
+def _ds_record(pair: dict) -> dict | None:
+    """Build a parent record from a DexScreener pair.
 
-    # Collect all results with deduplication by (chain, lowercase(address))
-    results_by_key: dict[tuple[str, str], dict] = {}
+    :param pair: Pair data from the search response.
+    :return: Parent record, or None if the pair lacks name/chain/address.
+    """
+    # Extract base token data
+    base_token = pair.get("baseToken", {})
+    if not base_token:
+        return None
 
-    for term in filtered_terms:
-        try:
-            url = "https://api.dexscreener.com/latest/dex/search"
-            params = {"q": term}
+    # Get required fields
+    name = base_token.get("name") or base_token.get("symbol")
+    symbol = base_token.get("symbol")
+    chain = interned(pair.get("chainId"))
+    address = base_token.get("address") or pair.get("pairAddress")
 
-            data = _get_json(url, params)
-            if not data or not isinstance(data, dict):
-                continue
+    if not name or not chain or not address:
+        return None
 
-            pairs = data.get("pairs", [])
-            if not pairs:
-                continue
+    # Get optional numeric fields
+    price = None
+    try:
+        price_usd = pair.get("priceUsd")
+        if price_usd:
+            price = float(price_usd)
+    except (ValueError, TypeError):
+        pass
+
+    vol24h = _ds_volume(pair)
+
+    fdv = None
+    try:
+        fdv_val = pair.get("fdv")
+        if fdv_val:
+            fdv = float(fdv_val)
+    except (ValueError, TypeError):
+        pass
+
+    liq = None
+    try:
+        liquidity = pair.get("liquidity", {})
+        if isinstance(liquidity, dict) and "usd" in liquidity:
+            liq = float(liquidity["usd"])
+    except (ValueError, TypeError):
+        pass
+
+    return {
+        "parent": name,
+        "matches": 0,  # set by the caller
+        "symbol": symbol or None,
+        "price": price,
+        "vol24h": vol24h,
+        "marketCap": fdv,  # fdv as a cap proxy
+        "liquidityUsd": liq,
+        "chain": chain,
+        "address": address,
+        "url": pair.get("url") or pair.get("pairUrl"),
+        "source": "dexscreener",
+    }
+
+
+def _ds_rank(record: dict) -> tuple[float, float, str]:
+    """Get the sort key of a DexScreener parent record.
+
+    Scores are monotonic in 24h volume (or liquidity when no pair has
+    volume), so this orders records as the final ranking does.
+
+    :param record: Parent record.
+    :return: Key sorting by vol24h desc, liquidityUsd desc, parent asc.
+    """
+    return (
+        -float(record["vol24h"] or 0),
+        -float(record["liquidityUsd"] or 0),
+        record["parent"],
+    )
 
-            for pair in pairs:
-                # Extract base token data
-                base_token = pair.get("baseToken", {})
-                if not base_token:
-                    continue
 
-                # Get required fields
-                name = base_token.get("name") or base_token.get("symbol")
-                symbol = base_token.get("symbol")
-                chain = pair.get("chainId")
-                address = base_token.get("address") or pair.get("pairAddress")
+def _parse_ds_search(text: str) -> dict:
+    """Stream a DexScreener search body, keeping pairs that can rank.
 
-                if not name or not chain or not address:
-                    continue
+    Pairs are decoded one at a time. Only the highest-volume pair per
+    (chain, address) can be kept, and of those only the top
+    ``DS_MAX_PARENTS`` can make the final list, so every other pair is
+    dropped as soon as it is read instead of being held for the whole
+    response.
 
-                # Get optional numeric fields
-                price = None
-                try:
-                    price_usd = pair.get("priceUsd")
-                    if price_usd:
-                        price = float(price_usd)
-                except (ValueError, TypeError):
-                    pass
+    :param text: Response body text.
+    :return: Search result with the surviving ``pairs``, in response order.
+    :raises ValueError: If the body is not a JSON object.
+    """
+    # best volume seen per key, so a pruned pair's weaker duplicates lose
+    best_vol: dict[tuple[str, str], float] = {}
+    kept: dict[tuple[str, str], tuple[int, dict, dict]] = {}
+    # volume of the last pair kept by the latest pruning; lower ones can
+    # no longer place, and neither can their duplicates
+    floor = 0.0
+    for index, pair in enumerate(iter_array(text, "pairs")):
+        if not isinstance(pair, dict) or (_ds_volume(pair) or 0) < floor:
+            continue
+        record = _ds_record(pair)
+        if record is None:
+            continue
+        key = (record["chain"], record["address"].lower())
+        vol = record["vol24h"] or 0
+        if key in best_vol and vol <= best_vol[key]:
+            continue
+        best_vol[key] = vol
+        kept[key] = (index, record, pair)
+        if len(kept) > 2 * DS_MAX_PARENTS:
+            best = sorted(kept.items(), key=lambda kv: _ds_rank(kv[1][1]))
+            kept = dict(best[:DS_MAX_PARENTS])
+            floor = best[DS_MAX_PARENTS - 1][1][1]["vol24h"] or 0
+    top = sorted(kept.values(), key=lambda v: _ds_rank(v[1]))
+    return {"pairs": [pair for _, _, pair in sorted(top[:DS_MAX_PARENTS])]}
 
-                vol24h = None
-                try:
-                    # Try volume.h24 first, then volume24h
-                    volume = pair.get("volume", {})
-                    if isinstance(volume, dict) and "h24" in volume:
-                        vol24h = float(volume["h24"])
-                    elif "volume24h" in pair:
-                        vol24h = float(pair["volume24h"])
-                except (ValueError, TypeError):
-                    pass
-
-                fdv = None
-                try:
-                    fdv_val = pair.get("fdv")
-                    if fdv_val:
-                        fdv = float(fdv_val)
-                except (ValueError, TypeError):
-                    pass
 
-                liq = None
-                try:
-                    liquidity = pair.get("liquidity", {})
-                    if isinstance(liquidity, dict) and "usd" in liquidity:
-                        liq = float(liquidity["usd"])
-                except (ValueError, TypeError):
-                    pass
-
-                url_val = pair.get("url") or pair.get("pairUrl")
-
-                # Create deduplication key
-                key = (chain, address.lower())
-
-                # Check if we should keep this result (higher vol24h wins)
-                existing = results_by_key.get(key)
-                if existing:
-                    existing_vol = existing.get("vol24h") or 0
-                    current_vol = vol24h or 0
-                    if current_vol <= existing_vol:
-                        continue
+def _ds_search(term: str) -> list[dict]:
+    """Search DexScreener for one term.
 
-                # Store result
-                results_by_key[key] = {
-                    "parent": name,
-                    "matches": 0,  # set below
-                    "symbol": symbol or None,
-                    "price": price,
-                    "vol24h": vol24h,
-                    "marketCap": fdv,  # fdv as a cap proxy
-                    "liquidityUsd": liq,
-                    "chain": chain,
-                    "address": address,
-                    "url": url_val,
-                    "source": "dexscreener",
-                }
+    :param term: Search term.
+    :return: Parent records of the pairs found.
+    """
+    # the body is streamed; losing pairs never reach this function
+    data = _get_json(
+        "https://api.dexscreener.com/latest/dex/search",
+        {"q": term},
+        parse=_parse_ds_search,
+    )
+    if not data or not isinstance(data, dict):
+        return []
+    records = (_ds_record(pair) for pair in data.get("pairs") or [])
+    return [record for record in records if record is not None]
 
-        except Exception:  # pylint: disable=broad-exception-caught
-            # Continue with next term on any error
-            continue
 
-        # Short sleep between calls (≥ 300ms)
-        time.sleep(0.3)
+def parents_for_dexscreener(
+    narrative: str,
+    terms: list[str],
+) -> list[dict]:
+    """Get parent data from Dexscreener API for given terms.
+
+    The terms are searched concurrently, paced by the DexScreener rate
+    limiter, so a narrative takes about as long as its slowest search.
+
+    :param narrative: The narrative name (for logging).
+    :param terms: List of search terms.
+    :return: List of parent items with dexscreener data.
+    """
+    filtered_terms = ds_search_terms(terms)
+    if not filtered_terms:
+        logger.info("[DS] %s terms=0 parents=0", narrative)
+        return []
+
+    # Deduplicate by (chain, lowercase(address)), higher vol24h wins;
+    # a failed search is left out
+    results_by_key: dict[tuple[str, str], dict] = {}
+    for found in map_concurrent(_ds_search, filtered_terms):
+        if isinstance(found, Exception):
+            continue
+        for record in found:
+            key = (record["chain"], record["address"].lower())
+            existing = results_by_key.get(key)
+            if existing and (record["vol24h"] or 0) <= (
+                existing.get("vol24h") or 0
+            ):
+                continue
+            results_by_key[key] = record
 
     items = list(results_by_key.values())
 
@@ -1155,7 +1518,7 @@ def parents_for_dexscreener(  # pylint: disable=too-many-branches
     )
 
     # Cap to 25
-    items = items[:25]
+    items = items[:DS_MAX_PARENTS]
 
     logger.info(
         "[DS] %s terms=%d parents=%d",
@@ -1183,6 +1546,14 @@ class Source:
         self._name = (provider or MODE).lower()
         self._impl = make_adapter(self._name)
 
+    @property
+    def name(self) -> str:
+        """Get the name of the adapter in use.
+
+        :return: The adapter name.
+        """
+        return self._name
+
     @staticmethod
     def available() -> list[str]:
         """Get list of available adapter names.
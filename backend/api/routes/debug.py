@@ -0,0 +1,149 @@
+"""API routes for inspecting the running service."""
+
+import asyncio
+import typing as t
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from ...adapters.source import SEARCH_TTL_SEC, TTL_SEC
+from ...deps.auth import require_refresh_token
+from ...metrics import cache_report
+from ...profiler import (
+    REQUESTS,
+    Sampler,
+    arm_next_job,
+    job_profile,
+    next_job_armed,
+    set_request_profiling,
+)
+
+router = APIRouter()
+
+# longest time window a single profile request may sample (seconds)
+PROFILE_MAX_SEC = 300
+
+ProfileFormat = t.Literal["collapsed", "speedscope"]
+
+
+def _render(sampler: Sampler, name: str, fmt: ProfileFormat) -> t.Any:
+    """Export a profile in the requested format.
+
+    :param sampler: The sampler holding the profile.
+    :param name: Profile name.
+    :param fmt: ``collapsed`` stacks text or ``speedscope`` JSON.
+    :return: The response body.
+    """
+    if fmt == "speedscope":
+        return sampler.speedscope(name)
+    return PlainTextResponse(sampler.collapsed())
+
+
+@router.get("/debug/caches")
+def debug_caches(
+    _auth: t.Any = Depends(require_refresh_token),  # noqa: B008
+) -> dict[str, t.Any]:
+    """Get hit, miss, expiry and eviction counts and sizes of the caches.
+
+    Counts are totals since the process started, as on ``/metrics``.
+
+    :return: Raw, search and HTTP cache figures by provider.
+    """
+    return {
+        "ttl": {"raw": TTL_SEC, "search": SEARCH_TTL_SEC},
+        "caches": cache_report(),
+    }
+
+
+@router.get("/debug/profile")
+async def debug_profile(
+    seconds: float = Query(default=10, gt=0, le=PROFILE_MAX_SEC),  # noqa: B008
+    fmt: ProfileFormat = Query(  # noqa: B008
+        default="collapsed",
+        alias="format",
+    ),
+    _auth: t.Any = Depends(require_refresh_token),  # noqa: B008
+) -> t.Any:
+    """Profile every thread for a time window.
+
+    :param seconds: Length of the window.
+    :param fmt: ``collapsed`` stacks text or ``speedscope`` JSON.
+    :return: The profile.
+    """
+    sampler = Sampler()
+    sampler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        sampler.stop()
+    return _render(sampler, f"window {seconds:g}s", fmt)
+
+
+@router.post("/debug/profile/next-job")
+async def debug_profile_next_job(
+    _auth: t.Any = Depends(require_refresh_token),  # noqa: B008
+) -> dict[str, t.Any]:
+    """Profile the next refresh job that starts.
+
+    Read the profile from ``/debug/profile/jobs/{job_id}``.
+
+    :return: Whether a job will be profiled.
+    """
+    arm_next_job()
+    return {"armed": next_job_armed()}
+
+
+@router.get("/debug/profile/jobs/{job_id}")
+async def debug_profile_job(
+    job_id: str,
+    fmt: ProfileFormat = Query(  # noqa: B008
+        default="collapsed",
+        alias="format",
+    ),
+    _auth: t.Any = Depends(require_refresh_token),  # noqa: B008
+) -> t.Any:
+    """Get the profile of a refresh job, partial while it runs.
+
+    :param job_id: The profiled job.
+    :param fmt: ``collapsed`` stacks text or ``speedscope`` JSON.
+    :return: The profile.
+    """
+    sampler = job_profile(job_id)
+    if sampler is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="no profile for job",
+        )
+    return _render(sampler, f"job {job_id}", fmt)
+
+
+@router.put("/debug/profile/requests")
+async def debug_profile_requests_toggle(
+    enabled: bool = Query(...),  # noqa: B008
+    _auth: t.Any = Depends(require_refresh_token),  # noqa: B008
+) -> dict[str, t.Any]:
+    """Switch profiling of ``/parents`` and ``/heatmap`` on or off.
+
+    Switching on discards the previous request profile.
+
+    :param enabled: Whether to profile.
+    :return: Whether request profiling is on.
+    """
+    set_request_profiling(enabled)
+    return {"enabled": REQUESTS.running}
+
+
+@router.get("/debug/profile/requests")
+async def debug_profile_requests(
+    fmt: ProfileFormat = Query(  # noqa: B008
+        default="collapsed",
+        alias="format",
+    ),
+    _auth: t.Any = Depends(require_refresh_token),  # noqa: B008
+) -> t.Any:
+    """Get the profile of ``/parents`` and ``/heatmap`` requests.
+
+    :param fmt: ``collapsed`` stacks text or ``speedscope`` JSON.
+    :return: The profile.
+    """
+    return _render(REQUESTS, "requests", fmt)
@@ -5,9 +5,10 @@ import time
 
 from fastapi import APIRouter
 
+from ...profiler import profiled
 from ...repo import list_parents
 from ...seeds import list_narrative_names
-from ...storage import get_meta, get_parents
+from ...storage import get_columns, get_meta
 
 # Read TTL from environment variable
 TTL = int(os.getenv("REFRESH_TTL_SEC", "900"))
@@ -16,6 +17,7 @@ router = APIRouter()
 
 
 @router.get("/heatmap")
+@profiled
 def get_heatmap() -> dict:
     """Get heatmap data.
 
@@ -26,30 +28,22 @@ def get_heatmap() -> dict:
     top_k_count = 5  # Top-K parents for scoring
 
     for name in list_narrative_names():
-        # Get parent data from database or storage
-        parent_items = list_parents(name) or get_parents(name) or []
-
-        # Sort by matches descending
-        sorted_parents = sorted(
-            parent_items,
-            key=lambda x: x.get("matches", 0),
-            reverse=True,
-        )
+        # Get parent matches from database or storage
+        matches = [
+            p.get("matches", 0) for p in list_parents(name)
+        ] or get_columns(name).match_counts()
 
-        # Take top K parents (or all if fewer)
-        top_k = sorted_parents[:top_k_count]
+        # Take top K parents (or all if fewer) by matches
+        top_k = sorted(matches, reverse=True)[:top_k_count]
 
         # Calculate score as average of top-K matches
         if top_k:
-            score = round(
-                sum(p.get("matches", 0) for p in top_k) / len(top_k),
-                2,
-            )
+            score = round(sum(top_k) / len(top_k), 2)
         else:
             score = 0.0
 
         # Count is total number of parents
-        count = len(parent_items)
+        count = len(matches)
 
         # Get metadata for this narrative
         meta = get_meta(name) or {}
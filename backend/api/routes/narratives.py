@@ -21,12 +21,13 @@ def _get_last_job_errors() -> int:
     :return: Number of errors from the last job, or 0 if no job or no errors.
     """
     # Import here to avoid circular imports
-    from .refresh import last_completed_job
+    from ...jobs import last_finished_job
 
-    if not last_completed_job:
+    last_job = last_finished_job()
+    if not last_job:
         return 0
 
-    errors = last_completed_job.get("errors", [])
+    errors = last_job.get("errors", [])
     return len(errors) if errors else 0
 
 
@@ -6,11 +6,13 @@ import typing as t
 
 from fastapi import APIRouter, HTTPException, Path, Query
 
-from ...parents import TOP_N, _with_scores
+from ...parents import TOP_N, _rank
+from ...profiler import profiled
+from ...records import ParentColumns, ParentRecord
 from ...repo import list_parents as list_parents_db
 from ...schemas import ParentsResp
 from ...seeds import list_narrative_names
-from ...storage import get_parents
+from ...storage import get_columns
 
 router = APIRouter()
 
@@ -42,6 +44,7 @@ def _dec_cursor(cursor: str) -> int:
     response_model_exclude_none=False,
     response_model_exclude_unset=False,
 )
+@profiled
 def get_parents_for_narrative(
     narrative: str = Path(..., min_length=1),  # noqa: B008
     window: str = Query(default="24h"),  # noqa: B008
@@ -61,9 +64,13 @@ def get_parents_for_narrative(
     if narrative not in set(list_narrative_names()):
         raise HTTPException(status_code=404, detail="unknown narrative")
 
-    # load & score
-    items = list_parents_db(narrative) or get_parents(narrative)
-    items = _with_scores(items)[:TOP_N]  # keep consistent with compute_all cap
+    # load & score; only the returned page is turned into dicts
+    rows = list_parents_db(narrative)
+    if rows:
+        cols = ParentColumns(ParentRecord.from_dict(r) for r in rows)
+    else:
+        cols = get_columns(narrative)
+    items = _rank(cols)[:TOP_N]  # keep consistent with compute_all cap
 
     # clamp limit to 1..100 range
     limit = max(1, min(100, limit))
@@ -81,7 +88,10 @@ def get_parents_for_narrative(
         }
 
     end = min(start + limit, len(items))
-    page = items[start:end]
+    page = [
+        cols.record(row, score=score).to_dict()
+        for row, score in items[start:end]
+    ]
 
     # Filter out debug fields if not in debug mode
     if not debug:
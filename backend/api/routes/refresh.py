@@ -1,19 +1,50 @@
 """API routes for refresh operations."""
 
+# pylint: disable=too-many-lines
+
+import asyncio
+import json
 import logging
 import os
 import time
 import typing as t
-import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
-from ...adapters.source import get_cg_calls_count, reset_cg_calls_count
+from ... import ledger
+from ...broadcast import JOB_EVENTS, sse_frame
+from ...deadline import NARRATIVE_BUDGET_SEC, deadline
 from ...deps.auth import require_refresh_token
-from ...jobs import gc_jobs
+from ...executor import process_pool_enabled, run_blocking, run_in_process
+from ...jobs import (
+    FINISHED,
+    JobCancelled,
+    cancel_job,
+    checkpoint,
+    finish_job,
+    gc_jobs,
+    get_job,
+    get_job_trace,
+    last_finished_job,
+    last_success_ts,
+    list_jobs,
+    queued_job_ids,
+    submit_job,
+    update_job,
+)
+from ...metrics import NARRATIVE_SECONDS
 from ...parents import compute_all, refresh_all
+from ...planner import PROVIDER_MODES, Plan, make_plan
+from ...profiler import profile_job
 from ...seeds import list_narrative_names
-from ...storage import get_parents, last_refresh_ts, mark_refreshed
+from ...storage import (
+    get_meta,
+    get_parents,
+    last_refresh_ts,
+    mark_refreshed,
+)
+from ...tracing import narrative_started
 
 router = APIRouter()
 
@@ -27,12 +58,11 @@ TTL_SEC = int(os.getenv("REFRESH_TTL_SEC", "900"))  # default 15m
 REFRESH_MAX_CALLS = int(os.getenv("REFRESH_MAX_CALLS", "50"))
 REFRESH_PER_NARRATIVE_CAP = int(os.getenv("REFRESH_PER_NARRATIVE_CAP", "1"))
 
-# Module-level registry for idempotency
-current_running_job: dict[str, t.Any] | None = None
-last_completed_job: dict[str, t.Any] | None = None
-last_started_ts: float = 0.0
-debounce_until: float = 0.0
-last_success_at: float = 0.0
+# Seconds between keep-alive comments on idle event streams
+SSE_KEEPALIVE_SEC = float(os.getenv("REFRESH_SSE_KEEPALIVE_SEC", "15"))
+
+# Job record keys owned by the job registry
+_REGISTRY_KEYS = ("id", "jobId", "state", "ts", "error")
 
 
 def _get_narrative_count() -> int:
@@ -43,21 +73,116 @@ def _get_narrative_count() -> int:
     return len(list_narrative_names())
 
 
-def _gen_id() -> str:
-    """Generate a short job ID."""
-    return uuid.uuid4().hex[:12]
+def _resolve_narratives(
+    narratives: list[str] | None = None,
+    select: str | None = None,
+) -> list[str] | None:
+    """Resolve the narrative subset requested for a refresh.
+
+    Names may be repeated query params or comma separated. ``select``
+    picks narratives by state; ``stale`` keeps those never computed or
+    older than ``TTL_SEC``.
+
+    :param narratives: Requested narrative names, if any.
+    :param select: Optional selector (``stale`` or ``all``).
+    :return: Ordered list of narrative names, or None for all.
+    :raises HTTPException: If a name is unknown or the selector invalid.
+    """
+    known = list_narrative_names()
+    names = [
+        n.strip()
+        for raw in narratives or []
+        for n in raw.split(",")
+        if n.strip()
+    ]
+    unknown = sorted(set(names) - set(known))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"unknown narrative: {', '.join(unknown)}",
+        )
+
+    if select not in (None, "", "all", "stale"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="invalid select",
+        )
+
+    if select == "stale":
+        now = time.time()
+        pool = [n for n in known if not names or n in names]
+        return [n for n in pool if _is_stale(n, now)]
+
+    if not names:
+        return None
+
+    # keep seed order and drop duplicates
+    wanted = set(names)
+    return [n for n in known if n in wanted]
+
+
+def _nothing_to_refresh() -> dict[str, t.Any]:
+    """Answer a refresh whose selection came out empty, without a job.
+
+    :return: Response with no job ID and no narratives.
+    """
+    return {"jobId": None, "narrativesTotal": 0}
+
+
+def _is_stale(narrative: str, now: float) -> bool:
+    """Check whether a narrative is due for a refresh.
+
+    :param narrative: The narrative name.
+    :param now: Current timestamp.
+    :return: True if never computed or older than ``TTL_SEC``.
+    """
+    computed_at = (get_meta(narrative) or {}).get("computedAt")
+    return computed_at is None or now - computed_at > TTL_SEC
 
 
-def _get_job_by_id(job_id: str) -> dict[str, t.Any] | None:
-    """Get job by ID from the module-level registry.
+def _covers(job: dict[str, t.Any], narratives: list[str] | None) -> bool:
+    """Check whether a job's narrative set covers the requested set.
 
-    :param job_id: The job ID to look up.
-    :return: Job dictionary or None if not found.
+    :param job: The job dictionary.
+    :param narratives: Requested narrative names, or None for all.
+    :return: True if the job refreshes every requested narrative.
     """
-    if current_running_job and current_running_job.get("id") == job_id:
-        return current_running_job
-    if last_completed_job and last_completed_job.get("id") == job_id:
-        return last_completed_job
+    scope = job.get("narratives")
+    if scope is None:
+        return True
+    if narratives is None:
+        return False
+    return set(narratives) <= set(scope)
+
+
+def _progress_fields(job: dict[str, t.Any]) -> dict[str, t.Any]:
+    """Strip the keys owned by the job registry from a job record.
+
+    :param job: The job dictionary.
+    :return: Progress fields to store with the job.
+    """
+    return {k: v for k, v in job.items() if k not in _REGISTRY_KEYS}
+
+
+def _find_reusable_job(
+    narratives: list[str] | None,
+) -> dict[str, t.Any] | None:
+    """Find a queued, running or just finished job covering a request.
+
+    :param narratives: Requested narrative names, or None for all.
+    :return: Job dictionary or None if a new job is needed.
+    """
+    for job in list_jobs("running", "queued"):
+        if _covers(job, narratives):
+            return job
+
+    # debounce: reuse jobs finished in the last DEBOUNCE_SEC
+    cutoff = time.time() - DEBOUNCE_SEC
+    for job in list_jobs("done", "error"):
+        if job["ts"] < cutoff:
+            break
+        if _covers(job, narratives):
+            return job
     return None
 
 
@@ -94,25 +219,67 @@ def _process_narrative_real_mode(
 ) -> list[dict]:
     """Process a single narrative in real mode using adapter.
 
+    Provider calls share a ``NARRATIVE_BUDGET_SEC`` deadline.
+
     :param narrative: The narrative name to process.
     :param terms: List of search terms for the narrative.
     :param mode: The mode to determine which adapter to use.
     :return: List of parent items for the narrative.
     """
-    if mode == "real_ds":
-        # Use the Dexscreener function directly
-        from ...adapters.source import parents_for_dexscreener
+    with deadline(NARRATIVE_BUDGET_SEC):
+        if mode == "real_ds":
+            # Use the Dexscreener function directly
+            from ...adapters.source import parents_for_dexscreener
+
+            return parents_for_dexscreener(narrative, terms)
+
+        from ...adapters import get_adapter
+
+        # Get the appropriate adapter based on mode
+        adapter = get_adapter(mode)
+
+        # Fetch parents using the adapter
+        items = adapter.fetch_parents(narrative, terms)
 
-        return parents_for_dexscreener(narrative, terms)
+    return items
+
+
+def _fetch_in_worker(
+    narrative: str,
+    terms: list[str],
+    mode: str,
+) -> tuple[list[dict], dict[str, int]]:
+    """Fetch parents inside a worker process.
+
+    :param narrative: The narrative name to process.
+    :param terms: List of search terms for the narrative.
+    :param mode: The mode to determine which adapter to use.
+    :return: Tuple of (items, provider calls made by the worker by host).
+    """
+    with ledger.counting() as calls:
+        items = _process_narrative_real_mode(narrative, terms, mode)
+    return items, calls.to_dict()
 
-    from ...adapters import get_adapter
 
-    # Get the appropriate adapter based on mode
-    adapter = get_adapter(mode)
+def _fetch_parents(
+    narrative: str,
+    terms: list[str],
+    mode: str,
+) -> list[dict]:
+    """Fetch parents from a provider, in the process pool when enabled.
 
-    # Fetch parents using the adapter
-    items = adapter.fetch_parents(narrative, terms)
+    Calls made by a worker process are added to the job's ledger so
+    budgets keep working.
 
+    :param narrative: The narrative name to process.
+    :param terms: List of search terms for the narrative.
+    :param mode: The mode to determine which adapter to use.
+    :return: List of parent items for the narrative.
+    """
+    if not process_pool_enabled():
+        return _process_narrative_real_mode(narrative, terms, mode)
+    items, calls = run_in_process(_fetch_in_worker, narrative, terms, mode)
+    ledger.current().merge(calls)
     return items
 
 
@@ -120,19 +287,23 @@ def _check_budget_limits(
     narrative: str,
     mode: str = "real",
     narratives_done: int = 0,
+    calls_needed: int | None = None,
 ) -> tuple[bool, dict[str, str] | None]:
     """Check if budget limits are exceeded.
 
     :param narrative: Current narrative being processed.
     :param mode: The processing mode to determine call cost.
     :param narratives_done: Number of narratives already processed.
+    :param calls_needed: Estimated calls of the narrative, guessed from
+        the mode if None.
     :return: Tuple of (should_continue, error_dict_or_none).
     """
-    # Get current calls from source module
-    calls_used = get_cg_calls_count()
+    # Get the calls made so far by this job
+    calls_used = ledger.calls_used()
 
     # Determine calls needed for this narrative
-    calls_needed = 2 if mode in ["real_mix", "blend"] else 1
+    if calls_needed is None:
+        calls_needed = 2 if mode in ["real_mix", "blend"] else 1
 
     # Check if we would exceed the maximum calls budget
     if calls_used + calls_needed > REFRESH_MAX_CALLS:
@@ -155,6 +326,30 @@ def _check_budget_limits(
     return True, None  # Continue processing
 
 
+def _plan_refresh(
+    mode: str,
+    narratives: list[str] | None = None,
+    budget: int | None = None,
+) -> Plan:
+    """Plan a provider refresh within the calls left in the budget.
+
+    :param mode: The refresh mode.
+    :param narratives: Optional subset of narratives, None for all.
+    :param budget: Calls allowed, by default those the current job has
+        left.
+    :return: The plan.
+    """
+    from ...seeds import load_seeds
+
+    seeds = load_seeds()["narratives"]
+    if narratives is not None:
+        wanted = set(narratives)
+        seeds = [n for n in seeds if n["name"] in wanted]
+    if budget is None:
+        budget = REFRESH_MAX_CALLS - ledger.calls_used()
+    return make_plan(seeds, mode, budget)
+
+
 def _process_single_narrative(
     narrative: str,
     job_id: str,  # pylint: disable=unused-argument
@@ -181,7 +376,7 @@ def _process_single_narrative(
                 mode in ["real", "real_cg", "real_mix", "real_ds", "blend"]
                 and terms is not None
             ):
-                items = _process_narrative_real_mode(narrative, terms, mode)
+                items = _fetch_parents(narrative, terms, mode)
             else:
                 items = _process_narrative_dev_mode(narrative)
 
@@ -211,16 +406,18 @@ def _update_job_progress(
     narratives_done: int,
     errors: list[dict],
 ) -> None:
-    """Update job progress in the global state.
+    """Update job progress in the job registry.
 
     :param job_id: The job ID.
     :param narratives_done: Number of narratives completed.
     :param errors: List of errors.
     """
-    if current_running_job and current_running_job.get("id") == job_id:
-        current_running_job["narrativesDone"] = narratives_done
-        current_running_job["calls_used"] = get_cg_calls_count()
-        current_running_job["errors"] = errors
+    update_job(
+        job_id,
+        narrativesDone=narratives_done,
+        calls_used=ledger.calls_used(),
+        errors=errors,
+    )
 
 
 def _write_narrative_to_storage(narrative: str, items: list[dict]) -> None:
@@ -255,11 +452,13 @@ def _write_narrative_to_storage(narrative: str, items: list[dict]) -> None:
         )
 
 
+# pylint: disable-next=too-many-positional-arguments
 def _process_narrative_real_cg(
     narrative: str,
     terms: list[str],
     _memo: dict[str, list[dict]],
     job_id: str,
+    cost: int = 1,
 ) -> tuple[bool, list[dict]]:
     """Process a narrative in real_cg mode with memo and budget checking.
 
@@ -267,6 +466,7 @@ def _process_narrative_real_cg(
     :param terms: List of search terms.
     :param _memo: Per-run memo dict for caching results.
     :param job_id: The job ID.
+    :param cost: Estimated provider calls of the narrative.
     :return: Tuple of (should_continue, items).
     """
     if narrative in _memo:
@@ -275,29 +475,27 @@ def _process_narrative_real_cg(
         return True, items
 
     # Check budget before making API call
-    calls_used = get_cg_calls_count()
-    if calls_used + 1 > REFRESH_MAX_CALLS:
+    calls_used = ledger.calls_used()
+    if calls_used + cost > REFRESH_MAX_CALLS:
         return False, []
 
     # Fetch data using CoinGeckoAdapter
-    from ...adapters import get_adapter
-
-    adapter = get_adapter("real_cg")
-    items = adapter.fetch_parents(narrative, terms)
+    items = _fetch_parents(narrative, terms, "real_cg")
     _memo[narrative] = items
 
-    # Update progress in global job state
-    if current_running_job and current_running_job.get("id") == job_id:
-        current_running_job["calls_used"] = get_cg_calls_count()
+    # Update progress in the job registry
+    update_job(job_id, calls_used=ledger.calls_used())
 
     return True, items
 
 
+# pylint: disable-next=too-many-positional-arguments
 def _process_narrative_blend(
     narrative: str,
     terms: list[str],
     _memo: dict[str, list[dict]],
     job_id: str,
+    cost: int = 2,
 ) -> tuple[bool, list[dict]]:
     """Process a narrative in blend mode with memo and budget checking.
 
@@ -305,6 +503,7 @@ def _process_narrative_blend(
     :param terms: List of search terms.
     :param _memo: Per-run memo dict for caching results.
     :param job_id: The job ID.
+    :param cost: Estimated provider calls of the narrative.
     :return: Tuple of (should_continue, items).
     """
     if narrative in _memo:
@@ -312,21 +511,17 @@ def _process_narrative_blend(
         items = _memo[narrative]
         return True, items
 
-    # Check budget before making API calls (blend uses 2 calls)
-    calls_used = get_cg_calls_count()
-    if calls_used + 2 > REFRESH_MAX_CALLS:
+    # Check budget before making API calls
+    calls_used = ledger.calls_used()
+    if calls_used + cost > REFRESH_MAX_CALLS:
         return False, []
 
     # Fetch data using BlendAdapter
-    from ...adapters import get_adapter
-
-    adapter = get_adapter("blend")
-    items = adapter.fetch_parents(narrative, terms)
+    items = _fetch_parents(narrative, terms, "blend")
     _memo[narrative] = items
 
-    # Update progress in global job state
-    if current_running_job and current_running_job.get("id") == job_id:
-        current_running_job["calls_used"] = get_cg_calls_count()
+    # Update progress in the job registry
+    update_job(job_id, calls_used=ledger.calls_used())
 
     return True, items
 
@@ -339,6 +534,7 @@ def _create_completed_job(  # pylint: disable=too-many-positional-arguments
     narratives_done: int,
     errors: list[dict],
     reason: str | None = None,
+    narratives: list[str] | None = None,
 ) -> dict[str, t.Any]:
     """Create a completed job dictionary.
 
@@ -349,6 +545,7 @@ def _create_completed_job(  # pylint: disable=too-many-positional-arguments
     :param narratives_done: Number of narratives completed.
     :param errors: List of errors.
     :param reason: Optional reason for completion.
+    :param narratives: Narrative subset of the job, None for all.
     :return: Completed job dictionary.
     """
     job = {
@@ -362,7 +559,9 @@ def _create_completed_job(  # pylint: disable=too-many-positional-arguments
         "narrativesTotal": narratives_total,
         "narrativesDone": narratives_done,
         "errors": errors,
-        "calls_used": get_cg_calls_count(),
+        "calls_used": ledger.calls_used(),
+        "callsByHost": ledger.current().to_dict(),
+        "narratives": narratives,
     }
     if reason:
         job["reason"] = reason
@@ -377,6 +576,7 @@ def _finalize_job(  # pylint: disable=too-many-positional-arguments
     narratives_done: int,
     errors: list[dict],
     reason: str | None = None,
+    narratives: list[str] | None = None,
 ) -> None:
     """Finalize a job by marking it as completed.
 
@@ -387,11 +587,8 @@ def _finalize_job(  # pylint: disable=too-many-positional-arguments
     :param narratives_done: Number of narratives completed.
     :param errors: List of errors.
     :param reason: Optional reason for completion.
+    :param narratives: Narrative subset of the job, None for all.
     """
-    # pylint: disable=global-statement
-    global current_running_job, last_completed_job, debounce_until
-    global last_success_at
-
     mark_refreshed()
     completed_job = _create_completed_job(
         job_id=job_id,
@@ -401,13 +598,75 @@ def _finalize_job(  # pylint: disable=too-many-positional-arguments
         narratives_done=narratives_done,
         errors=errors,
         reason=reason,
+        narratives=narratives,
     )
-    last_completed_job = completed_job
-    # Update last success timestamp
-    last_success_at = completed_job["ts"]
-    # Set debounce_until BEFORE clearing current_running_job
-    debounce_until = time.time() + DEBOUNCE_SEC
-    current_running_job = None
+    finish_job(job_id, "done", **_progress_fields(completed_job))
+
+
+def _fail_job(  # pylint: disable=too-many-positional-arguments
+    job_id: str,
+    mode: str,
+    window: str,
+    narratives_total: int,
+    exc: Exception,
+    narratives: list[str] | None = None,
+) -> None:
+    """Finalize a job as failed.
+
+    :param job_id: The job ID.
+    :param mode: The job mode.
+    :param window: The job window.
+    :param narratives_total: Total number of narratives.
+    :param exc: The exception that stopped the job.
+    :param narratives: Narrative subset of the job, None for all.
+    """
+    error_entry = {"narrative": "*", "code": "JOB_ERROR", "detail": str(exc)}
+    finish_job(
+        job_id,
+        "error",
+        error=str(exc),
+        mode=mode,
+        window=window,
+        narrativesTotal=narratives_total,
+        narrativesDone=0,
+        errors=[error_entry],
+        calls_used=ledger.calls_used(),
+        narratives=narratives,
+    )
+
+
+def _cancel_finished_job(  # pylint: disable=too-many-positional-arguments
+    job_id: str,
+    mode: str,
+    window: str,
+    narratives_total: int,
+    narratives_done: int,
+    errors: list[dict],
+    narratives: list[str] | None = None,
+) -> None:
+    """Finalize a cancelled job, keeping the narratives it wrote.
+
+    :param job_id: The job ID.
+    :param mode: The job mode.
+    :param window: The job window.
+    :param narratives_total: Total number of narratives.
+    :param narratives_done: Number of narratives completed.
+    :param errors: List of errors.
+    :param narratives: Narrative subset of the job, None for all.
+    """
+    if narratives_done:
+        mark_refreshed()
+    cancelled_job = _create_completed_job(
+        job_id=job_id,
+        mode=mode,
+        window=window,
+        narratives_total=narratives_total,
+        narratives_done=narratives_done,
+        errors=errors,
+        reason="cancelled",
+        narratives=narratives,
+    )
+    finish_job(job_id, "cancelled", **_progress_fields(cancelled_job))
 
 
 def _process_dev_mode_job(
@@ -415,6 +674,7 @@ def _process_dev_mode_job(
     mode: str,
     window: str,
     narratives_total: int,
+    narratives: list[str] | None = None,
 ) -> None:
     """Process a job by iterating through narratives.
 
@@ -422,35 +682,47 @@ def _process_dev_mode_job(
     :param mode: The job mode (dev or real).
     :param window: The job window.
     :param narratives_total: Total number of narratives to process.
+    :param narratives: Optional subset of narratives to refresh.
     """
-    # pylint: disable=global-statement,too-many-locals
-    global current_running_job, last_completed_job, debounce_until
-
+    # pylint: disable=too-many-locals,too-many-branches
+    narratives_done = 0
+    errors: list[dict] = []
     try:
-        # Reset CG calls counter at start of job
-        reset_cg_calls_count()
-
         # Per-run memo: dict to cache computed parents by narrative
         _memo: dict[str, list[dict]] = {}
 
-        # Get narratives with their terms for real mode
-        if mode in ["real", "real_cg", "real_mix", "real_ds", "blend"]:
-            from ...seeds import load_seeds
-
-            seeds_data = load_seeds()
+        # Provider modes refresh the narratives the budget allows, most
+        # stale and important first, at their estimated cost
+        costs: dict[str, int] = {}
+        deferred = 0
+        if mode in PROVIDER_MODES:
+            plan = _plan_refresh(mode, narratives)
             narratives_with_terms = [
-                (n["name"], n.get("terms", []))
-                for n in seeds_data["narratives"]
+                (step.narrative, step.terms) for step in plan.planned
             ]
+            costs = {step.narrative: step.cost for step in plan.planned}
+            deferred = len(plan.deferred)
+            summary = plan.to_dict()
+            del summary["steps"]
+            update_job(job_id, plan=summary)
         else:
             narratives_with_terms = [
                 (name, []) for name in list_narrative_names()
             ]
-
-        narratives_done = 0
-        errors = []
+            if narratives is not None:
+                wanted = set(narratives)
+                narratives_with_terms = [
+                    (n, terms)
+                    for n, terms in narratives_with_terms
+                    if n in wanted
+                ]
 
         for narrative, terms in narratives_with_terms:
+            # Stop between narratives once the job is cancelled
+            checkpoint()
+            narrative_started(narrative)
+            started = time.monotonic()
+
             # Special handling for real_cg and blend modes with per-run memo
             if mode in ["real_cg", "blend"]:
                 if mode == "real_cg":
@@ -459,6 +731,7 @@ def _process_dev_mode_job(
                         terms,
                         _memo,
                         job_id,
+                        costs.get(narrative, 1),
                     )
                 else:  # blend mode
                     should_continue, items = _process_narrative_blend(
@@ -466,6 +739,7 @@ def _process_dev_mode_job(
                         terms,
                         _memo,
                         job_id,
+                        costs.get(narrative, 2),
                     )
 
                 if not should_continue:
@@ -484,6 +758,7 @@ def _process_dev_mode_job(
                         narratives_done=narratives_done,
                         errors=errors,
                         reason="budget_exhausted",
+                        narratives=narratives,
                     )
                     return  # Exit the function early
 
@@ -496,6 +771,9 @@ def _process_dev_mode_job(
 
                 # Write to storage using current storage writer
                 _write_narrative_to_storage(narrative, items)
+                NARRATIVE_SECONDS.labels(mode=mode).observe(
+                    time.monotonic() - started,
+                )
                 narratives_done += 1
                 _update_job_progress(
                     job_id,
@@ -509,6 +787,7 @@ def _process_dev_mode_job(
                 narrative,
                 mode,
                 narratives_done,
+                costs.get(narrative),
             )
 
             if budget_error_other:
@@ -523,6 +802,7 @@ def _process_dev_mode_job(
                         narratives_done=narratives_done,
                         errors=errors,
                         reason="budget_exhausted",
+                        narratives=narratives,
                     )
                     return  # Exit the function early
                 # Skip this narrative and continue with next
@@ -547,6 +827,9 @@ def _process_dev_mode_job(
                 ),
                 _memo=_memo,
             )
+            NARRATIVE_SECONDS.labels(mode=mode).observe(
+                time.monotonic() - started,
+            )
 
             narratives_done += 1
 
@@ -555,6 +838,16 @@ def _process_dev_mode_job(
 
             _update_job_progress(job_id, narratives_done, errors)
 
+        # Narratives left out of the plan wait for the next run
+        if deferred:
+            errors.append(
+                {
+                    "narrative": "*",
+                    "code": "BUDGET_EXCEEDED",
+                    "detail": "max calls exceeded",
+                },
+            )
+
         # Mark as completed
         _finalize_job(
             job_id=job_id,
@@ -563,168 +856,136 @@ def _process_dev_mode_job(
             narratives_total=narratives_total,
             narratives_done=narratives_done,
             errors=errors,
+            reason="budget_exhausted" if deferred else None,
+            narratives=narratives,
         )
 
+    except JobCancelled:
+        # Narratives written so far are kept
+        _cancel_finished_job(
+            job_id,
+            mode,
+            window,
+            narratives_total,
+            narratives_done,
+            errors,
+            narratives,
+        )
     except (ValueError, RuntimeError, OSError) as e:
         # Mark as error
-        error_entry = {"narrative": "*", "code": "JOB_ERROR", "detail": str(e)}
-        error_job = {
-            "id": job_id,
-            "state": "error",
-            "ts": time.time(),
-            "error": str(e),
-            "jobId": job_id,
-            "mode": mode,
-            "window": window,
-            "narrativesTotal": narratives_total,
-            "narrativesDone": 0,
-            "errors": [error_entry],
-            "calls_used": get_cg_calls_count(),
-        }
-        last_completed_job = error_job
-        # Set debounce_until BEFORE clearing current_running_job
-        debounce_until = time.time() + DEBOUNCE_SEC
-        current_running_job = None
+        _fail_job(job_id, mode, window, narratives_total, e, narratives)
         raise
 
 
 async def start_or_get_job(
     mode: str = "prod",  # pylint: disable=unused-argument
     window: str = "24h",  # pylint: disable=unused-argument
+    narratives: list[str] | None = None,
+    priority: int = 0,
 ) -> dict[str, t.Any]:
     """Start a new job or return existing job for idempotency.
 
+    Jobs are deduplicated per narrative set: a queued, running or just
+    finished job is reused when it covers every requested narrative.
+    Other requests are queued behind the running job by priority.
+
     :param mode: The mode for the job (currently unused but kept for
         compatibility).
     :param window: The window for the job (currently unused but kept for
         compatibility).
+    :param narratives: Optional subset of narratives, None for all.
+    :param priority: Queue priority, higher runs first.
     :return: Job dictionary with id, state, ts, error, and jobId fields.
     """
-    # pylint: disable=global-statement
-    global current_running_job
-
-    now = time.time()
-
-    # 1) If current_running_job and state=="running": return it
-    if current_running_job and current_running_job.get("state") == "running":
-        return current_running_job
-
-    # 2) If now < debounce_until: return last_completed_job
-    # (and include "jobId" mirror)
-    if now < debounce_until and last_completed_job:
-        return last_completed_job
-
-    # 3) Else create a new job (id, ts, state="running"), immediately finish it
-    # (Step-2 behavior), set last_completed_job = new_job,
-    # debounce_until = now + DEBOUNCE_SEC, current_running_job = None.
-    # Return new_job (and include "jobId").
-    job_id = _gen_id()
-    narratives_total = _get_narrative_count()
-    new_job = {
-        "id": job_id,
-        "state": "running",
-        "ts": now,
-        "error": None,
-        "jobId": job_id,  # Include jobId mirror in response
+    existing = _find_reusable_job(narratives)
+    if existing is not None:
+        return existing
+
+    narratives_total = (
+        _get_narrative_count() if narratives is None else len(narratives)
+    )
+    info: dict[str, t.Any] = {
         "mode": mode,
         "window": window,
         "narrativesTotal": narratives_total,
         "narrativesDone": 0,
         "errors": [],
         "calls_used": 0,
+        "narratives": narratives,
     }
 
-    # Update global state
-    current_running_job = new_job
-
-    # Start the actual refresh job
-    async def _do() -> None:
+    async def _run(job_id: str) -> None:
         if mode in ["dev", "real", "real_cg", "real_mix", "real_ds", "blend"]:
             # Use new processing for dev and real modes
-            _process_dev_mode_job(job_id, mode, window, narratives_total)
-        else:
-            # Use existing refresh_all() for other modes (like prod)
-            # pylint: disable=global-statement
-            global current_running_job, last_completed_job, debounce_until
-            try:
-                refresh_all()
-                mark_refreshed()
-                # Mark as completed
-                completed_ts = time.time()
-                completed_job = {
-                    "id": job_id,
-                    "state": "done",
-                    "ts": completed_ts,
-                    "error": None,
-                    "jobId": job_id,
-                    "mode": mode,
-                    "window": window,
-                    "narrativesTotal": narratives_total,
-                    "narrativesDone": narratives_total,
-                    "errors": [],
-                    "calls_used": get_cg_calls_count(),
-                }
-                last_completed_job = completed_job
-                # Update last success timestamp
-                # pylint: disable=global-statement
-                global last_success_at
-                last_success_at = completed_ts
-                # Set debounce_until BEFORE clearing current_running_job
-                debounce_until = time.time() + DEBOUNCE_SEC
-                current_running_job = None
-            except (ValueError, RuntimeError, OSError) as e:
-                # Mark as error
-                error_entry = {
-                    "narrative": "*",
-                    "code": "JOB_ERROR",
-                    "detail": str(e),
-                }
-                error_job = {
-                    "id": job_id,
-                    "state": "error",
-                    "ts": time.time(),
-                    "error": str(e),
-                    "jobId": job_id,
-                    "mode": mode,
-                    "window": window,
-                    "narrativesTotal": narratives_total,
-                    "narrativesDone": 0,
-                    "errors": [error_entry],
-                    "calls_used": get_cg_calls_count(),
-                }
-                last_completed_job = error_job
-                # Set debounce_until BEFORE clearing current_running_job
-                debounce_until = time.time() + DEBOUNCE_SEC
-                current_running_job = None
-                raise
-
-    # Start the job in the background
-    import asyncio
-
-    asyncio.create_task(_do())
-
-    return new_job
+            await run_blocking(
+                _process_dev_mode_job,
+                job_id,
+                mode,
+                window,
+                narratives_total,
+                narratives,
+            )
+            return
+        # Use existing refresh_all() for other modes (like prod)
+        try:
+            await run_blocking(refresh_all, narratives)
+            mark_refreshed()
+            done: dict[str, t.Any] = {
+                **info,
+                "narrativesDone": narratives_total,
+                "calls_used": ledger.calls_used(),
+            }
+            finish_job(job_id, "done", **done)
+        except (ValueError, RuntimeError, OSError) as e:
+            _fail_job(job_id, mode, window, narratives_total, e, narratives)
+            raise
+
+    async def _do(job_id: str) -> None:
+        with profile_job(job_id):
+            await _run(job_id)
+
+    return submit_job(_do, info, priority)
 
 
 @router.post("/refresh")
-async def refresh(
+async def refresh(  # pylint: disable=too-many-positional-arguments
     window: str = Query(default="24h"),  # noqa: B008
     dry_run: bool = Query(default=False, alias="dryRun"),  # noqa: B008
     mode: str = Query(default="prod"),  # noqa: B008
+    narratives: list[str] | None = Query(default=None),  # noqa: B008
+    select: str | None = Query(default=None),  # noqa: B008
+    priority: int = Query(default=0),  # noqa: B008
+    plan: bool = Query(default=False),  # noqa: B008
     _auth: t.Any = Depends(require_refresh_token),  # noqa: B008
 ) -> dict[str, t.Any]:
-    """Refresh parent data for all narratives.
+    """Refresh parent data for all narratives or a subset.
 
-    For dry run mode, returns legacy format with items.
-    For normal mode, returns { jobId } with 202 Accepted semantics.
+    For dry run mode, returns legacy format with items, or with ``plan``
+    the narratives a job would refresh within ``REFRESH_MAX_CALLS``, their
+    estimated calls and ranking, without calling any provider.
+    For normal mode, returns { jobId } with 202 Accepted semantics, or
+    a None job ID when ``select=stale`` finds nothing due.
 
     :param window: The window to refresh.
     :param dry_run: Whether to run in dry run mode.
     :param mode: The mode for the refresh (dev or other).
+    :param narratives: Optional narrative names to refresh.
+    :param select: Optional selector, e.g. ``stale``.
+    :param priority: Queue priority, higher runs first.
+    :param plan: With ``dryRun``, preview the plan instead.
     :return: Refresh response or Job ID.
     """
+    subset = _resolve_narratives(narratives, select)
+    if dry_run and plan:
+        return {
+            "ok": True,
+            "window": window,
+            "dryRun": True,
+            # a new job starts with the whole budget
+            "plan": _plan_refresh(mode, subset, REFRESH_MAX_CALLS).to_dict(),
+        }
     if dry_run:
-        items = compute_all()
+        items = compute_all(subset)
         return {
             "ok": True,
             "window": window,
@@ -733,42 +994,76 @@ async def refresh(
             "ts": last_refresh_ts(),
         }
 
+    if subset == []:
+        # select=stale found nothing due; do not queue or reuse a job
+        return _nothing_to_refresh()
+
     # Use the same function as /refresh/async to ensure consistent behavior
-    job = await start_or_get_job(mode=mode, window=window)
+    job = await start_or_get_job(
+        mode=mode,
+        window=window,
+        narratives=subset,
+        priority=priority,
+    )
     gc_jobs()  # opportunistic cleanup
     return {"jobId": job["jobId"]}
 
 
 @router.post("/refresh/async")
-async def refresh_async(
+async def refresh_async(  # pylint: disable=too-many-positional-arguments
     mode: str = Query(default="prod"),  # noqa: B008
     window: str = Query(default="24h"),  # noqa: B008
+    narratives: list[str] | None = Query(default=None),  # noqa: B008
+    select: str | None = Query(default=None),  # noqa: B008
+    priority: int = Query(default=0),  # noqa: B008
     _auth: t.Any = Depends(require_refresh_token),  # noqa: B008
 ) -> dict[str, t.Any]:
     """Start a background refresh.
 
     Returns { jobId } with 202 Accepted semantics.
-    If a job is already running, returns the same job ID.
+    If a job covering the same narratives is already queued or running,
+    returns the same job ID; otherwise the job is queued by priority.
+    When ``select=stale`` finds nothing due, no job is started and the
+    job ID is None.
 
     :param mode: The mode for the refresh (dev or other).
     :param window: The window for the refresh.
+    :param narratives: Optional narrative names to refresh.
+    :param select: Optional selector, e.g. ``stale``.
+    :param priority: Queue priority, higher runs first.
     :return: Job ID.
     """
-    job = await start_or_get_job(mode=mode, window=window)
+    subset = _resolve_narratives(narratives, select)
+    if subset == []:
+        return _nothing_to_refresh()
+    job = await start_or_get_job(
+        mode=mode,
+        window=window,
+        narratives=subset,
+        priority=priority,
+    )
     return {"jobId": job["jobId"]}
 
 
 @router.get("/refresh/status/{job_id}")
 async def refresh_status(
     job_id: str,
+    trace: bool = Query(default=False),  # noqa: B008
     _auth: t.Any = Depends(require_refresh_token),  # noqa: B008
 ) -> dict[str, t.Any]:
     """Get status of a refresh job.
 
+    With ``trace=1`` the job's trace is included: each narrative's start
+    and end, provider calls with their latency, cache hits, bytes fetched,
+    rows written and limiter and backoff sleeps. Traces are kept in
+    memory with the job history, so they are None for jobs run by another
+    worker or before a restart.
+
     :param job_id: The ID of the job to get status for.
+    :param trace: Whether to include the job trace.
     :return: Job status.
     """
-    j = _get_job_by_id(job_id)
+    j = get_job(job_id)
     if not j:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -779,9 +1074,96 @@ async def refresh_status(
     response = j.copy()
     response["max_calls"] = REFRESH_MAX_CALLS
     response["per_narrative_cap"] = REFRESH_PER_NARRATIVE_CAP
+    if trace:
+        response["trace"] = get_job_trace(job_id)
     return response
 
 
+async def _job_event_stream(
+    job_id: str,
+    watcher: t.Any,
+    first: dict[str, t.Any],
+) -> t.AsyncIterator[str]:
+    """Stream job events until the job finishes.
+
+    :param job_id: The job ID.
+    :param watcher: Subscription on the job event channel.
+    :param first: The job record at subscription time.
+    :return: Async iterator of SSE frames.
+    """
+    try:
+        final = first["state"] in FINISHED
+        yield sse_frame(
+            first["state"] if final else "progress",
+            json.dumps(first),
+        )
+        while not final:
+            try:
+                final, frame = await asyncio.wait_for(
+                    watcher.queue.get(),
+                    SSE_KEEPALIVE_SEC,
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield frame
+    finally:
+        JOB_EVENTS.unsubscribe(watcher)
+        logging.debug("[REFRESH] event stream closed job=%s", job_id)
+
+
+@router.get("/refresh/events/{job_id}")
+async def refresh_events(
+    job_id: str,
+    _auth: t.Any = Depends(require_refresh_token),  # noqa: B008
+) -> StreamingResponse:
+    """Stream progress of a refresh job as server-sent events.
+
+    Sends the current job record, a ``progress`` event on every update
+    and a final ``done``, ``error`` or ``cancelled`` event, then closes.
+    All watchers of a job share one broadcast channel.
+
+    :param job_id: The ID of the job to follow.
+    :return: Event stream response.
+    """
+    watcher = JOB_EVENTS.subscribe(job_id)
+    j = get_job(job_id)
+    if not j:
+        JOB_EVENTS.unsubscribe(watcher)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="unknown job",
+        )
+    return StreamingResponse(
+        _job_event_stream(job_id, watcher, j),
+        media_type="text/event-stream",
+        headers={"cache-control": "no-cache", "x-accel-buffering": "no"},
+    )
+
+
+@router.delete("/refresh/{job_id}")
+async def refresh_cancel(
+    job_id: str,
+    _auth: t.Any = Depends(require_refresh_token),  # noqa: B008
+) -> dict[str, t.Any]:
+    """Cancel a refresh job.
+
+    Queued jobs are cancelled right away. Running jobs stop at the next
+    checkpoint (between narratives or provider calls) and keep the
+    narratives they already wrote. Finished jobs are returned unchanged.
+
+    :param job_id: The ID of the job to cancel.
+    :return: Job status.
+    """
+    j = cancel_job(job_id)
+    if not j:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="unknown job",
+        )
+    return j
+
+
 @router.get("/refresh/status")
 async def refresh_overview(
     _auth: t.Any = Depends(require_refresh_token),  # noqa: B008
@@ -790,22 +1172,15 @@ async def refresh_overview(
 
     :return: Status of refresh jobs - either running job or last finished job.
     """
-    # Use the new module-level registry
-    if current_running_job and current_running_job.get("state") == "running":
-        response = {"running": True, **current_running_job}
-        if last_success_at > 0:
-            response["lastSuccessAt"] = last_success_at
-        # Add budget information
-        response["max_calls"] = REFRESH_MAX_CALLS
-        response["per_narrative_cap"] = REFRESH_PER_NARRATIVE_CAP
-        return response
-
-    response = {
-        "running": False,
-        "lastJob": last_completed_job,
-    }
-    if last_success_at > 0:
-        response["lastSuccessAt"] = last_success_at
+    running = list_jobs("running")
+    if running:
+        response = {"running": True, **running[0]}
+    else:
+        response = {"running": False, "lastJob": last_finished_job()}
+    response["queued"] = queued_job_ids()
+    success_ts = last_success_ts()
+    if success_ts > 0:
+        response["lastSuccessAt"] = success_ts
     # Add budget information
     response["max_calls"] = REFRESH_MAX_CALLS
     response["per_narrative_cap"] = REFRESH_PER_NARRATIVE_CAP
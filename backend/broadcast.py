@@ -0,0 +1,99 @@
+"""In-memory broadcast channel for refresh job events.
+
+Jobs publish from worker threads; watchers are asyncio queues on the
+event loop. Each event is serialized once and handed to every watcher
+of the job, so many clients can follow one refresh without polling.
+"""
+
+import asyncio
+import threading
+
+# events buffered per watcher before the oldest are dropped
+QUEUE_SIZE = 64
+
+Event = tuple[bool, str]
+
+
+class _Watcher:  # pylint: disable=too-few-public-methods
+    __slots__ = ("loop", "queue", "job_id")
+
+    def __init__(self, job_id: str | None) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[Event] = asyncio.Queue(QUEUE_SIZE)
+        self.job_id = job_id
+
+    def offer(self, event: Event) -> None:
+        """Queue an event, dropping the oldest one if the watcher lags.
+
+        :param event: Tuple of (final, frame).
+        """
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+
+class Broadcaster:
+    """Fan out serialized events to asyncio watchers from any thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._watchers: list[_Watcher] = []
+
+    def subscribe(self, job_id: str | None = None) -> _Watcher:
+        """Register a watcher on the running event loop.
+
+        :param job_id: Only receive events of this job, None for all.
+        :return: The watcher; read events from its ``queue``.
+        """
+        watcher = _Watcher(job_id)
+        with self._lock:
+            self._watchers.append(watcher)
+        return watcher
+
+    def unsubscribe(self, watcher: _Watcher) -> None:
+        """Remove a watcher.
+
+        :param watcher: The watcher returned by subscribe.
+        """
+        with self._lock:
+            if watcher in self._watchers:
+                self._watchers.remove(watcher)
+
+    def has_watchers(self, job_id: str) -> bool:
+        """Check whether anyone listens to a job.
+
+        :param job_id: The job ID.
+        :return: True if an event would be delivered.
+        """
+        with self._lock:
+            return any(w.job_id in (None, job_id) for w in self._watchers)
+
+    def publish(self, job_id: str, frame: str, final: bool = False) -> None:
+        """Deliver a serialized event to the watchers of a job.
+
+        :param job_id: The job ID.
+        :param frame: The serialized event.
+        :param final: Whether this is the last event of the job.
+        """
+        with self._lock:
+            watchers = [
+                w for w in self._watchers if w.job_id in (None, job_id)
+            ]
+        for w in watchers:
+            try:
+                w.loop.call_soon_threadsafe(w.offer, (final, frame))
+            except RuntimeError:  # loop closed; watcher is gone
+                self.unsubscribe(w)
+
+
+JOB_EVENTS = Broadcaster()
+
+
+def sse_frame(event: str, data: str) -> str:
+    """Format a server-sent event.
+
+    :param event: The event name.
+    :param data: The event payload, a single line of JSON.
+    :return: The SSE frame.
+    """
+    return f"event: {event}\ndata: {data}\n\n"
@@ -0,0 +1,63 @@
+"""Time budgets for provider fetches.
+
+A narrative fetch runs under ``deadline(seconds)``. The deadline is kept
+in a context variable, so every provider call made for the narrative,
+including calls fanned out to other threads, sees how much time is left
+and sizes its timeouts, retries and backoff sleeps to fit.
+"""
+
+import contextlib
+import contextvars
+import os
+import time
+import typing as t
+
+# overall time budget for fetching one narrative (seconds)
+NARRATIVE_BUDGET_SEC = float(os.getenv("NARRATIVE_BUDGET_SEC", "120"))
+
+# absolute time.monotonic() deadline of the current fetch, if any
+_DEADLINE: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "deadline",
+    default=None,
+)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float) -> t.Iterator[None]:
+    """Bound the calls made inside the block by a time budget.
+
+    A nested deadline can only shorten the budget, never extend it.
+
+    :param seconds: Budget in seconds from now.
+    :yield: None.
+    """
+    end = time.monotonic() + seconds
+    current = _DEADLINE.get()
+    if current is not None:
+        end = min(end, current)
+    token = _DEADLINE.set(end)
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def remaining() -> float | None:
+    """Get the time left in the current budget.
+
+    :return: Seconds left (0 once expired), or None without a deadline.
+    """
+    end = _DEADLINE.get()
+    if end is None:
+        return None
+    return max(0.0, end - time.monotonic())
+
+
+def bounded(seconds: float) -> float:
+    """Shorten a timeout or sleep so it ends within the current budget.
+
+    :param seconds: The desired duration.
+    :return: The duration capped by the time left.
+    """
+    left = remaining()
+    return seconds if left is None else min(seconds, left)
@@ -0,0 +1,283 @@
+"""Executors for blocking refresh work.
+
+Refresh jobs are synchronous (``requests``, SQLAlchemy, ``time.sleep``),
+so they are kept off the event loop. ``REFRESH_EXECUTOR`` selects where
+they run:
+
+- ``thread`` (default): the whole job runs on a worker thread.
+- ``process``: the job is orchestrated on a worker thread and provider
+  fetches run in a process pool, so response parsing does not hold the
+  API process GIL. Each worker process keeps its own rate limiters,
+  circuit breakers and HTTP and raw caches: the combined request rate
+  to a host can reach ``REFRESH_WORKERS`` times its limit, a host
+  tripped in one worker is still tried from the others, and the
+  planner's cost estimates only see the API process caches. Opt in only
+  where that is acceptable; a warning is logged when the pool starts.
+- ``inline``: the job runs on the event loop (tests, debugging).
+
+Independent provider fetches within a job are fanned out on a separate
+small thread pool (``fan_out``) so a narrative waits for the slowest
+provider rather than for all of them in turn. A provider's own searches
+for a narrative go out together on a pool of their own
+(``map_concurrent``), and slow idempotent requests can be ``hedged`` with
+a second copy on another pool.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import time
+import typing as t
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+
+from .deadline import deadline
+
+T = t.TypeVar("T")
+A = t.TypeVar("A")
+
+logger = logging.getLogger(__name__)
+
+REFRESH_EXECUTOR = (os.getenv("REFRESH_EXECUTOR") or "thread").lower()
+
+# worker threads for jobs, worker processes for provider fetches
+REFRESH_WORKERS = int(os.getenv("REFRESH_WORKERS", "2"))
+
+# threads for concurrent provider fetches within a job
+FANOUT_WORKERS = int(os.getenv("FANOUT_WORKERS", "4"))
+
+# threads for concurrent searches within a provider fetch
+SEARCH_WORKERS = int(os.getenv("SEARCH_WORKERS", "6"))
+
+_threads: ThreadPoolExecutor | None = None
+_processes: ProcessPoolExecutor | None = None
+_fanout: ThreadPoolExecutor | None = None
+_hedges: ThreadPoolExecutor | None = None
+_searches: ThreadPoolExecutor | None = None
+
+
+def _thread_pool() -> ThreadPoolExecutor:
+    global _threads  # pylint: disable=global-statement
+    if _threads is None:
+        _threads = ThreadPoolExecutor(
+            max_workers=REFRESH_WORKERS,
+            thread_name_prefix="refresh",
+        )
+    return _threads
+
+
+def _process_pool() -> ProcessPoolExecutor:
+    global _processes  # pylint: disable=global-statement
+    if _processes is None:
+        logger.warning(
+            "REFRESH_EXECUTOR=process: rate limits, circuit breakers and "
+            "caches are per worker process, not shared across %d workers",
+            REFRESH_WORKERS,
+        )
+        _processes = ProcessPoolExecutor(max_workers=REFRESH_WORKERS)
+    return _processes
+
+
+def _fanout_pool() -> ThreadPoolExecutor:
+    global _fanout  # pylint: disable=global-statement
+    if _fanout is None:
+        _fanout = ThreadPoolExecutor(
+            max_workers=FANOUT_WORKERS,
+            thread_name_prefix="fanout",
+        )
+    return _fanout
+
+
+def _search_pool() -> ThreadPoolExecutor:
+    # separate from the fan-out pool, whose threads wait on searches
+    global _searches  # pylint: disable=global-statement
+    if _searches is None:
+        _searches = ThreadPoolExecutor(
+            max_workers=SEARCH_WORKERS,
+            thread_name_prefix="search",
+        )
+    return _searches
+
+
+def _hedge_pool() -> ThreadPoolExecutor:
+    # separate from the fan-out pool, whose threads wait on hedges
+    global _hedges  # pylint: disable=global-statement
+    if _hedges is None:
+        _hedges = ThreadPoolExecutor(
+            max_workers=2 * FANOUT_WORKERS,
+            thread_name_prefix="hedge",
+        )
+    return _hedges
+
+
+async def run_blocking(fn: t.Callable[..., T], *args: t.Any) -> T:
+    """Run a blocking function without stalling the event loop.
+
+    The caller's context variables (e.g. the current job) are visible to
+    fn on the worker thread.
+
+    :param fn: The function to run.
+    :param args: Positional arguments for fn.
+    :return: The result of fn.
+    """
+    if REFRESH_EXECUTOR == "inline":
+        return fn(*args)
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(
+        _thread_pool(),
+        functools.partial(ctx.run, fn, *args),
+    )
+
+
+def process_pool_enabled() -> bool:
+    """Check whether provider fetches go to the process pool.
+
+    :return: True if ``REFRESH_EXECUTOR`` is ``process``.
+    """
+    return REFRESH_EXECUTOR == "process"
+
+
+def run_in_process(fn: t.Callable[..., T], *args: t.Any) -> T:
+    """Run a picklable function in the process pool and wait for it.
+
+    :param fn: Module-level function to run.
+    :param args: Picklable positional arguments for fn.
+    :return: The result of fn.
+    """
+    return _process_pool().submit(fn, *args).result()
+
+
+def _until(fn: t.Callable[[], T], end: float) -> T:
+    # the deadline counts from the fan-out, not from when the call starts
+    with deadline(end - time.monotonic()):
+        return fn()
+
+
+def fan_out(
+    calls: dict[str, t.Callable[[], T]],
+    timeouts: dict[str, float],
+) -> dict[str, T | Exception]:
+    """Run independent blocking calls concurrently and collect results.
+
+    Every call sees the caller's context variables, so job cancellation
+    reaches it. A call that raises, or is still running when its timeout
+    (seconds from the start of the fan-out) expires, yields the exception
+    instead of a result. Each call runs under a deadline ending with its
+    timeout, so an abandoned call stops at its next request or sleep
+    instead of running on in the pool. Non-``Exception`` errors such as
+    job cancellation are re-raised.
+
+    :param calls: Zero-argument callables by name.
+    :param timeouts: Timeout in seconds by name.
+    :return: Result or exception by name.
+    """
+    start = time.monotonic()
+    futures = {
+        name: _fanout_pool().submit(
+            contextvars.copy_context().run,
+            _until,
+            fn,
+            start + timeouts[name],
+        )
+        for name, fn in calls.items()
+    }
+    results: dict[str, T | Exception] = {}
+    for name, future in futures.items():
+        remaining = start + timeouts[name] - time.monotonic()
+        try:
+            results[name] = future.result(timeout=max(0.0, remaining))
+        except TimeoutError:
+            future.cancel()
+            results[name] = TimeoutError(
+                f"{name} timed out after {timeouts[name]}s",
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            results[name] = e
+    return results
+
+
+def map_concurrent(
+    fn: t.Callable[[A], T],
+    args: t.Sequence[A],
+) -> list[T | Exception]:
+    """Call a blocking function on each argument concurrently.
+
+    Every call sees the caller's context variables, so deadlines, budgets
+    and job cancellation reach it. A call that raises yields the exception
+    instead of a result; non-``Exception`` errors such as job cancellation
+    are re-raised.
+
+    :param fn: One-argument callable, e.g. a provider search.
+    :param args: Arguments, one call each.
+    :return: Result or exception per argument, in order.
+    """
+    pool = _search_pool()
+    futures = [
+        pool.submit(contextvars.copy_context().run, fn, arg) for arg in args
+    ]
+    results: list[T | Exception] = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            results.append(e)
+    return results
+
+
+def hedged(
+    fn: t.Callable[[], T],
+    delay: float,
+    on_hedge: t.Callable[[], None] | None = None,
+) -> T:
+    """Call an idempotent function, racing a second call if it is slow.
+
+    If fn has not returned after delay seconds, a second call is started
+    and the first successful result wins; the slower call is abandoned.
+    A delay of 0 calls fn directly.
+
+    :param fn: Zero-argument idempotent callable, e.g. an HTTP GET.
+    :param delay: Seconds to wait before hedging, 0 to disable.
+    :param on_hedge: Called on this thread before the second call starts.
+    :return: The first successful result.
+    :raises Exception: The last error if both calls fail.
+    """
+    if delay <= 0:
+        return fn()
+    pool = _hedge_pool()
+    first = pool.submit(contextvars.copy_context().run, fn)
+    try:
+        return first.result(timeout=delay)
+    except TimeoutError:
+        if first.done():
+            # fn raised TimeoutError itself, e.g. past its deadline
+            return first.result()
+    if on_hedge is not None:
+        on_hedge()
+    second = pool.submit(contextvars.copy_context().run, fn)
+    error: Exception | None = None
+    for future in as_completed((first, second)):
+        try:
+            return future.result()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            error = e
+    raise t.cast(Exception, error)
+
+
+def shutdown_executors() -> None:
+    """Stop the worker pools, dropping work that has not started."""
+    # pylint: disable-next=global-statement
+    global _threads, _processes, _fanout, _hedges, _searches
+    for pool in (_threads, _processes, _fanout, _hedges, _searches):
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    _threads = None
+    _processes = None
+    _fanout = None
+    _hedges = None
+    _searches = None
@@ -0,0 +1,48 @@
+"""Shared copies of strings repeated across parents.
+
+Provider data repeats a handful of values (sources, chain IDs) on every
+parent, and each decoded response or database row would otherwise bring
+its own copy. Adapters pass such low-cardinality fields through
+``interned`` when they normalize data, so every parent shares one string
+object per value. High-cardinality values (names, symbols, addresses) are
+not interned: interned strings live for the rest of the process.
+
+CoinGecko coin page URLs are derived from the coin ID with ``coin_url``
+instead of being stored, and ``coin_id`` recovers the ID from such a URL.
+"""
+
+import sys
+
+COIN_URL = "https://www.coingecko.com/en/coins/"
+
+
+def interned(value: str | None) -> str | None:
+    """Get the shared copy of a low-cardinality string.
+
+    :param value: The string, or None.
+    :return: The interned string, or None.
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def coin_url(coin: str) -> str:
+    """Get the CoinGecko page URL of a coin.
+
+    :param coin: The CoinGecko coin ID.
+    :return: The coin page URL.
+    """
+    return COIN_URL + coin
+
+
+def coin_id(url: str) -> str | None:
+    """Get the coin ID from a CoinGecko coin page URL.
+
+    :param url: A URL.
+    :return: The coin ID, or None if the URL is not a coin page.
+    """
+    if url.startswith(COIN_URL) and len(url) > len(COIN_URL):
+        rest = url[len(COIN_URL) :]
+        # the ID must reproduce the URL exactly
+        if "/" not in rest and "?" not in rest and "#" not in rest:
+            return rest
+    return None
@@ -1,37 +1,287 @@
-"""Background job management for refresh operations."""
+"""Background job registry and queue for refresh operations.
+
+Jobs are queued by priority and run one at a time (``JOBS_MAX_RUNNING``)
+so refreshes never compete for provider budgets. Finished jobs are kept
+in a bounded history and, with ``JOBS_PERSIST`` set, mirrored to SQLite
+so their status survives restarts and is visible to every worker.
+
+Database writes go through a single writer thread, so a slow SQLite
+commit never holds the registry lock or the event loop. Each persisted
+row records the process that owns it; on startup a worker fails only
+the unfinished rows whose owner is gone, never the jobs other live
+workers are still running.
+"""
 
 import asyncio
+import contextvars
+import functools
+import heapq
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
 import time
 import typing as t
 import uuid
+from collections import deque
+
+from . import ledger
+from .broadcast import JOB_EVENTS, sse_frame
+from .tracing import JobTrace, begin
+
+State = t.Literal["queued", "running", "done", "error", "cancelled"]
+Runner = t.Callable[[str], t.Awaitable[None]]
+
+FINISHED: tuple[State, ...] = ("done", "error", "cancelled")
+
+# number of jobs allowed to run at once
+JOBS_MAX_RUNNING = int(os.getenv("JOBS_MAX_RUNNING", "1"))
+
+# number of finished jobs kept in memory
+JOBS_HISTORY = int(os.getenv("JOBS_HISTORY", "50"))
 
-State = t.Literal["queued", "running", "done", "error"]
+# mirror job records to the database
+JOBS_PERSIST = os.getenv("JOBS_PERSIST", "").lower() in ("1", "true", "yes")
 
+# owner recorded on persisted rows: pid plus a per-boot id, since a
+# restarted worker can be given its old pid
+_OWNER = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
 
-class _Job:  # pylint: disable=too-few-public-methods
-    """Internal job representation."""
+logger = logging.getLogger(__name__)
 
-    __slots__ = ("id", "state", "ts", "error")
 
-    def __init__(self, jid: str):
+class JobCancelled(BaseException):
+    """Raised at a checkpoint once the current job was cancelled.
+
+    Derives from BaseException, like ``asyncio.CancelledError``, so the
+    broad ``except Exception`` fallbacks in the adapters let it through.
+    """
+
+
+class _Job:
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """Internal job representation.
+
+    :param jid: The job ID.
+    :param info: Progress record fields exposed with the job.
+    :param priority: Queue priority, higher runs first.
+    """
+
+    __slots__ = (
+        "id",
+        "state",
+        "ts",
+        "error",
+        "priority",
+        "info",
+        "runner",
+        "cancel_event",
+        "trace",
+    )
+
+    def __init__(
+        self,
+        jid: str,
+        info: dict[str, t.Any] | None = None,
+        priority: int = 0,
+    ):
         self.id = jid
         self.state: State = "queued"
         self.ts: float = time.time()
         self.error: str | None = None
+        self.priority = priority
+        self.info: dict[str, t.Any] = dict(info or {})
+        self.runner: Runner | None = None
+        self.cancel_event = threading.Event()
+        self.trace: JobTrace | None = None
+
+    def snapshot(self) -> dict[str, t.Any]:
+        """Return the job as a plain progress record.
+
+        :return: Job dictionary.
+        """
+        return {
+            **self.info,
+            "id": self.id,
+            "jobId": self.id,
+            "state": self.state,
+            "ts": self.ts,
+            "error": self.error,
+            "priority": self.priority,
+        }
 
 
 JOBS: dict[str, _Job] = {}
-_LOCK = asyncio.Lock()
+_QUEUE: list[tuple[int, int, str]] = []
+_RUNNING: set[str] = set()
+_HISTORY: deque[str] = deque()
+_SEQ = itertools.count()
+_TASKS: set[asyncio.Task] = set()
+
+# jobs report progress from refresh worker threads
+_LOCK = threading.RLock()
+
+# database writes, applied in order by the writer thread
+_WRITES: queue.Queue[t.Callable[[], t.Any]] = queue.Queue()
+_WRITER: threading.Thread | None = None
+
+# ID of the job the current task or worker thread is running
+_CURRENT_JOB: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "current_job",
+    default=None,
+)
 
 
 def _new_id() -> str:
     return uuid.uuid4().hex[:12]
 
 
+def _publish(job: _Job) -> None:
+    """Push the job record to its event stream watchers."""
+    if not JOB_EVENTS.has_watchers(job.id):
+        return
+    final = job.state in FINISHED
+    frame = sse_frame(
+        job.state if final else "progress",
+        json.dumps(job.snapshot()),
+    )
+    JOB_EVENTS.publish(job.id, frame, final)
+
+
+def _write_loop() -> None:
+    while True:
+        write = _WRITES.get()
+        try:
+            write()
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("[jobs] database write failed")
+        finally:
+            _WRITES.task_done()
+
+
+def _write(fn: t.Callable[..., t.Any], *args: t.Any) -> None:
+    """Queue a database write for the writer thread."""
+    global _WRITER  # pylint: disable=global-statement
+    with _LOCK:
+        if _WRITER is None:
+            _WRITER = threading.Thread(
+                target=_write_loop,
+                name="jobs-writer",
+                daemon=True,
+            )
+            _WRITER.start()
+        _WRITES.put(functools.partial(fn, *args))
+
+
+def _persist(job: _Job) -> None:
+    if not JOBS_PERSIST:
+        return
+    from .repo import save_job  # pylint: disable=import-outside-toplevel
+
+    # the snapshot is taken now, under the lock; the write happens later
+    _write(save_job, job.snapshot(), _OWNER)
+
+
+def flush_jobs() -> None:
+    """Wait until queued job records are written to the database."""
+    _WRITES.join()
+
+
+def _orphaned(owner: str | None) -> bool:
+    """Check whether the process owning a persisted job is gone.
+
+    :param owner: Owner recorded on the row, None for older rows.
+    :return: True if no live process can finish the job.
+    """
+    if not owner:
+        return True
+    pid = int(owner.partition(":")[0])
+    if pid == os.getpid():
+        # an earlier life of this worker
+        return owner != _OWNER
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+
 async def _run_refresh(refresh_fn: t.Callable[[], t.Awaitable[None]]) -> None:
     await refresh_fn()
 
 
+async def _execute(job: _Job) -> None:
+    runner = t.cast(Runner, job.runner)
+    _CURRENT_JOB.set(job.id)
+    job.trace = begin()
+    ledger.begin()
+    try:
+        await runner(job.id)
+    except JobCancelled:
+        finish_job(job.id, "cancelled")
+    except asyncio.CancelledError:
+        finish_job(job.id, "cancelled")
+        raise
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        # any failure must finish the job, or it holds its running slot
+        finish_job(job.id, "error", error=str(e) or type(e).__name__)
+    else:
+        finish_job(job.id, "done")
+    finally:
+        job.runner = None
+        with _LOCK:
+            _RUNNING.discard(job.id)
+        _dispatch()
+
+
+def _dispatch() -> None:
+    """Start queued jobs while running slots are free."""
+    with _LOCK:
+        while _QUEUE and len(_RUNNING) < JOBS_MAX_RUNNING:
+            jid = heapq.heappop(_QUEUE)[2]
+            job = JOBS.get(jid)
+            if job is None or job.state != "queued":
+                continue
+            job.state = "running"
+            job.ts = time.time()
+            _RUNNING.add(jid)
+            _persist(job)
+            _publish(job)
+            # fire-and-forget (keep reference so it isn't gc'd)
+            task = asyncio.get_running_loop().create_task(_execute(job))
+            _TASKS.add(task)
+            task.add_done_callback(_TASKS.discard)
+
+
+def submit_job(
+    runner: Runner,
+    info: dict[str, t.Any] | None = None,
+    priority: int = 0,
+) -> dict[str, t.Any]:
+    """Queue a job and start it as soon as a running slot is free.
+
+    Must be called from a running event loop.
+
+    :param runner: Coroutine function doing the work, called with the
+        job ID.
+    :param info: Progress record fields exposed with the job.
+    :param priority: Queue priority, higher runs first.
+    :return: The job record at submission time.
+    """
+    with _LOCK:
+        job = _Job(_new_id(), info, priority)
+        job.runner = runner
+        JOBS[job.id] = job
+        heapq.heappush(_QUEUE, (-priority, next(_SEQ), job.id))
+        _persist(job)
+        _dispatch()
+        return job.snapshot()
+
+
 async def start_refresh_job(
     refresh_fn: t.Callable[[], t.Awaitable[None]],
 ) -> str:
@@ -42,59 +292,260 @@ async def start_refresh_job(
     :param refresh_fn: The function to run in the background.
     :return: A short job id.
     """
-    jid = _new_id()
-    job = _Job(jid)
-    async with _LOCK:
-        JOBS[jid] = job
+    return submit_job(lambda _jid: _run_refresh(refresh_fn))["id"]
 
-    async def _runner() -> None:
-        job.state = "running"
-        job.ts = time.time()
-        try:
-            await _run_refresh(refresh_fn)
-            job.state = "done"
-        except (
-            RuntimeError,
-            ValueError,
-            OSError,
-        ) as e:  # more specific exceptions
-            job.state = "error"
-            job.error = str(e)
-        finally:
+
+def update_job(jid: str, **fields: t.Any) -> None:
+    """Update the progress record of an active job.
+
+    :param jid: The job ID.
+    :param fields: Progress fields to set.
+    """
+    with _LOCK:
+        job = JOBS.get(jid)
+        if job is None or job.state in FINISHED:
+            return
+        job.info.update(fields)
+        _persist(job)
+        _publish(job)
+
+
+def finish_job(
+    jid: str,
+    state: State,
+    error: str | None = None,
+    **fields: t.Any,
+) -> dict[str, t.Any] | None:
+    """Move a job to a final state and record it in the history.
+
+    Finishing an already finished job is a no-op.
+
+    :param jid: The job ID.
+    :param state: The final state.
+    :param error: Optional error message.
+    :param fields: Final progress fields to set.
+    :return: The finished job record, or None if the job is unknown.
+    """
+    with _LOCK:
+        job = JOBS.get(jid)
+        if job is None:
+            return None
+        if job.state not in FINISHED:
+            job.state = state
+            job.error = error
             job.ts = time.time()
+            job.info.update(fields)
+            _RUNNING.discard(jid)
+            _HISTORY.append(jid)
+            while len(_HISTORY) > JOBS_HISTORY:
+                JOBS.pop(_HISTORY.popleft(), None)
+            _persist(job)
+            _publish(job)
+        return job.snapshot()
+
+
+def cancel_job(jid: str) -> dict[str, t.Any] | None:
+    """Cancel a job.
+
+    Queued jobs are cancelled right away; running jobs are flagged and
+    stop at their next cancellation checkpoint.
+
+    :param jid: The job ID.
+    :return: The job record, or None if the job is unknown.
+    """
+    with _LOCK:
+        job = JOBS.get(jid)
+        if job is None:
+            return None
+        if job.state == "queued":
+            job.runner = None
+            return finish_job(jid, "cancelled")
+        if job.state == "running":
+            job.cancel_event.set()
+            job.info["cancelRequested"] = True
+            _persist(job)
+            _publish(job)
+        return job.snapshot()
+
+
+def is_cancel_requested(jid: str) -> bool:
+    """Check whether cancellation was requested for a job.
+
+    :param jid: The job ID.
+    :return: True if the job should stop.
+    """
+    job = JOBS.get(jid)
+    return job is not None and job.cancel_event.is_set()
+
 
-    # fire-and-forget (keep reference so it isn't gc'd)
-    asyncio.create_task(_runner())
-    return jid
+def checkpoint() -> None:
+    """Stop the current job if cancellation was requested.
+
+    A no-op outside of jobs.
+
+    :raises JobCancelled: If the current job was cancelled.
+    """
+    jid = _CURRENT_JOB.get()
+    if jid is not None and is_cancel_requested(jid):
+        raise JobCancelled(jid)
+
+
+def cancellable_sleep(seconds: float) -> None:
+    """Sleep, waking up early if the current job is cancelled.
+
+    :param seconds: Time to sleep.
+    :raises JobCancelled: If the current job was cancelled.
+    """
+    job = JOBS.get(_CURRENT_JOB.get() or "")
+    if job is None:
+        time.sleep(seconds)
+        return
+    job.cancel_event.wait(seconds)
+    checkpoint()
 
 
 def get_job(jid: str) -> dict | None:
     """Get job information by ID.
 
+    Falls back to the database when persistence is enabled, so jobs run
+    by other workers or before a restart can be looked up.
+
     :param jid: The ID of the job to get information for.
     :return: Job information.
     """
-    job = JOBS.get(jid)
-    if not job:
+    with _LOCK:
+        job = JOBS.get(jid)
+        if job is not None:
+            return job.snapshot()
+    if not JOBS_PERSIST:
         return None
-    return {"id": job.id, "state": job.state, "ts": job.ts, "error": job.error}
+    from .repo import load_job  # pylint: disable=import-outside-toplevel
+
+    return load_job(jid)
+
+
+def get_job_trace(jid: str) -> dict[str, t.Any] | None:
+    """Get the trace of a job.
+
+    :param jid: The job ID.
+    :return: The trace, or None for jobs not run by this process.
+    """
+    with _LOCK:
+        job = JOBS.get(jid)
+    if job is None or job.trace is None:
+        return None
+    return job.trace.to_dict()
+
+
+def list_jobs(*states: State) -> list[dict[str, t.Any]]:
+    """List jobs, newest first.
+
+    :param states: Optional states to filter by.
+    :return: Job records.
+    """
+    with _LOCK:
+        jobs = [j for j in JOBS.values() if not states or j.state in states]
+        jobs.sort(key=lambda j: j.ts, reverse=True)
+        return [j.snapshot() for j in jobs]
+
+
+def queued_job_ids() -> list[str]:
+    """List queued job IDs in the order they will run.
+
+    :return: Job IDs.
+    """
+    with _LOCK:
+        return [
+            jid
+            for _, _, jid in sorted(_QUEUE)
+            if jid in JOBS and JOBS[jid].state == "queued"
+        ]
+
+
+def last_finished_job() -> dict[str, t.Any] | None:
+    """Get the most recently finished job.
+
+    :return: Job record or None if no job has finished.
+    """
+    with _LOCK:
+        while _HISTORY:
+            job = JOBS.get(_HISTORY[-1])
+            if job is not None:
+                return job.snapshot()
+            _HISTORY.pop()
+        return None
+
+
+def last_success_ts() -> float:
+    """Get the finish time of the most recent successful job.
+
+    :return: Timestamp, or 0.0 if no job succeeded yet.
+    """
+    with _LOCK:
+        done = [
+            JOBS[j].ts
+            for j in _HISTORY
+            if j in JOBS and JOBS[j].state == "done"
+        ]
+        return max(done, default=0.0)
+
+
+def restore_jobs() -> None:
+    """Load recently finished jobs from the database into the history.
+
+    Jobs still queued or running in the database whose worker process
+    is gone were interrupted by a restart; they are marked as errored
+    first, so their status does not stay ``running`` forever. Jobs of
+    other live workers are left alone.
+    """
+    if not JOBS_PERSIST:
+        return
+    # pylint: disable-next=import-outside-toplevel
+    from .repo import fail_unfinished_jobs, load_jobs
+
+    fail_unfinished_jobs("interrupted by restart", _orphaned)
+    records = load_jobs(JOBS_HISTORY)
+    with _LOCK:
+        for record in reversed(records):
+            if record["id"] in JOBS or record["state"] not in FINISHED:
+                continue
+            job = _Job(record["id"], record, int(record.get("priority") or 0))
+            job.state = record["state"]
+            job.ts = float(record["ts"])
+            job.error = record.get("error")
+            for key in ("id", "jobId", "state", "ts", "error", "priority"):
+                job.info.pop(key, None)
+            JOBS[job.id] = job
+            _HISTORY.append(job.id)
 
 
 def gc_jobs(max_age_sec: int = 3600) -> None:
     """Drop completed/error jobs older than max_age_sec.
 
+    Persisted rows of finished jobs that old are pruned as well.
+
     :param max_age_sec: The maximum age of a job in seconds.
     """
-    now = time.time()
-    to_drop = [
-        k
-        for k, j in JOBS.items()
-        if j.state in ("done", "error") and now - j.ts > max_age_sec
-    ]
-    for k in to_drop:
-        JOBS.pop(k, None)
+    with _LOCK:
+        now = time.time()
+        to_drop = [
+            k
+            for k, j in JOBS.items()
+            if j.state in FINISHED and now - j.ts > max_age_sec
+        ]
+        for k in to_drop:
+            JOBS.pop(k, None)
+        if JOBS_PERSIST:
+            # pylint: disable-next=import-outside-toplevel
+            from .repo import prune_jobs
+
+            _write(prune_jobs, now - max_age_sec)
 
 
 def clear_jobs() -> None:
     """Clear all jobs from the store. Used for testing."""
-    JOBS.clear()
+    with _LOCK:
+        JOBS.clear()
+        _QUEUE.clear()
+        _RUNNING.clear()
+        _HISTORY.clear()
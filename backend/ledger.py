@@ -0,0 +1,126 @@
+"""Per-job accounting of provider calls.
+
+Every provider request is counted by host in a ``CallLedger``. A running
+job holds its own ledger in a context variable, so calls made for it,
+including those fanned out to other threads, count against its budget
+only; overlapping jobs, dry runs and scheduler work no longer reset or
+inflate each other's counts. Calls made outside of any job count in a
+process-wide ledger.
+"""
+
+import collections
+import contextlib
+import contextvars
+import threading
+import typing as t
+
+
+class CallLedger:
+    """Provider calls made, by host."""
+
+    def __init__(self) -> None:
+        """Start an empty ledger."""
+        self._lock = threading.Lock()
+        self._calls: collections.Counter[str] = collections.Counter()
+
+    def add(self, host: str, n: int = 1) -> None:
+        """Count calls to a host.
+
+        :param host: Provider host.
+        :param n: Number of calls.
+        """
+        with self._lock:
+            self._calls[host] += n
+
+    def merge(self, calls: t.Mapping[str, int]) -> None:
+        """Count calls recorded elsewhere, e.g. in a worker process.
+
+        :param calls: Calls by host.
+        """
+        with self._lock:
+            self._calls.update(calls)
+
+    def get(self, host: str) -> int:
+        """Get the calls made to a host.
+
+        :param host: Provider host.
+        :return: Number of calls.
+        """
+        with self._lock:
+            return self._calls[host]
+
+    @property
+    def total(self) -> int:
+        """Calls made to every host."""
+        with self._lock:
+            return sum(self._calls.values())
+
+    def clear(self) -> None:
+        """Forget the calls counted."""
+        with self._lock:
+            self._calls.clear()
+
+    def to_dict(self) -> dict[str, int]:
+        """Export the counts.
+
+        :return: Calls by host.
+        """
+        with self._lock:
+            return dict(self._calls)
+
+
+# calls made outside of any job
+_PROCESS = CallLedger()
+
+_LEDGER: contextvars.ContextVar[CallLedger | None] = contextvars.ContextVar(
+    "call_ledger",
+    default=None,
+)
+
+
+def current() -> CallLedger:
+    """Get the ledger calls in the current context count in.
+
+    :return: The job's ledger, or the process-wide one outside jobs.
+    """
+    return _LEDGER.get() or _PROCESS
+
+
+def begin() -> CallLedger:
+    """Start counting the calls of the job running in this context.
+
+    :return: The new ledger.
+    """
+    ledger = CallLedger()
+    _LEDGER.set(ledger)
+    return ledger
+
+
+@contextlib.contextmanager
+def counting() -> t.Iterator[CallLedger]:
+    """Count the calls made inside the block in a ledger of their own.
+
+    :yield: The ledger.
+    """
+    ledger = CallLedger()
+    token = _LEDGER.set(ledger)
+    try:
+        yield ledger
+    finally:
+        _LEDGER.reset(token)
+
+
+def record_call(host: str) -> None:
+    """Count a provider call in the current ledger.
+
+    :param host: Provider host.
+    """
+    current().add(host)
+
+
+def calls_used() -> int:
+    """Get the provider calls counted in the current ledger.
+
+    :return: Calls to every host.
+    """
+    return current().total
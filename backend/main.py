@@ -9,10 +9,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from prometheus_fastapi_instrumentator import Instrumentator
 
+from .api.routes import debug as r_debug
 from .api.routes import heatmap as r_heatmap
 from .api.routes import narratives as r_narratives
 from .api.routes import parents as r_parents
 from .api.routes import refresh as r_refresh
+from .executor import shutdown_executors
+from .jobs import flush_jobs, restore_jobs
 from .repo import init_db
 from .version import version_payload
 
@@ -21,11 +24,18 @@ from .version import version_payload
 async def lifespan(_: FastAPI) -> t.AsyncGenerator[None, None]:
     """Application lifespan manager for database initialization.
 
+    Restores persisted refresh job history once the tables exist; on
+    shutdown stops the refresh worker pools and waits for pending job
+    writes.
+
     :param _: FastAPI app instance (unused).
     :yield: None.
     """
     init_db()
+    restore_jobs()
     yield
+    shutdown_executors()
+    flush_jobs()
 
 
 def _parse_origins() -> list[str]:
@@ -83,6 +93,7 @@ app.include_router(r_heatmap.router)
 app.include_router(r_narratives.router)
 app.include_router(r_parents.router)
 app.include_router(r_refresh.router)
+app.include_router(r_debug.router)
 
 
 @app.get("/healthz")
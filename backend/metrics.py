@@ -0,0 +1,181 @@
+"""Prometheus metrics shared across the backend.
+
+Metrics are registered once on the default registry, which the
+instrumentator exposes at ``/metrics``. They live here rather than next
+to the code that updates them because those modules are reloaded in
+tests, and registering a metric twice is an error.
+"""
+
+import typing as t
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+# buckets for in-process stages, which take well under a second
+_STAGE_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+# buckets for provider waits and whole narratives, up to the fetch budget
+_WAIT_BUCKETS = (
+    0.01,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+RATE_LIMIT_RPS = Gauge(
+    "primecipher_rate_limit_rps",
+    "Current allowed request rate per provider host.",
+    ["host"],
+)
+
+CIRCUIT_STATE = Gauge(
+    "primecipher_circuit_state",
+    "Provider circuit breaker state (0 closed, 1 half-open, 2 open).",
+    ["host"],
+)
+
+PROVIDER_REQUEST_SECONDS = Histogram(
+    "primecipher_provider_request_seconds",
+    "Provider request latency by host and status ('error' if none).",
+    ["host", "status"],
+    buckets=_WAIT_BUCKETS,
+)
+
+LIMITER_WAIT_SECONDS = Histogram(
+    "primecipher_limiter_wait_seconds",
+    "Time spent waiting for a provider rate limiter.",
+    ["host"],
+    buckets=_WAIT_BUCKETS,
+)
+
+RETRIES = Counter(
+    "primecipher_provider_retries",
+    "Provider requests retried, by host and reason (status or error).",
+    ["host", "reason"],
+)
+
+BACKOFF_SECONDS = Histogram(
+    "primecipher_provider_backoff_seconds",
+    "Sleeps before retrying a provider request.",
+    ["host"],
+    buckets=_WAIT_BUCKETS,
+)
+
+STAGE_SECONDS = Histogram(
+    "primecipher_refresh_stage_seconds",
+    "Time spent in a refresh pipeline stage.",
+    ["stage"],
+    buckets=_STAGE_BUCKETS,
+)
+
+NARRATIVE_SECONDS = Histogram(
+    "primecipher_refresh_narrative_seconds",
+    "End-to-end refresh time of one narrative, by mode.",
+    ["mode"],
+    buckets=_WAIT_BUCKETS,
+)
+
+CACHE_EVENTS = Counter(
+    "primecipher_cache_events",
+    "Cache lookups and removals by cache, provider and event "
+    "(hit, miss, expired or eviction).",
+    ["cache", "provider", "event"],
+)
+
+# (cache, provider, entries, approximate bytes) rows of one cache
+CacheSizes = t.Callable[[], t.Iterable[tuple[str, str, int, int]]]
+
+
+class _CacheSizeCollector(Collector):  # pylint: disable=too-few-public-methods
+    """Report the size of each cache when scraped.
+
+    Caches register a function under their name; registering again, as
+    a reloaded module does, replaces it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without caches."""
+        self.caches: dict[str, CacheSizes] = {}
+
+    def collect(self) -> t.Iterator[GaugeMetricFamily]:
+        """Collect entry and byte gauges of every cache.
+
+        :return: The entries and bytes gauges.
+        """
+        entries = GaugeMetricFamily(
+            "primecipher_cache_entries",
+            "Entries held by a cache, by provider.",
+            labels=["cache", "provider"],
+        )
+        size = GaugeMetricFamily(
+            "primecipher_cache_bytes",
+            "Approximate size of the values held by a cache, by provider.",
+            labels=["cache", "provider"],
+        )
+        for sizes in list(self.caches.values()):
+            for cache, provider, count, nbytes in sizes():
+                entries.add_metric([cache, provider], count)
+                size.add_metric([cache, provider], nbytes)
+        return iter((entries, size))
+
+
+CACHE_SIZES = _CacheSizeCollector()
+REGISTRY.register(CACHE_SIZES)
+
+
+def cache_report() -> dict[str, dict[str, dict[str, float]]]:
+    """Summarize cache events and sizes.
+
+    :return: Counts, sizes and hit ratio by cache and provider.
+    """
+    report: dict[str, dict[str, dict[str, float]]] = {}
+
+    def _row(cache: str, provider: str) -> dict[str, float]:
+        return report.setdefault(cache, {}).setdefault(
+            provider,
+            {
+                "hit": 0.0,
+                "miss": 0.0,
+                "expired": 0.0,
+                "eviction": 0.0,
+                "entries": 0.0,
+                "bytes": 0.0,
+            },
+        )
+
+    for metric in CACHE_EVENTS.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_total"):
+                labels = sample.labels
+                row = _row(labels["cache"], labels["provider"])
+                row[labels["event"]] = sample.value
+    for metric in CACHE_SIZES.collect():
+        for sample in metric.samples:
+            row = _row(sample.labels["cache"], sample.labels["provider"])
+            row[metric.name.rsplit("_", 1)[1]] = sample.value
+    for providers in report.values():
+        for row in providers.values():
+            lookups = row["hit"] + row["miss"] + row["expired"]
+            row["hitRatio"] = round(row["hit"] / lookups, 4) if lookups else 0
+    return report
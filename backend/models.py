@@ -1,6 +1,14 @@
 """Database models for the application."""
 
-from sqlalchemy import Column, Float, Index, Integer, String, UniqueConstraint
+from sqlalchemy import (
+    Column,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 
 from .db import Base
 
@@ -52,3 +60,13 @@ class ParentMeta(Base):  # pylint: disable=too-few-public-methods
             name="uq_parent_meta_narrative_parent",
         ),
     )
+
+
+class RefreshJob(Base):  # pylint: disable=too-few-public-methods
+    """Database model for persisted refresh job records."""
+
+    __tablename__ = "refresh_jobs"
+    id = Column(String, primary_key=True)
+    state = Column(String, nullable=False)
+    ts = Column(Float, nullable=False, index=True)
+    payload = Column(Text, nullable=False)  # json job record
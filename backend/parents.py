@@ -1,90 +1,135 @@
 """Parent computation and scoring functionality."""
 
+import typing as t
 from math import sqrt
-from time import time
+from time import perf_counter, time
 
 from .adapters.source import Source
+from .deadline import NARRATIVE_BUDGET_SEC, deadline
+from .jobs import checkpoint
+from .metrics import NARRATIVE_SECONDS, STAGE_SECONDS
+from .records import ParentColumns, ParentRecord
 from .repo import replace_parents
 from .schemas import Parent
 from .seeds import load_seeds
 from .storage import set_parents
+from .tracing import narrative_started
 
 TOP_N = 100  # new
 
 
-def _validate_items(items: list[dict]) -> list[dict]:
-    return [Parent(**it).model_dump() for it in items]
+def _validate_items(items: list[dict]) -> list[ParentRecord]:
+    return [ParentRecord.from_dict(Parent(**it).model_dump()) for it in items]
 
 
 # new: z-score per narrative, clamped to [-3, 3]
-def _with_scores(items: list[dict]) -> list[dict]:
-    if not items:
-        return items
-    xs = [int(it["matches"]) for it in items]
+def _rank(cols: ParentColumns) -> list[tuple[int, float]]:
+    """Score a narrative's parents and rank them.
+
+    :param cols: The narrative's parents.
+    :return: (row, score) pairs by score desc, matches desc, parent asc.
+    """
+    xs = cols.match_counts()
+    if not xs:
+        return []
     mean = sum(xs) / len(xs)
     var = sum((x - mean) ** 2 for x in xs) / len(xs)
     std = sqrt(var)
-    out: list[dict] = []
-    for it in items:
+    out: list[tuple[int, float]] = []
+    for row, x in enumerate(xs):
         if std == 0:
             z = 0.0
         else:
-            z = (int(it["matches"]) - mean) / std
+            z = (x - mean) / std
             # clamp
             z = 3.0 if z > 3 else -3.0 if z < -3 else z
 
         # Add bounded boost based on liquidity and volume
-        liquidity_usd = it.get("liquidityUsd") or 0
-        vol_24h = it.get("vol24h") or 0
+        liquidity_usd = cols.number("liquidityUsd", row)
+        vol_24h = cols.number("vol24h", row)
         boost = min(0.3, 0.000000001 * liquidity_usd + 0.0000000005 * vol_24h)
         score = z + boost
         # Clamp final score to [-3.0, 3.0]
         score = 3.0 if score > 3.0 else -3.0 if score < -3.0 else score
-
-        it2 = dict(it)
-        it2["score"] = float(round(score, 4))
-        out.append(it2)
+        out.append((row, float(round(score, 4))))
     # sort by score desc, then matches desc, then parent asc
     out.sort(
-        key=lambda r: (
-            -float(r.get("score") or 0.0),
-            -int(r["matches"]),
-            str(r["parent"]).lower(),
+        key=lambda rs: (
+            -rs[1],
+            -xs[rs[0]],
+            str(cols.string("parent", rs[0])).lower(),
         ),
     )
     return out
 
 
-def compute_all() -> dict[str, list[dict]]:
-    """Compute parent data for all narratives.
+@STAGE_SECONDS.labels(stage="scoring").time()
+def _with_scores(items: list[ParentRecord]) -> list[ParentRecord]:
+    cols = ParentColumns(items)
+    return [cols.record(row, score=score) for row, score in _rank(cols)]
 
-    :return: Dictionary of narrative names and their parent data.
+
+def _iter_computed(
+    narratives: list[str] | None = None,
+) -> t.Iterator[tuple[str, list[ParentRecord]]]:
+    """Compute parent data narrative by narrative.
+
+    Stops between narratives when the current refresh job is cancelled.
+    Each narrative's provider calls share a ``NARRATIVE_BUDGET_SEC``
+    deadline.
+
+    :param narratives: Optional narrative names to compute, None for all.
+    :return: Iterator of narrative names and their parent data.
     """
     src = Source()
-    out: dict[str, list[dict]] = {}
     for n in load_seeds()["narratives"]:
         name: str = n["name"]
+        if narratives is not None and name not in narratives:
+            continue
+        checkpoint()
+        narrative_started(name)
+        start = perf_counter()
         terms: list[str] = n.get("terms", [])
         allow_name = bool(n.get("allowNameMatch", True))
         block = list(n.get("block", []))
         require_all = bool(n.get("requireAllTerms", False))
-        raw = src.parents_for(
-            name,
-            terms,
-            allow_name_match=allow_name,
-            block=block,
-            require_all_terms=require_all,
-        )
+        with deadline(NARRATIVE_BUDGET_SEC):
+            raw = src.parents_for(
+                name,
+                terms,
+                allow_name_match=allow_name,
+                block=block,
+                require_all_terms=require_all,
+            )
         val = _validate_items(raw)
         val = _with_scores(val)[:TOP_N]  # new: add scores + cap
-        out[name] = val
-    return out
+        NARRATIVE_SECONDS.labels(mode=src.name).observe(
+            perf_counter() - start,
+        )
+        yield name, val
+
+
+def compute_all(narratives: list[str] | None = None) -> dict[str, list[dict]]:
+    """Compute parent data for all narratives or a subset.
 
+    :param narratives: Optional narrative names to compute, None for all.
+    :return: Dictionary of narrative names and their parent data.
+    """
+    return {
+        name: [it.to_dict() for it in val]
+        for name, val in _iter_computed(narratives)
+    }
 
-def refresh_all() -> None:
-    """Refresh all parent data and persist to storage."""
-    generated = compute_all()
+
+def refresh_all(narratives: list[str] | None = None) -> None:
+    """Refresh parent data and persist to storage.
+
+    Each narrative is written as soon as it is computed, so a cancelled
+    refresh keeps the narratives it finished.
+
+    :param narratives: Optional narrative names to refresh, None for all.
+    """
     ts = time()
-    for k, v in generated.items():
+    for k, v in _iter_computed(narratives):
         set_parents(k, v)
-        replace_parents(k, v, ts)
+        replace_parents(k, [it.to_dict() for it in v], ts)
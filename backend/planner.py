@@ -0,0 +1,171 @@
+"""Budget-aware planning of provider refreshes.
+
+A refresh may make at most ``REFRESH_MAX_CALLS`` provider calls. Rather
+than refreshing narratives in seed order until the budget runs out, the
+planner estimates what each narrative will really cost from the terms its
+provider searches and what the raw and search caches already hold, ranks
+narratives by staleness times seed ``weight`` (never refreshed first),
+and takes them in that order while the budget allows, skipping any that
+would overrun it in favour of cheaper ones further down.
+"""
+
+import dataclasses
+import math
+import os
+import time
+import typing as t
+
+from .adapters.source import (
+    cg_search_terms,
+    ds_search_terms,
+    is_raw_cached,
+    is_search_cached,
+)
+from .storage import get_meta
+
+# modes whose refreshes call providers, and so are planned
+PROVIDER_MODES = ("real", "real_cg", "real_mix", "real_ds", "blend")
+
+# age after which a narrative is stale (seconds)
+TTL_SEC = int(os.getenv("REFRESH_TTL_SEC", "900"))
+
+
+@dataclasses.dataclass
+class PlanStep:
+    """A narrative considered for a refresh."""
+
+    narrative: str
+    terms: list[str]
+    cost: int
+    weight: float
+    # age in TTLs, None if never refreshed
+    staleness: float | None
+    priority: float
+    planned: bool = False
+
+
+@dataclasses.dataclass
+class Plan:
+    """Narratives to refresh within a call budget, in order."""
+
+    mode: str
+    budget: int
+    steps: list[PlanStep]
+
+    @property
+    def planned(self) -> list[PlanStep]:
+        """Steps to run, highest priority first."""
+        return [s for s in self.steps if s.planned]
+
+    @property
+    def deferred(self) -> list[PlanStep]:
+        """Steps left out to stay within the budget."""
+        return [s for s in self.steps if not s.planned]
+
+    def to_dict(self) -> dict[str, t.Any]:
+        """Export the plan.
+
+        :return: Budget, estimated cost and the ranked steps.
+        """
+        planned = self.planned
+        return {
+            "mode": self.mode,
+            "budget": self.budget,
+            "cost": sum(s.cost for s in planned),
+            "planned": len(planned),
+            "deferred": len(self.steps) - len(planned),
+            "steps": [
+                {
+                    "narrative": s.narrative,
+                    "cost": s.cost,
+                    "weight": s.weight,
+                    "staleness": s.staleness,
+                    "planned": s.planned,
+                }
+                for s in self.steps
+            ],
+        }
+
+
+def _cg_calls(terms: list[str]) -> int:
+    # uncached searches, then one markets call for the ids found
+    search = cg_search_terms(terms)
+    if not search or is_raw_cached("coingecko", terms):
+        return 0
+    return sum(1 for term in search if not is_search_cached(term)) + 1
+
+
+def estimate_calls(mode: str, terms: list[str]) -> int:
+    """Estimate the provider calls refreshing a narrative will make.
+
+    :param mode: The refresh mode.
+    :param terms: The narrative's terms.
+    :return: Expected number of provider calls.
+    """
+    if mode == "real_ds":
+        return len(ds_search_terms(terms))
+    if mode == "real_cg":
+        return _cg_calls(terms)
+    if mode == "blend":
+        if is_raw_cached("blend", terms):
+            return 0
+        return len(ds_search_terms(terms)) + _cg_calls(terms)
+    # the httpx adapters search the first 3 terms and keep no cache
+    searches = min(3, len(terms))
+    return {
+        "real": searches,
+        "real_mix": 2 * searches + (1 if searches else 0),
+    }.get(mode, 0)
+
+
+def staleness(narrative: str, now: float | None = None) -> float | None:
+    """Get how stale a narrative is.
+
+    :param narrative: The narrative name.
+    :param now: Current time, ``time.time()`` by default.
+    :return: Age in TTLs, None if it was never refreshed.
+    """
+    computed_at = (get_meta(narrative) or {}).get("computedAt")
+    if computed_at is None:
+        return None
+    now = time.time() if now is None else now
+    return round(max(0.0, now - computed_at) / TTL_SEC, 3)
+
+
+def make_plan(
+    narratives: t.Iterable[t.Mapping[str, t.Any]],
+    mode: str,
+    budget: int,
+) -> Plan:
+    """Rank narratives and pick those that fit the call budget.
+
+    :param narratives: Seed narratives with ``name``, ``terms`` and
+        optionally ``weight``, in seed order.
+    :param mode: The refresh mode.
+    :param budget: Provider calls left.
+    :return: The plan, ranked by priority.
+    """
+    now = time.time()
+    steps = []
+    for n in narratives:
+        terms = list(n.get("terms", []))
+        weight = float(n.get("weight", 1.0))
+        age = staleness(n["name"], now)
+        steps.append(
+            PlanStep(
+                narrative=n["name"],
+                terms=terms,
+                cost=estimate_calls(mode, terms),
+                weight=weight,
+                staleness=age,
+                priority=math.inf if age is None else weight * age,
+            ),
+        )
+    # stable sort: equal priority and weight keep seed order
+    steps.sort(key=lambda s: (-s.priority, -s.weight))
+    left = budget
+    for step in steps:
+        if step.cost <= left:
+            step.planned = True
+            left -= step.cost
+    return Plan(mode=mode, budget=budget, steps=steps)
@@ -0,0 +1,276 @@
+"""Sampling profiler for production refreshes and requests.
+
+A background thread reads the stack of every watched thread each
+``PROFILE_INTERVAL_MS`` and counts identical stacks. Sampling costs one
+pass over the live frames per interval and nothing in the profiled code,
+so it can run against real traffic. Profiles export as collapsed stacks
+(``flamegraph.pl``, speedscope, inferno) or as speedscope JSON.
+
+Three scopes are offered: a time window, the next refresh job (armed
+ahead of time, see ``profile_job``) and, while switched on, the threads
+serving ``profiled`` request handlers.
+"""
+
+import collections
+import contextlib
+import functools
+import os
+import sys
+import threading
+import typing as t
+
+# milliseconds between samples
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "10"))
+# job profiles kept, oldest dropped first
+PROFILE_HISTORY = int(os.getenv("PROFILE_HISTORY", "5"))
+
+# function, file, first line
+Frame = tuple[str, str, int]
+Stack = tuple[Frame, ...]
+
+_F = t.TypeVar("_F", bound=t.Callable[..., t.Any])
+
+
+def _stack(frame: t.Any) -> Stack:
+    # outermost call first, as flamegraphs draw them
+    frames: list[Frame] = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(
+            (code.co_qualname, code.co_filename, code.co_firstlineno),
+        )
+        frame = frame.f_back
+    return tuple(reversed(frames))
+
+
+class Sampler:
+    """Count the stacks of running threads.
+
+    :param interval: Seconds between samples.
+    :param threads: Thread idents to sample, None for every thread.
+    """
+
+    def __init__(
+        self,
+        interval: float = PROFILE_INTERVAL_MS / 1000,
+        threads: set[int] | None = None,
+    ) -> None:
+        """Initialize a stopped sampler without samples."""
+        self.interval = interval
+        self.threads = threads
+        self.stacks: collections.Counter[Stack] = collections.Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the sampler thread is running."""
+        return self._thread is not None
+
+    def start(self) -> None:
+        """Start sampling on a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="profiler",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling, keeping the samples taken."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def watch(self, ident: int) -> None:
+        """Add a thread to the sampled threads.
+
+        :param ident: Thread ident.
+        """
+        with self._lock:
+            if self.threads is not None:
+                self.threads.add(ident)
+
+    def unwatch(self, ident: int) -> None:
+        """Remove a thread from the sampled threads.
+
+        :param ident: Thread ident.
+        """
+        with self._lock:
+            if self.threads is not None:
+                self.threads.discard(ident)
+
+    def sample(self) -> None:
+        """Record the current stack of each sampled thread."""
+        own = threading.get_ident()
+        with self._lock:
+            watched = None if self.threads is None else set(self.threads)
+        # pylint: disable-next=protected-access
+        frames = sys._current_frames()
+        stacks = [
+            _stack(frame)
+            for ident, frame in frames.items()
+            if ident != own and (watched is None or ident in watched)
+        ]
+        with self._lock:
+            self.stacks.update(stacks)
+
+    def clear(self) -> None:
+        """Drop the samples taken."""
+        with self._lock:
+            self.stacks.clear()
+
+    def collapsed(self) -> str:
+        """Export the samples as collapsed stacks.
+
+        :return: One ``frame;frame;... count`` line per distinct stack.
+        """
+        with self._lock:
+            counts = list(self.stacks.items())
+        lines = [
+            ";".join(f"{name} ({file}:{line})" for name, file, line in stack)
+            + f" {count}"
+            for stack, count in counts
+        ]
+        return "".join(f"{line}\n" for line in sorted(lines))
+
+    def speedscope(self, name: str) -> dict[str, t.Any]:
+        """Export the samples as a speedscope sampled profile.
+
+        :param name: Profile name shown by speedscope.
+        :return: A speedscope file document.
+        """
+        with self._lock:
+            counts = list(self.stacks.items())
+        index: dict[Frame, int] = {}
+        samples = [
+            [index.setdefault(frame, len(index)) for frame in stack]
+            for stack, _ in counts
+        ]
+        weights = [count * self.interval for _, count in counts]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "primecipher",
+            "shared": {
+                "frames": [
+                    {"name": fn, "file": file, "line": line}
+                    for fn, file, line in index
+                ],
+            },
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                },
+            ],
+        }
+
+
+_LOCK = threading.Lock()
+# set by arm_next_job, taken by the next profile_job
+_ARMED = threading.Event()
+_JOB_PROFILES: collections.OrderedDict[str, Sampler] = (
+    collections.OrderedDict()
+)
+# samples the threads of profiled handlers while running
+REQUESTS = Sampler(threads=set())
+
+
+def arm_next_job() -> None:
+    """Profile the next refresh job that starts."""
+    _ARMED.set()
+
+
+def next_job_armed() -> bool:
+    """Check whether the next refresh job will be profiled.
+
+    :return: True until a job takes the profile.
+    """
+    return _ARMED.is_set()
+
+
+@contextlib.contextmanager
+def profile_job(job_id: str) -> t.Iterator[None]:
+    """Profile every thread while a job runs, if armed.
+
+    The profile can be read with ``job_profile`` as soon as it starts.
+
+    :param job_id: The job ID the profile is kept under.
+    :yield: None.
+    """
+    with _LOCK:
+        armed = _ARMED.is_set()
+        _ARMED.clear()
+    if not armed:
+        yield
+        return
+    sampler = Sampler()
+    with _LOCK:
+        _JOB_PROFILES[job_id] = sampler
+        while len(_JOB_PROFILES) > PROFILE_HISTORY:
+            _JOB_PROFILES.popitem(last=False)
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+
+
+def job_profile(job_id: str) -> Sampler | None:
+    """Get the profile of a job.
+
+    :param job_id: The job ID.
+    :return: The job's sampler, or None if it was not profiled.
+    """
+    with _LOCK:
+        return _JOB_PROFILES.get(job_id)
+
+
+def set_request_profiling(enabled: bool) -> None:
+    """Switch the profiling of ``profiled`` handlers on or off.
+
+    Switching on starts a new profile.
+
+    :param enabled: Whether to profile.
+    """
+    if enabled and not REQUESTS.running:
+        REQUESTS.clear()
+        REQUESTS.start()
+    elif not enabled:
+        REQUESTS.stop()
+
+
+def profiled(func: _F) -> _F:
+    """Sample the thread running a sync handler while profiling is on.
+
+    :param func: The handler.
+    :return: The wrapped handler.
+    """
+
+    @functools.wraps(func)
+    def _wrapper(*args: t.Any, **kwargs: t.Any) -> t.Any:
+        if not REQUESTS.running:
+            return func(*args, **kwargs)
+        ident = threading.get_ident()
+        REQUESTS.watch(ident)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            REQUESTS.unwatch(ident)
+
+    return t.cast(_F, _wrapper)
@@ -0,0 +1,206 @@
+"""Compact in-process representation of parent rows.
+
+Parent items pass from validation through scoring into storage and back
+out on reads. They are held as ``ParentRecord`` (a slotted dataclass)
+rather than a dict per item, which keeps them small and makes field access
+a plain attribute lookup. Records become dicts only at the edges: API
+responses and database writes.
+
+Stored narratives are kept as ``ParentColumns``: parallel typed arrays per
+numeric field and an interned string table, so a stored parent costs a
+few dozen bytes and aggregates run over flat columns.
+"""
+
+import dataclasses
+import math
+import typing as t
+from array import array
+
+from .interning import coin_id, coin_url
+
+
+@dataclasses.dataclass(slots=True)
+class ParentRecord:  # pylint: disable=too-many-instance-attributes
+    """A parent row.
+
+    Fields mirror :class:`backend.schemas.Parent`; unset fields are None.
+    Keys of unvalidated items that are not schema fields are kept in
+    ``extra`` so they survive a round trip.
+    """
+
+    parent: str | None = None
+    matches: int | None = None
+    score: float | None = None
+    symbol: str | None = None
+    source: str | None = None
+    sources: list[str] | None = None
+    chain: str | None = None
+    address: str | None = None
+    url: str | None = None
+    children: list[dict] | None = None
+    price: float | None = None
+    marketCap: float | None = None  # pylint: disable=invalid-name
+    vol24h: float | None = None
+    liquidityUsd: float | None = None  # pylint: disable=invalid-name
+    image: str | None = None
+    extra: dict[str, t.Any] | None = None
+
+    @classmethod
+    def from_dict(cls, item: t.Mapping[str, t.Any]) -> "ParentRecord":
+        """Build a record from a parent item.
+
+        :param item: Parent item, validated or raw.
+        :return: The record.
+        """
+        known = {k: v for k, v in item.items() if k in _FIELD_SET}
+        extra = {k: v for k, v in item.items() if k not in _FIELD_SET}
+        return cls(**known, extra=extra or None)
+
+    def to_dict(self) -> dict[str, t.Any]:
+        """Convert the record to a parent item.
+
+        :return: The set fields, plus any extra keys.
+        """
+        out = {}
+        for name in FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                out[name] = value
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+
+# schema fields, in Parent order
+FIELDS = tuple(
+    f.name for f in dataclasses.fields(ParentRecord) if f.name != "extra"
+)
+_FIELD_SET = frozenset(FIELDS)
+
+
+# columns of ParentColumns; matches has its own integer column
+NUMERIC = ("score", "price", "marketCap", "vol24h", "liquidityUsd")
+TEXT = ("parent", "symbol", "source", "chain", "address", "url", "image")
+# matches of a row that has none (valid counts are never negative)
+_NO_MATCHES = -1
+# joins a row's sources into one table string
+_SEP = "\x1f"
+
+
+class ParentColumns:
+    """A narrative's parents, stored column by column.
+
+    Numbers live in parallel typed arrays (NaN for a missing float) and
+    strings, including each row's list of sources, as indexes into a
+    per-narrative table holding each distinct value once. CoinGecko coin
+    page URLs are stored as the coin ID and rebuilt on demand. The rarely
+    set children and extra fields are kept by row. Aggregates read the
+    columns directly; records are built on demand.
+
+    :param records: The parent records, in order.
+    """
+
+    def __init__(self, records: t.Iterable[ParentRecord] = ()) -> None:
+        """Store the records column by column."""
+        self.strings: list[str | None] = [None]
+        self.matches = array("q")
+        self.numbers = {name: array("d") for name in NUMERIC}
+        self.text = {name: array("I") for name in TEXT}
+        self.sources = array("I")
+        # 1 where the url column holds a CoinGecko coin ID
+        self.coin_pages = array("b")
+        self.rest: dict[int, tuple[t.Any, t.Any]] = {}
+        ids: dict[str, int] = {}
+
+        def _index(value: str | None) -> int:
+            if value is None:
+                return 0
+            index = ids.get(value)
+            if index is None:
+                index = ids[value] = len(self.strings)
+                self.strings.append(value)
+            return index
+
+        for row, rec in enumerate(records):
+            self.matches.append(
+                _NO_MATCHES if rec.matches is None else int(rec.matches),
+            )
+            for name, numbers in self.numbers.items():
+                value = getattr(rec, name)
+                numbers.append(math.nan if value is None else float(value))
+            cid = coin_id(rec.url) if rec.url else None
+            self.coin_pages.append(cid is not None)
+            for name, text in self.text.items():
+                value = cid if name == "url" and cid else getattr(rec, name)
+                text.append(_index(value))
+            sources = rec.sources
+            self.sources.append(
+                _index(None if sources is None else _SEP.join(sources)),
+            )
+            if rec.children or rec.extra:
+                self.rest[row] = (rec.children, rec.extra)
+
+    def __len__(self) -> int:
+        """Get the number of rows.
+
+        :return: The row count.
+        """
+        return len(self.matches)
+
+    def match_counts(self) -> list[int]:
+        """Get the matches column, counting a missing value as 0.
+
+        :return: Matches by row.
+        """
+        return [max(m, 0) for m in self.matches]
+
+    def number(self, name: str, row: int) -> float:
+        """Get a float field of a row, counting a missing value as 0.
+
+        :param name: One of ``NUMERIC``.
+        :param row: Row index.
+        :return: The value.
+        """
+        value = self.numbers[name][row]
+        return 0.0 if math.isnan(value) else value
+
+    def string(self, name: str, row: int) -> str | None:
+        """Get a string field of a row.
+
+        :param name: One of ``TEXT``.
+        :param row: Row index.
+        :return: The value, or None if unset.
+        """
+        value = self.strings[self.text[name][row]]
+        if name == "url" and value and self.coin_pages[row]:
+            return coin_url(value)
+        return value
+
+    def record(self, row: int, **changes: t.Any) -> ParentRecord:
+        """Build the record of a row.
+
+        :param row: Row index.
+        :param changes: Field values to use instead of the stored ones.
+        :return: A new record.
+        """
+        fields: dict[str, t.Any] = {
+            name: self.string(name, row) for name in TEXT
+        }
+        for name, numbers in self.numbers.items():
+            value = numbers[row]
+            fields[name] = None if math.isnan(value) else value
+        matches = self.matches[row]
+        fields["matches"] = None if matches == _NO_MATCHES else matches
+        sources = self.strings[self.sources[row]]
+        if sources is not None:
+            fields["sources"] = sources.split(_SEP) if sources else []
+        fields["children"], fields["extra"] = self.rest.get(row, (None, None))
+        fields.update(changes)
+        return ParentRecord(**fields)
+
+    def records(self) -> list[ParentRecord]:
+        """Build the records of all rows.
+
+        :return: New records, in row order.
+        """
+        return [self.record(row) for row in range(len(self))]
@@ -1,9 +1,16 @@
 """Database repository operations for parent data."""
 
-from sqlalchemy import delete, select, text
+import json
+import time
+import typing as t
+
+from sqlalchemy import delete, literal, select, text
 
 from .db import Base, SessionLocal, engine
-from .models import ParentHit, ParentMeta
+from .interning import interned
+from .metrics import STAGE_SECONDS
+from .models import ParentHit, ParentMeta, RefreshJob
+from .tracing import record_rows
 
 
 def init_db() -> None:
@@ -11,6 +18,7 @@ def init_db() -> None:
     Base.metadata.create_all(bind=engine)
 
 
+@STAGE_SECONDS.labels(stage="db_write").time()
 def replace_parents(narrative: str, items: list[dict], ts: float) -> None:
     """Replace all parent data for a narrative with new items.
 
@@ -91,6 +99,7 @@ def replace_parents(narrative: str, items: list[dict], ts: float) -> None:
                 },
             )
         s.commit()
+    record_rows(len(filtered_items))
 
 
 def list_parents(narrative: str) -> list[dict]:
@@ -136,15 +145,109 @@ def list_parents(narrative: str) -> list[dict]:
                 "parent": r.parent,
                 "matches": r.matches,
                 "symbol": r.meta_symbol or r.symbol,
-                "source": r.meta_source or r.source,
+                "source": interned(r.meta_source or r.source),
                 "price": r.meta_price or r.price,
                 "marketCap": r.meta_market_cap or r.marketCap,
                 "vol24h": r.meta_vol24h or r.vol24h,
                 "liquidityUsd": r.liquidity_usd,
-                "chain": r.chain,
+                "chain": interned(r.chain),
                 "address": r.address,
                 "url": r.meta_url or r.url,
                 "image": r.image,
             }
             for r in rows
         ]
+
+
+def save_job(record: dict, owner: str | None = None) -> None:
+    """Insert or update a refresh job record.
+
+    :param record: The job record, as returned by the job registry.
+    :param owner: The worker process running the job.
+    """
+    with SessionLocal() as s:
+        s.merge(
+            RefreshJob(
+                id=record["id"],
+                state=record["state"],
+                ts=record["ts"],
+                payload=json.dumps({**record, "owner": owner}),
+            ),
+        )
+        s.commit()
+
+
+def _record(payload: str) -> dict:
+    record = json.loads(payload)
+    record.pop("owner", None)
+    return record
+
+
+def load_job(job_id: str) -> dict | None:
+    """Load a refresh job record by ID.
+
+    :param job_id: The job ID.
+    :return: The job record or None if not stored.
+    """
+    with SessionLocal() as s:
+        row = s.get(RefreshJob, job_id)
+        return _record(str(row.payload)) if row else None
+
+
+def fail_unfinished_jobs(
+    error: str,
+    orphaned: t.Callable[[str | None], bool],
+) -> int:
+    """Mark jobs left queued or running by a stopped process as errored.
+
+    :param error: Error message recorded on the jobs.
+    :param orphaned: Tells whether the owner of a row is gone.
+    :return: Number of jobs marked.
+    """
+    now = time.time()
+    with SessionLocal() as s:
+        rows = s.scalars(
+            select(RefreshJob).where(
+                RefreshJob.state.in_(("queued", "running")),
+            ),
+        ).all()
+        failed = 0
+        for row in rows:
+            record = json.loads(row.payload)
+            if not orphaned(record.get("owner")):
+                continue
+            record.update(state="error", error=error, ts=now)
+            row.state = "error"
+            row.ts = now
+            row.payload = json.dumps(record)
+            failed += 1
+        s.commit()
+        return failed
+
+
+def prune_jobs(before: float) -> None:
+    """Delete finished refresh job records older than a time.
+
+    :param before: Timestamp; older finished records are deleted.
+    """
+    with SessionLocal() as s:
+        s.execute(
+            delete(RefreshJob).where(
+                RefreshJob.state.in_(("done", "error", "cancelled")),
+                literal(before) > RefreshJob.ts,
+            ),
+        )
+        s.commit()
+
+
+def load_jobs(limit: int) -> list[dict]:
+    """Load the most recent refresh job records.
+
+    :param limit: Maximum number of records.
+    :return: Job records, newest first.
+    """
+    with SessionLocal() as s:
+        rows = s.scalars(
+            select(RefreshJob).order_by(RefreshJob.ts.desc()).limit(limit),
+        ).all()
+        return [_record(r.payload) for r in rows]
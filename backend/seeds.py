@@ -29,6 +29,7 @@ def load_seeds() -> dict[str, t.Any]:
                 "terms": list(n.get("terms", [])),
                 "allowNameMatch": bool(n.get("allowNameMatch", True)),
                 "block": list(n.get("block", [])),
+                "weight": float(n.get("weight", 1.0)),
             },
         )
     return {"narratives": items}
@@ -1,30 +1,61 @@
 """In-memory storage for parent data and refresh timestamps."""
 
+import typing as t
 from time import time
 
-# simulated store refreshed by /refresh (no db — mvp)
-_parents: dict[str, list[dict]] = {}
+from .records import ParentColumns, ParentRecord
+
+# simulated store refreshed by /refresh (no db — mvp), one columnar
+# table per narrative
+_parents: dict[str, ParentColumns] = {}
+_EMPTY = ParentColumns()
 _metadata: dict[str, dict] = {}  # narrative -> {"computedAt": float}
 _last_refresh_ts: float = 0.0
 
 
-def set_parents(narrative: str, parents: list[dict]) -> None:
+def set_parents(
+    narrative: str,
+    parents: t.Sequence[ParentRecord | dict],
+) -> None:
     """Set parent data for a narrative.
 
     :param narrative: The narrative to set parent data for.
-    :param parents: The parent data to set.
+    :param parents: The parent data to set, as records or dicts.
     """
-    _parents[narrative] = parents
+    _parents[narrative] = ParentColumns(
+        p if isinstance(p, ParentRecord) else ParentRecord.from_dict(p)
+        for p in parents
+    )
     _metadata[narrative] = {"computedAt": time()}
 
 
+def get_columns(narrative: str) -> ParentColumns:
+    """Get the stored parent columns for a narrative.
+
+    The columns are shared; callers must not modify them.
+
+    :param narrative: The narrative to get parent columns for.
+    :return: The parent columns for the narrative (empty if none).
+    """
+    return _parents.get(narrative, _EMPTY)
+
+
+def get_records(narrative: str) -> list[ParentRecord]:
+    """Get the stored parent records for a narrative.
+
+    :param narrative: The narrative to get parent records for.
+    :return: New parent records for the narrative.
+    """
+    return get_columns(narrative).records()
+
+
 def get_parents(narrative: str) -> list[dict]:
     """Get parent data for a narrative.
 
     :param narrative: The narrative to get parent data for.
     :return: The parent data for the narrative.
     """
-    return _parents.get(narrative, [])
+    return [it.to_dict() for it in get_records(narrative)]
 
 
 def get_meta(narrative: str) -> dict | None:
@@ -0,0 +1,240 @@
+"""Per-job trace records of refresh runs.
+
+A running job holds a ``JobTrace`` in a context variable, so provider
+calls, cache lookups, limiter waits and database writes made for the job,
+including those fanned out to other threads, are recorded against it and
+against the narrative being refreshed. Outside of a job every ``record_*``
+function is a no-op.
+
+Work done in the process pool (``REFRESH_EXECUTOR=process``) runs in
+other processes and is not traced.
+"""
+
+import contextvars
+import os
+import threading
+import time
+import typing as t
+
+# provider calls listed per job, later calls are only counted
+TRACE_MAX_CALLS = int(os.getenv("TRACE_MAX_CALLS", "500"))
+
+_TRACE: contextvars.ContextVar["JobTrace | None"] = contextvars.ContextVar(
+    "job_trace",
+    default=None,
+)
+# record of the narrative being refreshed in the current context
+_NARRATIVE: contextvars.ContextVar[dict[str, t.Any] | None] = (
+    contextvars.ContextVar("trace_narrative", default=None)
+)
+
+# totals that sleeps of each kind add to
+_WAIT_KEYS = {"limiter": "limiterWaitMs", "backoff": "backoffMs"}
+
+
+def _totals() -> dict[str, t.Any]:
+    return {
+        "calls": 0,
+        "bytes": 0,
+        "rows": 0,
+        "limiterWaitMs": 0.0,
+        "backoffMs": 0.0,
+        "cacheHits": {},
+        "cacheMisses": {},
+    }
+
+
+class JobTrace:
+    """Timeline of one refresh job.
+
+    Times are milliseconds since the job started.
+    """
+
+    def __init__(self) -> None:
+        """Start an empty trace now."""
+        self.started = time.time()
+        self._t0 = time.monotonic()
+        self._lock = threading.Lock()
+        self.totals = _totals()
+        self.narratives: list[dict[str, t.Any]] = []
+        self.calls: list[dict[str, t.Any]] = []
+        self.calls_dropped = 0
+
+    def elapsed_ms(self) -> float:
+        """Get the time since the job started.
+
+        :return: Milliseconds, to a tenth.
+        """
+        return round((time.monotonic() - self._t0) * 1000, 1)
+
+    def start_narrative(self, name: str) -> dict[str, t.Any]:
+        """Start the record of a narrative, ending the previous one.
+
+        :param name: The narrative name.
+        :return: The narrative record.
+        """
+        now = self.elapsed_ms()
+        record = {"name": name, "startMs": now, "endMs": None, **_totals()}
+        with self._lock:
+            self._end(now)
+            self.narratives.append(record)
+        return record
+
+    def _end(self, now: float) -> None:
+        if self.narratives and self.narratives[-1]["endMs"] is None:
+            self.narratives[-1]["endMs"] = now
+
+    def _records(self) -> list[dict[str, t.Any]]:
+        # the job totals and the current narrative's, if any
+        current = _NARRATIVE.get()
+        return [self.totals] if current is None else [self.totals, current]
+
+    def add(self, **amounts: float) -> None:
+        """Add to totals of the job and the current narrative.
+
+        :param amounts: Amounts by total, e.g. ``bytes=512``.
+        """
+        records = self._records()
+        with self._lock:
+            for record in records:
+                for key, value in amounts.items():
+                    record[key] = round(record[key] + value, 1)
+
+    def count(self, total: str, name: str) -> None:
+        """Count an event by name in the job and the current narrative.
+
+        :param total: The counts to add to, e.g. ``cacheHits``.
+        :param name: What is counted, e.g. a cache name.
+        """
+        records = self._records()
+        with self._lock:
+            for record in records:
+                record[total][name] = record[total].get(name, 0) + 1
+
+    def add_call(self, call: dict[str, t.Any]) -> None:
+        """List a provider call, up to ``TRACE_MAX_CALLS``.
+
+        :param call: The call record.
+        """
+        current = _NARRATIVE.get()
+        if current is not None:
+            call["narrative"] = current["name"]
+        with self._lock:
+            if len(self.calls) < TRACE_MAX_CALLS:
+                self.calls.append(call)
+            else:
+                self.calls_dropped += 1
+
+    def to_dict(self) -> dict[str, t.Any]:
+        """Export the trace, ending the last narrative if still open.
+
+        :return: The trace record.
+        """
+        now = self.elapsed_ms()
+        with self._lock:
+            self._end(now)
+            return {
+                "startedAt": self.started,
+                "elapsedMs": now,
+                "totals": {
+                    **self.totals,
+                    "cacheHits": dict(self.totals["cacheHits"]),
+                    "cacheMisses": dict(self.totals["cacheMisses"]),
+                },
+                "narratives": [
+                    {
+                        **n,
+                        "cacheHits": dict(n["cacheHits"]),
+                        "cacheMisses": dict(n["cacheMisses"]),
+                    }
+                    for n in self.narratives
+                ],
+                "calls": list(self.calls),
+                "callsDropped": self.calls_dropped,
+            }
+
+
+def begin() -> JobTrace:
+    """Start tracing the job running in the current context.
+
+    :return: The new trace.
+    """
+    trace = JobTrace()
+    _TRACE.set(trace)
+    _NARRATIVE.set(None)
+    return trace
+
+
+def narrative_started(name: str) -> None:
+    """Attribute what follows in this context to a narrative.
+
+    :param name: The narrative name.
+    """
+    trace = _TRACE.get()
+    if trace is not None:
+        _NARRATIVE.set(trace.start_narrative(name))
+
+
+def record_call(
+    host: str,
+    status: str,
+    seconds: float,
+    response: t.Any = None,
+) -> None:
+    """Record a provider call.
+
+    :param host: Provider host.
+    :param status: Response status, or ``error``.
+    :param seconds: Request latency.
+    :param response: The response, for its size.
+    """
+    trace = _TRACE.get()
+    if trace is None:
+        return
+    content = getattr(response, "content", None)
+    size = len(content) if isinstance(content, bytes) else 0
+    trace.add(calls=1, bytes=size)
+    trace.add_call(
+        {
+            "atMs": trace.elapsed_ms(),
+            "host": host,
+            "status": status,
+            "ms": round(seconds * 1000, 1),
+            "bytes": size,
+            # a 304 reuses the cached body
+            "cached": status == "304",
+        },
+    )
+
+
+def record_cache(cache: str, event: str) -> None:
+    """Record a cache lookup.
+
+    :param cache: The cache name.
+    :param event: ``hit``, ``miss`` or ``expired``.
+    """
+    trace = _TRACE.get()
+    if trace is None:
+        return
+    trace.count("cacheHits" if event == "hit" else "cacheMisses", cache)
+
+
+def record_wait(kind: t.Literal["limiter", "backoff"], seconds: float) -> None:
+    """Record time spent sleeping before a provider call.
+
+    :param kind: ``limiter`` for rate-limit waits, ``backoff`` for retries.
+    :param seconds: The time slept.
+    """
+    trace = _TRACE.get()
+    if trace is not None:
+        trace.add(**{_WAIT_KEYS[kind]: seconds * 1000})
+
+
+def record_rows(count: int) -> None:
+    """Record rows written to the database.
+
+    :param count: Number of rows.
+    """
+    trace = _TRACE.get()
+    if trace is not None:
+        trace.add(rows=count)
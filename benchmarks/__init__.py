@@ -0,0 +1,6 @@
+"""Offline benchmarks for the refresh pipeline.
+
+Provider requests are answered from recorded payloads, so runs need no
+network and are comparable between machines and commits. Run with
+``python -m benchmarks``.
+"""
@@ -0,0 +1,164 @@
+"""Run the refresh pipeline benchmarks.
+
+Usage::
+
+    python -m benchmarks [--sizes 10 100] [--cases merge_parents]
+        [--output results.json] [--baseline results.json]
+
+With ``--baseline``, the run fails if a case got slower or bigger than the
+tolerance allows, or makes more provider calls. ``--record`` refreshes the
+fixtures from the live providers instead of running anything.
+"""
+
+import argparse
+import dataclasses
+import json
+import logging
+import sys
+import typing as t
+from pathlib import Path
+
+from .replay import FIXTURES, ROUTES
+from .suite import CASES, SIZES, Result, measure
+
+# differences below this are timer noise, whatever the ratio
+_MIN_WALL_DELTA_S = 0.005
+
+# what --record asks each endpoint for
+_RECORD_QUERY = "dog"
+_RECORD_URLS = {
+    "/api/v3/search": "https://api.coingecko.com/api/v3/search",
+    "/api/v3/coins/markets": "https://api.coingecko.com/api/v3/coins/markets",
+    "/latest/dex/search": "https://api.dexscreener.com/latest/dex/search",
+}
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description=__doc__.split("\n", 1)[0],
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--cases", nargs="+", choices=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--record", action="store_true")
+    return parser.parse_args(argv)
+
+
+def regressions(
+    results: list[Result],
+    baseline: list[dict[str, t.Any]],
+    tolerance: float,
+) -> list[str]:
+    """Compare results with a previous run.
+
+    :param results: This run's results.
+    :param baseline: Results saved by a previous run.
+    :param tolerance: Allowed relative growth of time and memory.
+    :return: A description of each regression.
+    """
+    before = {(b["case"], b["size"]): b for b in baseline}
+    found = []
+    for res in results:
+        base = before.get((res.case, res.size))
+        if base is None:
+            continue
+        label = f"{res.case} @ {res.size}"
+        limit = 1 + tolerance
+        if (
+            res.wall_s > base["wall_s"] * limit
+            and res.wall_s - base["wall_s"] > _MIN_WALL_DELTA_S
+        ):
+            found.append(
+                f"{label}: wall {base['wall_s']:.4f}s -> {res.wall_s:.4f}s",
+            )
+        if res.peak_kib > base["peak_kib"] * limit:
+            found.append(
+                f"{label}: peak {base['peak_kib']:.0f} KiB"
+                f" -> {res.peak_kib:.0f} KiB",
+            )
+        if sum(res.calls.values()) > sum(base["calls"].values()):
+            found.append(f"{label}: calls {base['calls']} -> {res.calls}")
+    return found
+
+
+def record(fixtures: Path = FIXTURES) -> None:
+    """Save fresh provider responses as the fixtures.
+
+    :param fixtures: Directory to write the payloads to.
+    """
+    import requests  # pylint: disable=import-outside-toplevel
+
+    def _get(path: str, params: dict[str, t.Any]) -> t.Any:
+        response = requests.get(_RECORD_URLS[path], params=params, timeout=30)
+        response.raise_for_status()
+        (fixtures / ROUTES[path]).write_text(
+            response.text.strip() + "\n",
+            encoding="utf-8",
+        )
+        return response.json()
+
+    coins = _get("/api/v3/search", {"query": _RECORD_QUERY})["coins"]
+    _get(
+        "/api/v3/coins/markets",
+        {
+            "vs_currency": "usd",
+            "ids": ",".join(c["id"] for c in coins[:10]),
+            "order": "market_cap_desc",
+            "per_page": 250,
+            "page": 1,
+            "sparkline": "false",
+        },
+    )
+    _get("/latest/dex/search", {"q": _RECORD_QUERY})
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks.
+
+    :param argv: Command line arguments, ``sys.argv`` by default.
+    :return: Exit status, 1 if a regression was found.
+    """
+    args = _parse_args(argv)
+    if args.record:
+        record()
+        return 0
+
+    # the pipeline logs every narrative
+    logging.disable(logging.INFO)
+    results = []
+    for case in args.cases or CASES:
+        for size in args.sizes:
+            res = measure(case, size, repeat=args.repeat)
+            results.append(res)
+            calls = sum(res.calls.values())
+            print(
+                f"{case:<24} {size:>6}  {res.wall_s:>9.4f}s"
+                f"  {res.peak_kib:>10.0f} KiB  {calls:>6} calls"
+                f"  {res.waits_s:>9.1f}s waits",
+                flush=True,
+            )
+
+    if args.output:
+        args.output.write_text(
+            json.dumps(
+                {"results": [dataclasses.asdict(r) for r in results]},
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        found = regressions(results, baseline["results"], args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
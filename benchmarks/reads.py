@@ -0,0 +1,279 @@
+"""Load benchmark of the read endpoints.
+
+Seeds generated narratives, writes synthetic parents to both the database
+and ``storage`` (as a refresh does), then drives ``/heatmap``, ``/narratives``
+and paginated ``/parents/{narrative}`` through an in-process ASGI client
+with a fixed number of concurrent clients. Reports latency percentiles
+and throughput per endpoint.
+
+Usage::
+
+    python -m benchmarks.reads [--narratives 1000] [--parents 100]
+        [--concurrency 8] [--requests 50] [--output reads.json]
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import sys
+import time
+import typing as t
+from pathlib import Path
+
+from .replay import reset, scratch
+
+ENDPOINTS = ("heatmap", "narratives", "parents")
+# page size used to walk /parents
+PAGE_LIMIT = 25
+
+
+@dataclasses.dataclass
+class Load:
+    """Latency and throughput of one endpoint under load."""
+
+    endpoint: str
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    rps: float
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Get a percentile by the nearest-rank method.
+
+    :param samples: Sorted samples.
+    :param pct: Percentile, 0 to 100.
+    :return: The sample at that rank, 0 without samples.
+    """
+    if not samples:
+        return 0.0
+    rank = max(1, -(-len(samples) * pct // 100))
+    return samples[int(rank) - 1]
+
+
+def populate(narratives: int, parents: int, seed: int = 0) -> None:
+    """Write every seeded narrative's parents to the database and storage.
+
+    Parents come from the synthetic provider.
+
+    :param narratives: Number of seeded narratives.
+    :param parents: Parents per narrative.
+    :param seed: Random seed.
+    """
+    # pylint: disable=import-outside-toplevel,protected-access
+    from sqlalchemy import insert
+
+    from backend import repo
+    from backend.adapters.source import _synthetic_items
+    from backend.models import ParentHit, ParentMeta
+    from backend.seeds import load_seeds
+    from backend.storage import set_parents
+
+    ts = time.time()
+    with repo.SessionLocal() as s:
+        for n in load_seeds()["narratives"][:narratives]:
+            name = n["name"]
+            rows = _synthetic_items(n["terms"], parents, seed)
+            set_parents(name, rows)
+            # bulk inserts: replace_parents row by row would dominate setup
+            s.execute(
+                insert(ParentHit),
+                [
+                    {
+                        "narrative": name,
+                        "parent": r["parent"],
+                        "matches": r["matches"],
+                        "ts": ts,
+                        "symbol": r["symbol"],
+                        "source": r["source"],
+                        "price": r["price"],
+                        "marketCap": r["marketCap"],
+                        "vol24h": r["vol24h"],
+                    }
+                    for r in rows
+                ],
+            )
+            s.execute(
+                insert(ParentMeta),
+                [
+                    {
+                        "narrative": name,
+                        "parent": r["parent"],
+                        "symbol": r["symbol"],
+                        "price": r["price"],
+                        "market_cap": r["marketCap"],
+                        "vol24h": r["vol24h"],
+                        "liquidity_usd": r["liquidityUsd"],
+                        "chain": r["chain"],
+                        "address": r["address"],
+                        "url": r["url"],
+                        "source": r["source"],
+                        "updated_at": ts,
+                    }
+                    for r in rows
+                ],
+            )
+        s.commit()
+
+
+async def _drive(
+    task: t.Callable[[int], t.Awaitable[list[tuple[float, int]]]],
+    total: int,
+    concurrency: int,
+) -> tuple[list[tuple[float, int]], float]:
+    # run ``total`` tasks over ``concurrency`` clients; each task yields
+    # (seconds, status) per request it made
+    queue = iter(range(total))
+    samples: list[tuple[float, int]] = []
+
+    async def _worker() -> None:
+        for i in queue:
+            samples.extend(await task(i))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+
+async def _run_endpoint(
+    client: t.Any,
+    endpoint: str,
+    names: list[str],
+    total: int,
+    concurrency: int,
+) -> Load:
+    async def _get(
+        path: str,
+        **params: t.Any,
+    ) -> tuple[tuple[float, int], t.Any]:
+        start = time.perf_counter()
+        response = await client.get(path, params=params)
+        sample = (time.perf_counter() - start, response.status_code)
+        return sample, response
+
+    async def _task(task: int) -> list[tuple[float, int]]:
+        if endpoint != "parents":
+            sample, _ = await _get(f"/{endpoint}")
+            return [sample]
+        # walk every page of one narrative
+        samples = []
+        path = f"/parents/{names[task % len(names)]}"
+        cursor = None
+        while True:
+            params: dict[str, t.Any] = {"limit": PAGE_LIMIT}
+            if cursor:
+                params["cursor"] = cursor
+            sample, response = await _get(path, **params)
+            samples.append(sample)
+            cursor = response.json().get("nextCursor")
+            if sample[1] != 200 or not cursor:
+                return samples
+
+    samples, elapsed = await _drive(_task, total, concurrency)
+    latencies = sorted(s[0] * 1000 for s in samples)
+    return Load(
+        endpoint=endpoint,
+        requests=len(samples),
+        errors=sum(1 for s in samples if s[1] != 200),
+        p50_ms=round(percentile(latencies, 50), 3),
+        p95_ms=round(percentile(latencies, 95), 3),
+        p99_ms=round(percentile(latencies, 99), 3),
+        rps=round(len(samples) / elapsed, 1) if elapsed else 0.0,
+    )
+
+
+def run(
+    narratives: int = 1000,
+    parents: int = 100,
+    concurrency: int = 8,
+    requests: int = 50,
+    endpoints: t.Sequence[str] = ENDPOINTS,
+) -> list[Load]:
+    """Load the read endpoints.
+
+    :param narratives: Number of seeded narratives.
+    :param parents: Parents per narrative.
+    :param concurrency: Concurrent clients.
+    :param requests: Requests per endpoint; page walks for ``parents``.
+    :param endpoints: Endpoints to load.
+    :return: Measurements per endpoint.
+    """
+    # pylint: disable=import-outside-toplevel
+    import httpx
+
+    from backend.main import app
+    from backend.seeds import list_narrative_names
+
+    async def _all() -> list[Load]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://bench",
+        ) as client:
+            names = list_narrative_names()
+            return [
+                await _run_endpoint(client, e, names, requests, concurrency)
+                for e in endpoints
+            ]
+
+    with scratch(narratives):
+        try:
+            populate(narratives, parents)
+            return asyncio.run(_all())
+        finally:
+            reset()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the read benchmark.
+
+    :param argv: Command line arguments, ``sys.argv`` by default.
+    :return: Exit status.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.reads",
+        description=__doc__.split("\n", 1)[0],
+    )
+    parser.add_argument("--narratives", type=int, default=1000)
+    parser.add_argument("--parents", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    results = run(
+        args.narratives,
+        args.parents,
+        args.concurrency,
+        args.requests,
+        args.endpoints or ENDPOINTS,
+    )
+    for res in results:
+        print(
+            f"{res.endpoint:<12} {res.requests:>6} req  {res.errors:>4} err"
+            f"  p50 {res.p50_ms:>9.2f}ms  p95 {res.p95_ms:>9.2f}ms"
+            f"  p99 {res.p99_ms:>9.2f}ms  {res.rps:>8.1f} req/s",
+        )
+    if args.output:
+        args.output.write_text(
+            json.dumps(
+                {
+                    "narratives": args.narratives,
+                    "parents": args.parents,
+                    "concurrency": args.concurrency,
+                    "results": [dataclasses.asdict(r) for r in results],
+                },
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""Offline replay of provider responses.
+
+``Replay`` answers CoinGecko and DexScreener requests from the recorded
+payloads in ``fixtures/`` and counts them by endpoint. ``offline`` routes
+both HTTP clients the adapters use (the requests session and httpx) to it,
+lifts the rate limits and refresh budgets, turns politeness sleeps into a
+running total instead of real waits, and points the database at a
+scratch SQLite file. Nothing leaves the process.
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+import typing as t
+from collections import Counter
+from pathlib import Path
+from unittest.mock import patch
+from urllib.parse import urlsplit
+
+from . import seeds
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# recorded payload of each endpoint
+ROUTES = {
+    "/api/v3/search": "coingecko-search.json",
+    "/api/v3/coins/markets": "coingecko-markets.json",
+    "/latest/dex/search": "dexscreener-search.json",
+}
+
+# hosts whose limiters are lifted while offline
+HOSTS = ("api.coingecko.com", "api.dexscreener.com")
+
+_UNLIMITED = 1e9
+
+
+class Replay:
+    """Recorded provider responses, served by endpoint path.
+
+    :param fixtures: Directory holding the payloads named in ``ROUTES``.
+    """
+
+    def __init__(self, fixtures: Path = FIXTURES) -> None:
+        """Load the payloads."""
+        self.bodies = {
+            path: (fixtures / name).read_bytes()
+            for path, name in ROUTES.items()
+        }
+        self.calls: Counter[str] = Counter()
+
+    def respond(self, url: str) -> tuple[int, bytes]:
+        """Answer a request.
+
+        :param url: The requested URL.
+        :return: Status code and body.
+        """
+        path = urlsplit(url).path
+        self.calls[path] += 1
+        body = self.bodies.get(path)
+        if body is None:
+            return 404, b'{"error":"not recorded"}'
+        return 200, body
+
+    def requests_adapter(self) -> t.Any:
+        """Get a requests transport adapter serving the payloads.
+
+        :return: Adapter to mount on a requests session.
+        """
+        import requests.adapters  # pylint: disable=import-outside-toplevel
+        import urllib3  # pylint: disable=import-outside-toplevel
+
+        replay = self
+
+        class _Adapter(requests.adapters.HTTPAdapter):
+            # pylint: disable=too-many-positional-arguments
+            def send(  # type: ignore[override]
+                self,
+                request: t.Any,
+                stream: bool = False,
+                timeout: t.Any = None,
+                verify: t.Any = True,
+                cert: t.Any = None,
+                proxies: t.Any = None,
+            ) -> t.Any:
+                status, body = replay.respond(request.url)
+                raw = urllib3.HTTPResponse(
+                    body=io.BytesIO(body),
+                    headers={"Content-Type": "application/json"},
+                    status=status,
+                    preload_content=False,
+                )
+                return self.build_response(request, raw)
+
+        return _Adapter()
+
+    def httpx_client(self) -> type:
+        """Get an ``httpx.Client`` class whose clients use the payloads.
+
+        :return: Client class to patch over ``httpx.Client``.
+        """
+        import httpx  # pylint: disable=import-outside-toplevel
+
+        def _handle(request: httpx.Request) -> httpx.Response:
+            status, body = self.respond(str(request.url))
+            return httpx.Response(
+                status,
+                content=body,
+                headers={"Content-Type": "application/json"},
+            )
+
+        transport = httpx.MockTransport(_handle)
+
+        class _Client(httpx.Client):
+            def __init__(self, **kwargs: t.Any) -> None:
+                super().__init__(transport=transport, **kwargs)
+
+        return _Client
+
+
+class Waits:  # pylint: disable=too-few-public-methods
+    """Running total of the sleeps a run asked for.
+
+    Installed in place of ``time.sleep``, so politeness delays cost
+    nothing but are still reported.
+    """
+
+    def __init__(self) -> None:
+        """Start from zero."""
+        self.seconds = 0.0
+
+    def __call__(self, seconds: float) -> None:
+        """Record a sleep instead of sleeping.
+
+        :param seconds: Requested sleep.
+        """
+        self.seconds += max(0.0, seconds)
+
+
+def reset() -> None:
+    """Drop every cache and counter a previous run may have filled."""
+    # pylint: disable=import-outside-toplevel,protected-access
+    from backend import ledger, storage
+    from backend.adapters import source
+    from backend.adapters.breaker import reset_breakers
+    from backend.adapters.httpcache import HTTP_CACHE
+    from backend.jobs import clear_jobs
+
+    source.clear_search_cache()
+    source._raw_cache.clear()
+    source._raw_bytes.clear()
+    ledger.current().clear()
+    HTTP_CACHE.clear()
+    reset_breakers()
+    clear_jobs()
+    storage._parents.clear()
+    storage._metadata.clear()
+
+
+@contextlib.contextmanager
+def scratch(size: int) -> t.Iterator[None]:
+    """Seed ``size`` generated narratives and use an empty database.
+
+    :param size: Number of narratives.
+    :yield: None.
+    """
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from backend import repo
+    from backend.db import Base
+    from backend.seeds import load_seeds
+
+    with contextlib.ExitStack() as stack:
+        path = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        seeds.write(path / "seeds.json", size)
+        stack.enter_context(
+            patch.dict(os.environ, {"SEEDS_FILE": str(path / "seeds.json")}),
+        )
+        load_seeds.cache_clear()
+        stack.callback(load_seeds.cache_clear)
+
+        engine = create_engine(f"sqlite:///{path / 'bench.db'}")
+        stack.callback(engine.dispose)
+        Base.metadata.create_all(bind=engine)
+        stack.enter_context(
+            patch.object(repo, "SessionLocal", sessionmaker(bind=engine)),
+        )
+        yield
+
+
+@contextlib.contextmanager
+def offline(
+    replay: Replay,
+    waits: Waits,
+    size: int,
+) -> t.Iterator[None]:
+    """Run the pipeline against ``replay`` with ``size`` narratives.
+
+    :param replay: Serves the provider requests.
+    :param waits: Collects the sleeps.
+    :param size: Number of synthetic narratives to seed.
+    :yield: None.
+    """
+    # pylint: disable=import-outside-toplevel,protected-access
+    import httpx
+
+    from backend.adapters import ratelimit, source
+    from backend.api.routes import refresh
+
+    with contextlib.ExitStack() as stack:
+        # leave no benchmark parents behind
+        stack.callback(reset)
+        stack.enter_context(scratch(size))
+
+        session = source._session()
+        stack.enter_context(patch.dict(session.adapters))
+        session.mount("https://", replay.requests_adapter())
+        stack.enter_context(
+            patch.object(httpx, "Client", replay.httpx_client()),
+        )
+
+        limiters = {
+            host: ratelimit.AdaptiveLimiter(
+                host,
+                _UNLIMITED,
+                int(_UNLIMITED),
+                max_rps=_UNLIMITED,
+            )
+            for host in HOSTS
+        }
+        stack.enter_context(patch.dict(ratelimit._LIMITERS, limiters))
+        stack.enter_context(
+            patch.object(source, "_cg_limiter", limiters[source.CG_HOST]),
+        )
+        stack.enter_context(patch.object(source, "CG_JITTER_MS", 0))
+        stack.enter_context(patch.object(time, "sleep", waits))
+
+        # one job refreshes every narrative with every call it needs
+        stack.enter_context(patch.object(refresh, "REFRESH_MAX_CALLS", 10**9))
+        stack.enter_context(
+            patch.object(refresh, "REFRESH_PER_NARRATIVE_CAP", 0),
+        )
+        reset()
+        yield
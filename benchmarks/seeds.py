@@ -0,0 +1,127 @@
+"""Deterministic generator of large seeds files.
+
+Writes seeds v2 files (see ``seeds/README.md``) with any number of
+narratives, each with terms, synonyms, block lists, weights and branches.
+Terms are pseudo-words from a small syllable set, so some are shared
+between narratives, as real seeds share popular terms. The same size and
+seed always give the same file.
+
+Usage::
+
+    python -m benchmarks.seeds --narratives 5000 --output seeds.json
+
+Pair it with ``SOURCE_MODE=synthetic`` to run the API at that scale
+without any provider.
+"""
+
+import argparse
+import json
+import random
+import sys
+import typing as t
+from pathlib import Path
+
+_SYLLABLES = (
+    "ba",
+    "bo",
+    "do",
+    "fi",
+    "ge",
+    "ki",
+    "lu",
+    "mo",
+    "na",
+    "pe",
+    "ra",
+    "so",
+    "ti",
+    "wu",
+    "xa",
+    "zo",
+)
+# words the synthetic provider puts in a few parent names
+_BLOCK_WORDS = ("fake", "scam", "rug", "honeypot", "test")
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 3)))
+
+
+def narrative(index: int, rng: random.Random) -> dict[str, t.Any]:
+    """Generate one narrative.
+
+    :param index: Position of the narrative, keeps names unique.
+    :param rng: Random source.
+    :return: A seeds v2 narrative.
+    """
+    name = f"{_word(rng)}-{index}"
+    terms = list(dict.fromkeys(_word(rng) for _ in range(rng.randint(2, 5))))
+    branches = []
+    for _ in range(rng.choice((0, 0, 1, 2, 3))):
+        branch_terms = rng.sample(terms, min(2, len(terms))) + [_word(rng)]
+        branches.append(
+            {
+                "name": f"{name}-{_word(rng)}",
+                "terms": branch_terms,
+                "weight": round(rng.uniform(0.5, 1.5), 2),
+            },
+        )
+    return {
+        "name": name,
+        "terms": terms,
+        "synonyms": [_word(rng) for _ in range(rng.randint(0, 2))],
+        # a few narratives insist on their first term
+        "require_all": terms[:1] if rng.random() < 0.1 else [],
+        "block": rng.sample(_BLOCK_WORDS, rng.randint(0, 3)),
+        "weight": round(rng.uniform(0.5, 1.5), 2),
+        "branches": branches,
+    }
+
+
+def generate(size: int, seed: int = 0) -> dict[str, t.Any]:
+    """Generate a seeds v2 document.
+
+    :param size: Number of narratives.
+    :param seed: Random seed.
+    :return: The seeds document.
+    """
+    rng = random.Random(seed)
+    return {
+        "version": 2,
+        "narratives": [narrative(i, rng) for i in range(size)],
+    }
+
+
+def write(path: Path, size: int, seed: int = 0) -> None:
+    """Write a generated seeds file.
+
+    :param path: File to write.
+    :param size: Number of narratives.
+    :param seed: Random seed.
+    """
+    path.write_text(
+        json.dumps(generate(size, seed), indent=2) + "\n",
+        encoding="utf-8",
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Write a seeds file.
+
+    :param argv: Command line arguments, ``sys.argv`` by default.
+    :return: Exit status.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.seeds",
+        description=__doc__.split("\n", 1)[0],
+    )
+    parser.add_argument("--narratives", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, required=True)
+    args = parser.parse_args(argv)
+    write(args.output, args.narratives, args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
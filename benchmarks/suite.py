@@ -0,0 +1,183 @@
+"""Benchmark cases for the refresh pipeline.
+
+Each case is timed at every requested size (number of narratives) inside
+``offline``. A result holds the best wall time over the repeats, the
+provider calls by endpoint, the sleeps the run asked for and the peak
+traced memory of one extra, traced run.
+"""
+
+import dataclasses
+import time
+import tracemalloc
+import typing as t
+
+from .replay import Replay, Waits, offline, reset
+
+# refresh job modes (see backend.api.routes.refresh)
+MODES = ("dev", "real", "real_cg", "real_ds", "real_mix", "blend")
+# providers compute_all can use without a network
+PROVIDERS = ("dev", "synthetic", "coingecko", "blend")
+# parents per narrative written by the replace_parents case
+PARENTS_PER_NARRATIVE = 25
+
+SIZES = (10, 100, 1000, 10000)
+
+
+@dataclasses.dataclass
+class Result:
+    """Measurements of one case at one size."""
+
+    case: str
+    size: int
+    wall_s: float
+    peak_kib: float
+    waits_s: float
+    calls: dict[str, int]
+
+
+def _compute_all(provider: str) -> t.Callable[[int], None]:
+    def _run(_size: int) -> None:
+        # pylint: disable=import-outside-toplevel
+        from unittest.mock import patch
+
+        from backend.adapters import source
+        from backend.parents import compute_all
+
+        with patch.object(source, "MODE", provider):
+            compute_all()
+
+    return _run
+
+
+def _refresh_job(mode: str) -> t.Callable[[int], None]:
+    def _run(size: int) -> None:
+        # pylint: disable=import-outside-toplevel,protected-access
+        from backend.api.routes.refresh import _process_dev_mode_job
+
+        _process_dev_mode_job("bench", mode, "24h", size)
+
+    return _run
+
+
+def _provider_items(size: int) -> tuple[list[dict], list[dict]]:
+    """Build ``size`` DexScreener and CoinGecko items from the fixtures.
+
+    Half of the CoinGecko items share a symbol and name with a DexScreener
+    item, so both merge paths run.
+
+    :param size: Items per provider.
+    :return: DexScreener items and CoinGecko items.
+    """
+    # pylint: disable=import-outside-toplevel,protected-access
+    import json
+
+    from backend.adapters import source
+
+    from .replay import FIXTURES
+
+    pairs = json.loads((FIXTURES / "dexscreener-search.json").read_text())
+    rows = json.loads((FIXTURES / "coingecko-markets.json").read_text())
+    ds_base = [r for r in map(source._ds_record, pairs["pairs"]) if r]
+    cg_base = source._make_cg()._map_market_to_items(rows)
+    ds_items, cg_items = [], []
+    for i in range(size):
+        ds = dict(ds_base[i % len(ds_base)])
+        ds["parent"] = f"{ds['parent']} {i}"
+        ds["symbol"] = f"{ds['symbol']}{i}"
+        ds["address"] = f"{ds['address']}{i}"
+        cg = dict(cg_base[i % len(cg_base)])
+        if i % 2:
+            cg["parent"], cg["symbol"] = ds["parent"], ds["symbol"]
+        else:
+            cg["parent"] = f"{cg['parent']} {i}"
+        ds_items.append(ds)
+        cg_items.append(cg)
+    return ds_items, cg_items
+
+
+def _merge_parents(size: int) -> t.Callable[[], None]:
+    # pylint: disable=import-outside-toplevel,protected-access
+    from backend.adapters.source import _merge_parents as merge
+
+    ds_items, cg_items = _provider_items(size)
+
+    def _run() -> None:
+        merge(ds_items, cg_items)
+
+    return _run
+
+
+def _replace_parents(size: int) -> t.Callable[[], None]:
+    # pylint: disable=import-outside-toplevel
+    from backend.repo import replace_parents
+
+    ds_items, _ = _provider_items(PARENTS_PER_NARRATIVE)
+
+    def _run() -> None:
+        ts = time.time()
+        for i in range(size):
+            replace_parents(f"narrative-{i:05d}", ds_items, ts)
+
+    return _run
+
+
+def _sized(
+    run: t.Callable[[int], None],
+) -> t.Callable[[int], t.Callable[[], None]]:
+    # cases that only need the size when they run
+    return lambda size: lambda: run(size)
+
+
+# case name -> factory building the timed call for a size
+CASES: dict[str, t.Callable[[int], t.Callable[[], None]]] = {
+    **{f"compute_all[{p}]": _sized(_compute_all(p)) for p in PROVIDERS},
+    **{f"refresh_job[{m}]": _sized(_refresh_job(m)) for m in MODES},
+    "merge_parents": _merge_parents,
+    "replace_parents": _replace_parents,
+}
+
+
+def measure(
+    case: str,
+    size: int,
+    repeat: int = 3,
+    replay: Replay | None = None,
+) -> Result:
+    """Run a case at a size and measure it.
+
+    :param case: One of ``CASES``.
+    :param size: Number of narratives (items for ``merge_parents``).
+    :param repeat: Timed runs; the fastest counts.
+    :param replay: Serves the provider requests, fixtures by default.
+    :return: The measurements.
+    """
+    replay = replay or Replay()
+    waits = Waits()
+    with offline(replay, waits, size):
+        call = CASES[case](size)
+        best = float("inf")
+        for _ in range(repeat):
+            reset()
+            replay.calls.clear()
+            waits.seconds = 0.0
+            start = time.perf_counter()
+            call()
+            best = min(best, time.perf_counter() - start)
+        calls = dict(replay.calls)
+        waited = waits.seconds
+
+        reset()
+        tracemalloc.start()
+        try:
+            call()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return Result(
+        case=case,
+        size=size,
+        wall_s=round(best, 6),
+        peak_kib=round(peak / 1024, 1),
+        waits_s=round(waited, 3),
+        calls=calls,
+    )
@@ -15,6 +15,10 @@ os.environ.setdefault(
     "SOURCE_MODE",
     "test",
 )  # deterministic adapter mode for tests
+os.environ.setdefault(
+    "REFRESH_EXECUTOR",
+    "inline",
+)  # run refresh jobs on the event loop so tests finish them in order
 
 # now import app after env is set
 sys.path.insert(
@@ -58,12 +62,10 @@ def _clear_refresh_module_state() -> None:
     This ensures that the idempotency state doesn't leak between tests.
     """
     # Import here to avoid circular imports
-    import backend.api.routes.refresh as refresh_module
+    from backend.jobs import clear_jobs
 
-    # Reset the module-level global state
-    refresh_module.current_running_job = None
-    refresh_module.last_completed_job = None
-    refresh_module.last_started_ts = 0.0
+    # Reset the job registry shared with the refresh routes
+    clear_jobs()
 
 
 @pytest.fixture(autouse=True)
@@ -77,3 +79,74 @@ def _clear_search_cache() -> None:
 
     # Clear the search cache
     clear_search_cache()
+
+
+@pytest.fixture(autouse=True)
+def _clear_call_ledger() -> None:
+    """Forget provider calls made outside of jobs between tests."""
+    # Import here to avoid circular imports
+    from backend import ledger
+
+    ledger.current().clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_breakers() -> None:
+    """Close provider circuits between tests for isolation.
+
+    This ensures that failures in one test don't make the next fail fast.
+    """
+    # Import here to avoid circular imports
+    from backend.adapters.breaker import reset_breakers
+
+    reset_breakers()
+
+
+@pytest.fixture(autouse=True)
+def _clear_http_cache() -> None:
+    """Clear cached provider responses between tests for isolation.
+
+    This ensures that one test's responses are not revalidated by another.
+    """
+    # Import here to avoid circular imports
+    from backend.adapters.httpcache import HTTP_CACHE
+
+    HTTP_CACHE.clear()
+
+
+@pytest.fixture
+def running_job() -> t.Callable[..., str]:
+    """Provide a factory registering a job as already running.
+
+    The job has no runner; it gives progress updates, cancellation and
+    event streams a target. With ``holds_slot`` it also takes a running
+    slot, so submitted jobs queue behind it.
+
+    :return: Function taking the job ID and progress fields.
+    """
+    # Import here to avoid circular imports
+    from backend import jobs
+
+    def _add(jid: str, *, holds_slot: bool = False, **info: t.Any) -> str:
+        job = jobs._Job(jid, info)
+        job.state = "running"
+        with jobs._LOCK:
+            jobs.JOBS[jid] = job
+            if holds_slot:
+                jobs._RUNNING.add(jid)
+        return jid
+
+    return _add
+
+
+@pytest.fixture
+def executor_pools() -> t.Generator[None, None, None]:
+    """Stop the executor pools a test started.
+
+    :return: Fixture generator.
+    """
+    yield
+    # Import here to avoid circular imports
+    from backend.executor import shutdown_executors
+
+    shutdown_executors()
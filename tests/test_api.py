@@ -113,35 +113,25 @@ def test_narratives_list_with_job_errors(client) -> None:
 
     :param client: Pytest fixture for test client.
     """
-    # Mock the last_completed_job to have errors
-    from backend.api.routes import refresh
+    # Record a finished job with errors
+    from backend import jobs
     from backend.api.routes.narratives import _get_last_job_errors
 
-    # Save original value
-    original_job = refresh.last_completed_job
-
-    # Set a job with errors
-    refresh.last_completed_job = {
-        "id": "test-job",
-        "state": "done",
-        "errors": ["error1", "error2"],
-    }
-
-    try:
-        # Test the function directly to ensure coverage
-        error_count = _get_last_job_errors()
-        assert error_count == 2
-
-        # Test the endpoint
-        r = client.get("/narratives")
-        assert r.status_code == 200
-        js = r.json()
-        assert "items" in js and isinstance(js["items"], list)
-        # Should be stale due to job errors
-        assert js.get("stale") is True
-    finally:
-        # Restore original value
-        refresh.last_completed_job = original_job
+    job = jobs._Job("test-job", {"errors": ["error1", "error2"]})
+    jobs.JOBS[job.id] = job
+    jobs.finish_job(job.id, "done")
+
+    # Test the function directly to ensure coverage
+    error_count = _get_last_job_errors()
+    assert error_count == 2
+
+    # Test the endpoint
+    r = client.get("/narratives")
+    assert r.status_code == 200
+    js = r.json()
+    assert "items" in js and isinstance(js["items"], list)
+    # Should be stale due to job errors
+    assert js.get("stale") is True
 
 
 def test_parents_404_unknown(client) -> None:
@@ -179,6 +169,7 @@ def test_parents_debug_mode(client) -> None:
     """
     from unittest.mock import patch
 
+    from backend.records import ParentColumns, ParentRecord
     from backend.seeds import list_narrative_names
 
     # Get a narrative name and set up some data with sources
@@ -187,14 +178,16 @@ def test_parents_debug_mode(client) -> None:
         test_narrative = narrative_names[0]
 
         # Mock the data source to return data with sources field
-        mock_data = [
-            {
-                "parent": "test",
-                "matches": 1,
-                "score": 0.5,
-                "sources": ["coingecko", "dexscreener"],
-            },
-        ]
+        mock_data = ParentColumns(
+            [
+                ParentRecord(
+                    parent="test",
+                    matches=1,
+                    score=0.5,
+                    sources=["coingecko", "dexscreener"],
+                ),
+            ],
+        )
 
         with (
             patch(
@@ -202,7 +195,7 @@ def test_parents_debug_mode(client) -> None:
                 return_value=[],
             ),
             patch(
-                "backend.api.routes.parents.get_parents",
+                "backend.api.routes.parents.get_columns",
                 return_value=mock_data,
             ),
         ):
@@ -0,0 +1,141 @@
+"""Tests for the offline benchmarks."""
+
+import json
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from backend import storage
+from backend.seeds import list_narrative_names, load_seeds
+from benchmarks import reads, seeds
+from benchmarks.__main__ import main, regressions
+from benchmarks.suite import Result, measure
+
+
+@pytest.mark.benchmark
+def test_measure_replays_provider_calls() -> None:
+    """Test a real mode refresh runs against the recorded payloads."""
+    sleep = time.sleep
+    res = measure("refresh_job[real_ds]", 2, repeat=1)
+    # one search per term, at most 3 per narrative
+    calls = sum(
+        min(3, len(n["terms"])) for n in seeds.generate(2)["narratives"]
+    )
+    assert res.calls == {"/latest/dex/search": calls}
+    # sleeps are counted, not slept; searches are paced by the limiter
+    assert res.waits_s == pytest.approx(2 * 0.05)
+    assert res.wall_s > 0
+    assert res.peak_kib > 0
+    assert time.sleep is sleep
+    assert not storage._parents
+
+
+@pytest.mark.benchmark
+def test_main_compares_with_baseline(tmp_path, capsys) -> None:
+    """Test a run saves its results and checks them against a baseline.
+
+    :param tmp_path: Temporary directory.
+    :param capsys: Captured output.
+    """
+    out = tmp_path / "results.json"
+    args = ["--sizes", "3", "--repeat", "1", "--cases", "merge_parents"]
+    assert main([*args, "--output", str(out)]) == 0
+    assert main([*args, "--baseline", str(out), "--tolerance", "100"]) == 0
+    assert "merge_parents" in capsys.readouterr().out
+
+
+def test_regressions_flag_slower_bigger_and_chattier_runs() -> None:
+    """Test only growth beyond the tolerance is reported."""
+    base = {
+        "case": "c",
+        "size": 10,
+        "wall_s": 1.0,
+        "peak_kib": 100.0,
+        "waits_s": 0.0,
+        "calls": {"/a": 2},
+    }
+    same = Result("c", 10, 1.1, 110.0, 0.0, {"/a": 2})
+    worse = Result("c", 10, 2.0, 200.0, 0.0, {"/a": 3})
+    other = Result("c", 20, 9.0, 900.0, 0.0, {"/a": 9})
+    assert not regressions([same, other], [base], 0.25)
+    found = regressions([worse], [base], 0.25)
+    assert [line.split(":")[1].split()[0] for line in found] == [
+        "wall",
+        "peak",
+        "calls",
+    ]
+
+
+@pytest.mark.benchmark
+def test_read_load_walks_every_page() -> None:
+    """Test the read benchmark loads each endpoint without errors."""
+    heatmap, narratives, parents = reads.run(
+        narratives=3,
+        parents=60,
+        concurrency=2,
+        requests=4,
+    )
+    assert (heatmap.requests, narratives.requests) == (4, 4)
+    # 60 parents are 3 pages of 25
+    assert parents.requests == 12
+    for load in (heatmap, narratives, parents):
+        assert load.errors == 0
+        assert 0 < load.p50_ms <= load.p95_ms <= load.p99_ms
+        assert load.rps > 0
+    assert not storage._parents
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    """Test percentiles pick a sample by nearest rank."""
+    samples = [float(i) for i in range(1, 101)]
+    assert reads.percentile(samples, 50) == 50.0
+    assert reads.percentile(samples, 99) == 99.0
+    assert reads.percentile([3.0], 95) == 3.0
+    assert reads.percentile([], 50) == 0.0
+
+
+def test_reads_main_writes_results(tmp_path) -> None:
+    """Test the read benchmark CLI saves its results.
+
+    :param tmp_path: Temporary directory.
+    """
+    out = tmp_path / "reads.json"
+    argv = ["--narratives", "2", "--parents", "5", "--requests", "1"]
+    assert (
+        reads.main([*argv, "--endpoints", "narratives", "--output", str(out)])
+        == 0
+    )
+    data = json.loads(out.read_text())
+    assert [r["endpoint"] for r in data["results"]] == ["narratives"]
+
+
+def test_generated_seeds_are_deterministic_v2_files(tmp_path) -> None:
+    """Test generated seeds are valid v2 files that load.
+
+    :param tmp_path: Temporary directory.
+    """
+    doc = seeds.generate(300, seed=1)
+    assert doc == seeds.generate(300, seed=1)
+    assert doc["version"] == 2
+    names = [n["name"] for n in doc["narratives"]]
+    assert len(set(names)) == 300
+    assert any(n["branches"] for n in doc["narratives"])
+    assert any(n["synonyms"] for n in doc["narratives"])
+    assert any(n["block"] for n in doc["narratives"])
+    assert any(n["require_all"] for n in doc["narratives"])
+    # popular terms are shared between narratives
+    terms = [term for n in doc["narratives"] for term in n["terms"]]
+    assert len(set(terms)) < len(terms)
+
+    path = tmp_path / "seeds.json"
+    argv = ["--narratives", "5", "--seed", "1", "--output", str(path)]
+    assert seeds.main(argv) == 0
+    with patch.dict(os.environ, {"SEEDS_FILE": str(path)}):
+        load_seeds.cache_clear()
+        try:
+            # a smaller file is a prefix of a larger one
+            assert list_narrative_names() == names[:5]
+        finally:
+            load_seeds.cache_clear()
@@ -0,0 +1,204 @@
+"""Tests for the per-provider circuit breakers."""
+
+import threading
+from unittest.mock import MagicMock, Mock, patch
+
+import httpx
+import pytest
+import requests
+from prometheus_client import REGISTRY
+
+from backend import deadline
+from backend.adapters import breaker, coingecko, dexscreener, source
+from backend.adapters.breaker import CircuitBreaker, CircuitOpenError
+from backend.adapters.coingecko import CoinGeckoAdapter
+from backend.adapters.dexscreener import DexScreenerAdapter
+from backend.adapters.mixed import MixedAdapter
+
+
+def _state_metric(host: str) -> float | None:
+    return REGISTRY.get_sample_value(
+        "primecipher_circuit_state",
+        {"host": host},
+    )
+
+
+def _trip(host: str) -> CircuitBreaker:
+    b = breaker.breaker_for(host)
+    for _ in range(b.max_failures):
+        b.record_failure()
+    return b
+
+
+def test_breaker_opens_after_consecutive_failures() -> None:
+    """Test the breaker opens only after enough failures in a row."""
+    b = CircuitBreaker("trip.test", failures=2, reset_sec=60)
+    b.record_failure()
+    b.record_status(404)  # the host answered: not an outage
+    b.record_failure()
+    assert b.state == "closed"
+    assert b.allow()
+
+    b.record_status(503)
+    assert b.state == "open"
+    assert b.is_open()
+    assert not b.allow()
+    assert _state_metric("trip.test") == 2
+
+
+def test_half_open_allows_one_probe() -> None:
+    """Test an expired open breaker lets a single probe through."""
+    b = CircuitBreaker("probe.test", failures=1, reset_sec=0)
+    b.record_failure()
+    assert b.state == "half_open"
+    assert b.allow()
+    assert not b.allow()
+    assert _state_metric("probe.test") == 1
+
+    # a failed probe opens the circuit again
+    b.reset_sec = 60
+    b.record_failure()
+    assert b.state == "open"
+
+    # a successful probe closes it
+    b.reset_sec = 0
+    assert b.allow()
+    b.record_success()
+    assert b.state == "closed"
+    assert b.failures == 0
+    assert _state_metric("probe.test") == 0
+
+
+def test_abandoned_probe_is_released() -> None:
+    """Test a probe left without an outcome lets the next call through."""
+    host = "abandon.test"
+    b = breaker.breaker_for(host)
+    b.max_failures = 1
+    b.reset_sec = 0
+    b.record_failure()
+
+    # the deadline is spent after the probe was claimed
+    with deadline.deadline(0):
+        assert source._get_json(f"https://{host}/") is None
+        with pytest.raises(TimeoutError):
+            breaker.httpx_get_json(f"https://{host}/", {})
+    assert b.state == "half_open"
+    assert b.allow()
+
+    # only the thread holding the probe can release it
+    other = threading.Thread(target=b.release)
+    other.start()
+    other.join()
+    assert not b.allow()
+    b.release()
+    assert b.allow()
+
+
+def test_breaker_per_host() -> None:
+    """Test each host has its own breaker until reset."""
+    b = breaker.breaker_for("a.test")
+    assert breaker.breaker_for("a.test") is b
+    assert breaker.breaker_for("b.test") is not b
+    breaker.reset_breakers()
+    assert breaker.breaker_for("a.test") is not b
+
+
+@patch("backend.adapters.source.sess")
+@patch("time.sleep")
+def test_get_json_fails_fast_when_open(
+    _mock_sleep: MagicMock,
+    mock_session: MagicMock,
+) -> None:
+    """Test _get_json stops retrying once the host's circuit opens.
+
+    :param _mock_sleep: Mock for time.sleep function.
+    :param mock_session: Mock for the requests session.
+    """
+    mock_session.get.side_effect = requests.ConnectionError("down")
+    b = breaker.breaker_for("down.test")
+    b.max_failures = 2
+
+    assert source._get_json("https://down.test/x") is None
+    assert mock_session.get.call_count == 2
+    assert b.is_open()
+
+    assert source._get_json("https://down.test/y") is None
+    assert mock_session.get.call_count == 2
+
+
+def test_httpx_get_json_records_outcomes() -> None:
+    """Test the httpx helper records failures and refuses open hosts."""
+    b = breaker.breaker_for("httpx.test")
+    b.max_failures = 2
+    error = httpx.HTTPStatusError(
+        "boom",
+        request=Mock(),
+        response=Mock(status_code=502),
+    )
+    with patch("httpx.Client") as mock_client:
+        get = mock_client.return_value.__enter__.return_value.get
+        get.return_value.json.return_value = {"ok": True}
+        assert breaker.httpx_get_json("https://httpx.test/", {}) == {
+            "ok": True,
+        }
+
+        get.return_value.raise_for_status.side_effect = error
+        with pytest.raises(httpx.HTTPStatusError):
+            breaker.httpx_get_json("https://httpx.test/", {})
+
+        get.side_effect = httpx.ConnectError("down")
+        with pytest.raises(httpx.ConnectError):
+            breaker.httpx_get_json("https://httpx.test/", {})
+
+        with pytest.raises(CircuitOpenError):
+            breaker.httpx_get_json("https://httpx.test/", {})
+    assert get.call_count == 3
+
+
+def test_adapters_stop_when_circuit_open() -> None:
+    """Test the httpx adapters return nothing without calling the host."""
+    _trip(coingecko.HOST)
+    _trip(dexscreener.HOST)
+    with patch("httpx.Client") as mock_client, patch("time.sleep"):
+        assert not CoinGeckoAdapter()._search_coins(["a", "b"])
+        assert not DexScreenerAdapter()._query_dexscreener("a")
+    mock_client.assert_not_called()
+
+
+def test_blend_skips_open_providers() -> None:
+    """Test blend skips providers whose circuit is open."""
+    _trip(source.DS_HOST)
+    _trip(source.CG_HOST)
+    with (
+        patch("backend.adapters.source.parents_for_dexscreener") as mock_ds,
+        patch("backend.adapters.source._make_cg") as mock_cg,
+    ):
+        result = source._make_blend().parents_for("breaker", ["tripped"])
+    assert not result
+    mock_ds.assert_not_called()
+    mock_cg.assert_not_called()
+
+
+@patch("backend.adapters.mixed.CoinGeckoAdapter")
+@patch("backend.adapters.mixed.DexScreenerAdapter")
+def test_mixed_skips_open_provider(
+    mock_ds_adapter: MagicMock,
+    mock_cg_adapter: MagicMock,
+) -> None:
+    """Test the mixed adapter uses the healthy provider only.
+
+    :param mock_ds_adapter: Mock DexScreener adapter.
+    :param mock_cg_adapter: Mock CoinGecko adapter.
+    """
+    _trip(coingecko.HOST)
+    mock_ds_adapter.return_value.fetch_parents.return_value = [
+        {"symbol": "DOG", "name": "Dog", "vol24h": 5, "score": 1.0},
+    ]
+
+    result = MixedAdapter().fetch_parents("dogs", ["dog"])
+
+    mock_cg_adapter.return_value.fetch_parents.assert_not_called()
+    assert [item["sources"] for item in result] == [["dexscreener"]]
+
+    _trip(dexscreener.HOST)
+    assert not MixedAdapter().fetch_parents("dogs", ["dog"])
@@ -0,0 +1,224 @@
+"""Tests for fetch deadlines, the retry policy and hedged requests."""
+
+import threading
+import time
+import typing as t
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+import backend.api.routes.refresh as refresh_module
+from backend import deadline, executor, ledger
+from backend.adapters import breaker, source
+from backend.adapters.retry import RetryPolicy
+
+
+def test_deadline_nesting_only_shortens() -> None:
+    """Test nested deadlines keep the tighter budget."""
+    assert deadline.remaining() is None
+    assert deadline.bounded(10) == 10
+    with deadline.deadline(1), deadline.deadline(60):
+        left = deadline.remaining()
+        assert left is not None and left <= 1
+        assert deadline.bounded(10) <= 1
+    assert deadline.remaining() is None
+
+
+def test_retry_policy() -> None:
+    """Test backoff grows exponentially up to the cap."""
+    policy = RetryPolicy(base_delay=1, max_backoff=3, jitter=0)
+    assert [policy.backoff(a) for a in range(3)] == [1, 2, 3]
+    assert policy.retryable(429)
+    assert policy.retryable(503)
+    assert not policy.retryable(404)
+
+
+@patch("backend.adapters.source.sess")
+def test_get_json_expired_deadline_makes_no_call(
+    mock_session: MagicMock,
+) -> None:
+    """Test _get_json gives up without calling once the budget is spent.
+
+    :param mock_session: Mock for the requests session.
+    """
+    with deadline.deadline(0):
+        assert source._get_json("https://spent.test/") is None
+    mock_session.get.assert_not_called()
+
+
+@patch("backend.adapters.source.sess")
+@patch("time.sleep")
+def test_get_json_bounds_timeout_by_deadline(
+    _mock_sleep: MagicMock,
+    mock_session: MagicMock,
+) -> None:
+    """Test each attempt's timeout fits in the remaining budget.
+
+    :param _mock_sleep: Mock for time.sleep function.
+    :param mock_session: Mock for the requests session.
+    """
+    mock_session.get.return_value = MagicMock(status_code=200, headers={})
+    mock_session.get.return_value.json.return_value = {"ok": True}
+    with deadline.deadline(2):
+        assert source._get_json("https://budget.test/") == {"ok": True}
+    assert mock_session.get.call_args.kwargs["timeout"] <= 2
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        MagicMock(status_code=429, headers={"Retry-After": "30"}),
+        requests.ConnectionError("down"),
+    ],
+)
+@patch("backend.adapters.source.sess")
+@patch("time.sleep")
+def test_get_json_skips_backoff_past_deadline(
+    mock_sleep: MagicMock,
+    mock_session: MagicMock,
+    response: t.Any,
+) -> None:
+    """Test retries that would outlast the budget are abandoned.
+
+    :param mock_sleep: Mock for time.sleep function.
+    :param mock_session: Mock for the requests session.
+    :param response: Response or error of the first attempt.
+    """
+    mock_session.get.side_effect = [response]
+    with (
+        patch.object(source, "RETRY", RetryPolicy(base_delay=30)),
+        deadline.deadline(5),
+    ):
+        assert source._get_json("https://slow.test/") is None
+    assert mock_session.get.call_count == 1
+    assert all(c.args[0] < 5 for c in mock_sleep.call_args_list)
+
+
+@patch("backend.adapters.source.sess")
+@patch("time.sleep")
+def test_get_json_does_not_retry_client_errors(
+    _mock_sleep: MagicMock,
+    mock_session: MagicMock,
+) -> None:
+    """Test a 4xx response is not retried.
+
+    :param _mock_sleep: Mock for time.sleep function.
+    :param mock_session: Mock for the requests session.
+    """
+    not_found = MagicMock(status_code=404, headers={})
+    not_found.raise_for_status.side_effect = requests.HTTPError("404")
+    mock_session.get.return_value = not_found
+    assert source._get_json("https://missing.test/") is None
+    assert mock_session.get.call_count == 1
+
+
+def test_httpx_get_json_expired_deadline() -> None:
+    """Test the httpx helper refuses to start past the deadline."""
+    with (
+        patch("httpx.Client") as mock_client,
+        deadline.deadline(0),
+        pytest.raises(TimeoutError),
+    ):
+        breaker.httpx_get_json("https://spent.test/", {})
+    mock_client.assert_not_called()
+
+
+def test_pacing_sleeps_are_bounded_by_deadline() -> None:
+    """Test CoinGecko pacing never sleeps past the deadline."""
+    adapter = source._make_cg()
+    with (
+        patch.object(source, "_get_json", return_value={"coins": []}),
+        patch("time.sleep") as mock_sleep,
+        deadline.deadline(0.5),
+    ):
+        adapter._search_coins(["dog", "cat"])
+        adapter._get_market_data([str(i) for i in range(11)])
+    assert mock_sleep.call_count == 2
+    assert all(call.args[0] <= 0.5 for call in mock_sleep.call_args_list)
+
+
+def test_narrative_fetch_runs_under_deadline(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test real-mode narrative fetches get the narrative budget.
+
+    :param monkeypatch: Pytest fixture for patching.
+    """
+    monkeypatch.setattr(refresh_module, "NARRATIVE_BUDGET_SEC", 7)
+    seen: list[float | None] = []
+
+    def _fetch(_narrative: str, _terms: list[str]) -> list[dict]:
+        seen.append(deadline.remaining())
+        return []
+
+    monkeypatch.setattr(source, "parents_for_dexscreener", _fetch)
+    refresh_module._process_narrative_real_mode("dogs", ["dog"], "real_ds")
+    assert seen[0] is not None and 6 < seen[0] <= 7
+
+
+@pytest.mark.usefixtures("executor_pools")
+def test_hedged_races_slow_call() -> None:
+    """Test a slow call is raced by a second one, which wins."""
+    calls: list[int] = []
+    release = threading.Event()
+    hedges: list[None] = []
+
+    def _get() -> int:
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait(5)
+            return 1
+        return 2
+
+    result = executor.hedged(_get, 0.01, on_hedge=lambda: hedges.append(None))
+    release.set()
+    assert result == 2
+    assert len(hedges) == 1
+
+
+@pytest.mark.usefixtures("executor_pools")
+def test_hedged_fast_call_and_failures() -> None:
+    """Test fast calls are not hedged and a double failure raises."""
+    assert executor.hedged(lambda: 1, 0) == 1
+    assert executor.hedged(lambda: 1, 5) == 1
+
+    def _slow_fail() -> int:
+        time.sleep(0.05)
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        executor.hedged(_slow_fail, 0.01)
+
+    # a call that gives up on its own is not raced again
+    expired = MagicMock(side_effect=TimeoutError("deadline exceeded"))
+    with pytest.raises(TimeoutError, match="deadline exceeded"):
+        executor.hedged(expired, 5)
+    expired.assert_called_once()
+
+
+@pytest.mark.usefixtures("executor_pools")
+@patch("backend.adapters.source.sess")
+def test_get_json_hedges_slow_requests(
+    mock_session: MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a hedged GET pays for a second token and call.
+
+    :param mock_session: Mock for the requests session.
+    :param monkeypatch: Pytest fixture for patching.
+    """
+    monkeypatch.setattr(source, "HEDGE_AFTER_SEC", 0.01)
+    monkeypatch.setattr(source, "CG_JITTER_MS", 0)
+    ok = MagicMock(status_code=200, headers={})
+    ok.json.return_value = {"ok": True}
+
+    def _get(*_args: t.Any, **_kwargs: t.Any) -> MagicMock:
+        if mock_session.get.call_count == 1:
+            time.sleep(0.2)
+        return ok
+
+    mock_session.get.side_effect = _get
+    with ledger.counting() as calls:
+        assert source._get_json("https://hedge.test/") == {"ok": True}
+    assert calls.to_dict() == {"hedge.test": 2}
@@ -1,5 +1,6 @@
 """Tests for DexScreener adapter."""
 
+import json
 from unittest.mock import Mock, patch
 
 from backend.adapters.dexscreener import DexScreenerAdapter
@@ -53,23 +54,25 @@ class TestDexScreenerAdapter:
         """Test _query_dexscreener with successful API response."""
         adapter = DexScreenerAdapter()
 
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "pairs": [
-                {
-                    "baseToken": {
-                        "address": "0x123",
-                        "symbol": "TEST",
-                        "name": "Test Token",
+        mock_response = Mock(status_code=200, headers={})
+        mock_response.text = json.dumps(
+            {
+                "pairs": [
+                    {
+                        "baseToken": {
+                            "address": "0x123",
+                            "symbol": "TEST",
+                            "name": "Test Token",
+                        },
+                        "volume": {"h24": 1000},
+                        "pairUrl": "https://example.com/pair",
+                        "chainId": "ethereum",
+                        "dexId": "uniswap",
+                        "pairAddress": "0xpair",
                     },
-                    "volume": {"h24": 1000},
-                    "pairUrl": "https://example.com/pair",
-                    "chainId": "ethereum",
-                    "dexId": "uniswap",
-                    "pairAddress": "0xpair",
-                },
-            ],
-        }
+                ],
+            },
+        )
         mock_response.raise_for_status.return_value = None
 
         with patch("httpx.Client") as mock_client:
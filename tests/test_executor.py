@@ -0,0 +1,232 @@
+"""Tests for offloading blocking refresh work."""
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+import typing as t
+
+import pytest
+
+import backend.api.routes.refresh as refresh_module
+from backend import deadline, executor, jobs, ledger
+from backend.adapters.coingecko import HOST as CG_HOST
+from backend.adapters.dexscreener import HOST as DS_HOST
+
+
+def _thread_name() -> str:
+    return threading.current_thread().name
+
+
+def test_run_blocking_inline(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test inline mode runs on the event loop thread.
+
+    :param monkeypatch: Pytest fixture for patching.
+    """
+    monkeypatch.setattr(executor, "REFRESH_EXECUTOR", "inline")
+    name = asyncio.run(executor.run_blocking(_thread_name))
+    assert name == threading.current_thread().name
+
+
+@pytest.mark.usefixtures("executor_pools")
+def test_run_blocking_thread(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test thread mode runs on a refresh worker thread.
+
+    :param monkeypatch: Pytest fixture for patching.
+    """
+    monkeypatch.setattr(executor, "REFRESH_EXECUTOR", "thread")
+    assert not executor.process_pool_enabled()
+    name = asyncio.run(executor.run_blocking(_thread_name))
+    assert name.startswith("refresh")
+    # the pool is reused
+    assert executor._thread_pool() is executor._thread_pool()
+
+
+@pytest.mark.usefixtures("executor_pools")
+def test_run_in_process(
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test process mode runs work in another process.
+
+    :param monkeypatch: Pytest fixture for patching.
+    :param caplog: Pytest fixture for capturing logs.
+    """
+    monkeypatch.setattr(executor, "REFRESH_EXECUTOR", "process")
+    assert executor.process_pool_enabled()
+    with caplog.at_level(logging.WARNING, logger="backend.executor"):
+        assert executor.run_in_process(os.getpid) != os.getpid()
+    # limits and caches are not shared with the workers
+    assert "per worker process" in caplog.text
+    executor.shutdown_executors()
+    assert executor._processes is None
+
+
+def test_fetch_parents_counts_worker_calls(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test calls made in a worker process are added to the budget.
+
+    :param monkeypatch: Pytest fixture for patching.
+    """
+    monkeypatch.setattr(executor, "REFRESH_EXECUTOR", "process")
+    monkeypatch.setattr(
+        refresh_module,
+        "run_in_process",
+        lambda _fn, *_args: ([{"parent": "p"}], {CG_HOST: 3}),
+    )
+    with ledger.counting() as calls:
+        items = refresh_module._fetch_parents("dogs", ["dog"], "real_cg")
+    assert items == [{"parent": "p"}]
+    assert calls.get(CG_HOST) == 3
+
+
+def test_fetch_in_worker_reports_calls(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the worker function returns items and its call delta.
+
+    :param monkeypatch: Pytest fixture for patching.
+    """
+
+    def _fake(_narrative: str, _terms: list[str], _mode: str) -> list[dict]:
+        ledger.record_call(CG_HOST)
+        ledger.record_call(DS_HOST)
+        return [{"parent": "p"}]
+
+    monkeypatch.setattr(refresh_module, "_process_narrative_real_mode", _fake)
+    with ledger.counting() as outer:
+        items, calls = refresh_module._fetch_in_worker("dogs", ["dog"], "real")
+    assert items == [{"parent": "p"}]
+    assert calls == {CG_HOST: 1, DS_HOST: 1}
+    # the worker's calls are reported, not counted twice
+    assert outer.total == 0
+
+
+@pytest.mark.usefixtures("executor_pools")
+def test_job_runs_on_worker_thread(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a refresh job runs off the loop and reports progress.
+
+    :param monkeypatch: Pytest fixture for patching.
+    """
+    monkeypatch.setattr(executor, "REFRESH_EXECUTOR", "thread")
+    seen: list[str] = []
+    monkeypatch.setattr(
+        refresh_module,
+        "refresh_all",
+        lambda _narratives: seen.append(_thread_name()),
+    )
+
+    async def _main() -> str:
+        job = await refresh_module.start_or_get_job()
+        record = jobs.get_job(job["id"])
+        while record is not None and record["state"] == "running":
+            await asyncio.sleep(0.01)
+            record = jobs.get_job(job["id"])
+        return job["id"]
+
+    job = jobs.get_job(asyncio.run(_main()))
+    assert job is not None
+    assert job["state"] == "done"
+    assert seen and seen[0].startswith("refresh")
+
+
+@pytest.mark.usefixtures("executor_pools")
+def test_fan_out_runs_calls_concurrently() -> None:
+    """Test fan-out waits for the slowest call, not the sum."""
+
+    # each call only returns once both are in flight
+    together = threading.Barrier(2, timeout=5)
+
+    def _slow(value: int) -> t.Callable[[], int]:
+        def _call() -> int:
+            together.wait()
+            return value
+
+        return _call
+
+    results = executor.fan_out(
+        {"a": _slow(1), "b": _slow(2)},
+        {"a": 10, "b": 10},
+    )
+    assert results == {"a": 1, "b": 2}
+
+
+@pytest.mark.usefixtures("executor_pools")
+def test_map_concurrent_keeps_order_and_errors() -> None:
+    """Test calls overlap and results, errors included, keep order."""
+
+    together = threading.Barrier(3, timeout=5)
+
+    def _call(value: int) -> int:
+        together.wait()
+        if value < 0:
+            raise ValueError("negative")
+        return value
+
+    results = executor.map_concurrent(_call, [3, -1, 2])
+    assert results[0] == 3 and results[2] == 2
+    assert isinstance(results[1], ValueError)
+
+    ctx = contextvars.copy_context()
+    ctx.run(jobs._CURRENT_JOB.set, "map-job")
+    assert ctx.run(
+        executor.map_concurrent,
+        lambda _: jobs._CURRENT_JOB.get(),
+        [0],
+    ) == ["map-job"]
+
+
+@pytest.mark.usefixtures("executor_pools")
+def test_fan_out_collects_errors_and_timeouts() -> None:
+    """Test failing and slow calls yield exceptions, not results."""
+    release = threading.Event()
+
+    def _boom() -> int:
+        raise ValueError("boom")
+
+    results = executor.fan_out(
+        {"ok": lambda: 1, "bad": _boom, "slow": release.wait},
+        {"ok": 1, "bad": 1, "slow": 0.05},
+    )
+    release.set()
+    assert results["ok"] == 1
+    assert isinstance(results["bad"], ValueError)
+    assert isinstance(results["slow"], TimeoutError)
+
+
+@pytest.mark.usefixtures("executor_pools")
+def test_fan_out_stops_abandoned_calls() -> None:
+    """Test a timed-out call runs out of deadline and stops."""
+    stopped = threading.Event()
+
+    def _poll() -> None:
+        # like a provider fetch: retry while the deadline allows
+        while deadline.bounded(0.01) > 0:
+            time.sleep(0.01)
+        stopped.set()
+
+    results = executor.fan_out({"slow": _poll}, {"slow": 0.05})
+    assert isinstance(results["slow"], TimeoutError)
+    assert stopped.wait(5)
+
+
+@pytest.mark.usefixtures("executor_pools")
+def test_fan_out_propagates_cancellation(
+    running_job: t.Callable[..., str],
+) -> None:
+    """Test calls see the caller's job and cancellation is re-raised.
+
+    :param running_job: Pytest fixture registering a running job.
+    """
+    jobs.cancel_job(running_job("fan-job"))
+
+    def _call() -> None:
+        executor.fan_out({"a": jobs.checkpoint}, {"a": 1})
+
+    ctx = contextvars.copy_context()
+    ctx.run(jobs._CURRENT_JOB.set, "fan-job")
+    with pytest.raises(jobs.JobCancelled):
+        ctx.run(_call)
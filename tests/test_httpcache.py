@@ -0,0 +1,121 @@
+"""Tests for conditional provider requests and the HTTP cache."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from backend.adapters import breaker, source
+from backend.adapters.httpcache import HttpCache
+
+
+def _response(status: int, body: object = None, **headers: str) -> Mock:
+    response = Mock(status_code=status, headers=headers)
+    response.json.return_value = body
+    return response
+
+
+def test_cache_keeps_validated_responses_only() -> None:
+    """Test only responses with validators are kept."""
+    cache = HttpCache()
+    assert cache.resolve("u", {"q": 1}, _response(200, [1])) == [1]
+    assert not cache.request_headers("u", {"q": 1})
+
+    cache.resolve("u", {"q": 1}, _response(200, [2], ETag='"v2"'))
+    cache.resolve(
+        "u",
+        {"q": 2},
+        _response(200, [3], **{"Last-Modified": "Mon"}),
+    )
+    assert cache.request_headers("u", {"q": "1"}) == {"If-None-Match": '"v2"'}
+    assert cache.request_headers("u", {"q": 2}) == {
+        "If-Modified-Since": "Mon",
+    }
+
+    # a response without validators replaces a cached one
+    cache.resolve("u", {"q": 1}, _response(200, [4]))
+    assert not cache.request_headers("u", {"q": 1})
+
+
+def test_not_modified_reuses_parsed_body() -> None:
+    """Test a 304 returns the cached body, parsed only once."""
+    cache = HttpCache()
+    first = _response(200, {"pairs": []}, ETag="e")
+    cache.resolve("u", None, first)
+    assert cache.resolve("u", None, _response(304)) == {"pairs": []}
+    first.json.assert_called_once()
+
+    with pytest.raises(KeyError):
+        cache.resolve("other", None, _response(304))
+
+
+def test_not_modified_waits_for_body_being_parsed() -> None:
+    """Test a 304 racing the 200 still parsing does not parse again."""
+    cache = HttpCache()
+    parsing = threading.Event()
+    release = threading.Event()
+    first = _response(200, ETag="e")
+
+    def _json() -> dict:
+        parsing.set()
+        release.wait(5)
+        return {"pairs": []}
+
+    first.json.side_effect = _json
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        full = pool.submit(cache.resolve, "u", None, first)
+        assert parsing.wait(5)
+        cached = pool.submit(cache.resolve, "u", None, _response(304))
+        release.set()
+        assert full.result() == cached.result() == {"pairs": []}
+    first.json.assert_called_once()
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    """Test the cache holds at most max_entries responses."""
+    cache = HttpCache(max_entries=2)
+    for url in ("a", "b"):
+        cache.resolve(url, None, _response(200, url, ETag=url))
+    cache.resolve("a", None, _response(304))
+    cache.resolve("c", None, _response(200, "c", ETag="c"))
+    assert cache.request_headers("a", None)
+    assert not cache.request_headers("b", None)
+    cache.clear()
+    assert not cache.request_headers("a", None)
+
+
+@patch("backend.adapters.source.sess")
+@patch("time.sleep")
+def test_get_json_sends_conditional_requests(
+    _mock_sleep: MagicMock,
+    mock_session: MagicMock,
+) -> None:
+    """Test _get_json revalidates cached responses.
+
+    :param _mock_sleep: Mock for time.sleep function.
+    :param mock_session: Mock for the requests session.
+    """
+    mock_session.get.side_effect = [
+        _response(200, {"coins": [1]}, ETag="e1"),
+        _response(304),
+    ]
+    url = "https://etag.test/search"
+    assert source._get_json(url, {"query": "dog"}) == {"coins": [1]}
+    assert source._get_json(url, {"query": "dog"}) == {"coins": [1]}
+    second = mock_session.get.call_args_list[1]
+    assert second.kwargs["headers"] == {"If-None-Match": "e1"}
+
+
+def test_httpx_get_json_sends_conditional_requests() -> None:
+    """Test the httpx helper revalidates cached responses."""
+    with patch("httpx.Client") as mock_client:
+        get = mock_client.return_value.__enter__.return_value.get
+        get.side_effect = [
+            _response(200, {"pairs": [1]}, ETag="d1"),
+            _response(304),
+        ]
+        url = "https://etag-httpx.test/search"
+        assert breaker.httpx_get_json(url, {"q": "dog"}) == {"pairs": [1]}
+        assert breaker.httpx_get_json(url, {"q": "dog"}) == {"pairs": [1]}
+    assert get.call_args_list[1].kwargs["headers"] == {"If-None-Match": "d1"}
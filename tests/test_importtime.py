@@ -0,0 +1,19 @@
+"""Tests for lazily loaded provider clients."""
+
+import subprocess
+import sys
+
+
+def test_app_import_does_not_load_provider_clients() -> None:
+    """Test importing the app leaves requests and httpx unloaded."""
+    code = (
+        "import sys, backend.main; "
+        "print(sorted({'requests', 'httpx'} & set(sys.modules)))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert out.stdout.strip() == "[]"
@@ -0,0 +1,295 @@
+"""Tests for the background job registry and queue."""
+
+import asyncio
+import os
+import typing as t
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import delete
+
+from backend import jobs
+from backend.db import SessionLocal
+from backend.models import RefreshJob
+
+
+def _known(record: dict[str, t.Any] | None) -> dict[str, t.Any]:
+    assert record is not None
+    return record
+
+
+def _runner(log: list[str]) -> jobs.Runner:
+    async def _run(jid: str) -> None:
+        log.append(jid)
+
+    return _run
+
+
+def test_queue_runs_one_job_at_a_time_by_priority() -> None:
+    """Test queued jobs wait for the running slot and run by priority."""
+    ran: list[str] = []
+
+    async def _main() -> list[str]:
+        first = jobs.submit_job(_runner(ran))
+        low = jobs.submit_job(_runner(ran), priority=0)
+        high = jobs.submit_job(_runner(ran), priority=5)
+        assert first["state"] == "running"
+        assert low["state"] == "queued"
+        assert jobs.queued_job_ids() == [high["id"], low["id"]]
+        while len(ran) < 3:
+            await asyncio.sleep(0)
+        return [first["id"], high["id"], low["id"]]
+
+    expected = asyncio.run(_main())
+    assert ran == expected
+    assert [j["state"] for j in jobs.list_jobs()] == ["done"] * 3
+    assert _known(jobs.last_finished_job())["id"] == expected[-1]
+    assert jobs.last_success_ts() > 0
+
+
+@pytest.mark.parametrize("exc", [RuntimeError, ValueError, OSError])
+def test_failed_runner_marks_error(exc: type[Exception]) -> None:
+    """Test a runner raising an expected exception fails its job.
+
+    :param exc: Exception type raised by the runner.
+    """
+
+    async def _boom(_jid: str) -> None:
+        raise exc("boom")
+
+    async def _main() -> str:
+        jid = jobs.submit_job(_boom)["id"]
+        await asyncio.sleep(0)
+        return jid
+
+    job = jobs.get_job(asyncio.run(_main()))
+    assert job is not None
+    assert job["state"] == "error"
+    assert job["error"] == "boom"
+    assert jobs.last_success_ts() == 0.0
+
+
+def test_unexpected_error_frees_the_running_slot() -> None:
+    """Test any exception fails the job and the queue moves on."""
+    ran: list[str] = []
+
+    async def _boom(_jid: str) -> None:
+        raise KeyError("missing")
+
+    async def _main() -> tuple[str, str]:
+        failed = jobs.submit_job(_boom)["id"]
+        queued = jobs.submit_job(_runner(ran))["id"]
+        while not ran:
+            await asyncio.sleep(0)
+        return failed, queued
+
+    failed, queued = asyncio.run(_main())
+    job = jobs.get_job(failed)
+    assert job is not None
+    assert job["state"] == "error"
+    assert job["error"] == "'missing'"
+    assert ran == [queued]
+    assert not jobs._RUNNING
+
+
+def test_cancel_queued_and_running_jobs() -> None:
+    """Test queued jobs cancel at once and running jobs are flagged."""
+
+    async def _main() -> tuple[str, str]:
+        release = asyncio.Event()
+
+        async def _wait(_jid: str) -> None:
+            await release.wait()
+
+        running = jobs.submit_job(_wait)["id"]
+        queued = jobs.submit_job(_wait)["id"]
+        await asyncio.sleep(0)
+
+        assert _known(jobs.cancel_job(queued))["state"] == "cancelled"
+        assert jobs.queued_job_ids() == []
+        snap = _known(jobs.cancel_job(running))
+        assert snap["state"] == "running"
+        assert snap["cancelRequested"] is True
+        assert jobs.is_cancel_requested(running)
+        release.set()
+        await asyncio.sleep(0)
+        return running, queued
+
+    running, queued = asyncio.run(_main())
+    assert _known(jobs.get_job(running))["state"] == "done"
+    assert _known(jobs.get_job(queued))["state"] == "cancelled"
+    assert jobs.cancel_job("missing") is None
+    assert not jobs.is_cancel_requested("missing")
+
+
+def test_task_cancellation_marks_cancelled() -> None:
+    """Test cancelling the asyncio task records a cancelled job."""
+
+    async def _main() -> str:
+        async def _forever(_jid: str) -> None:
+            await asyncio.Event().wait()
+
+        jid = jobs.submit_job(_forever)["id"]
+        await asyncio.sleep(0)
+        for task in list(jobs._TASKS):
+            task.cancel()
+        await asyncio.sleep(0)
+        return jid
+
+    assert _known(jobs.get_job(asyncio.run(_main())))["state"] == "cancelled"
+
+
+def test_update_and_finish_job() -> None:
+    """Test progress updates stop once a job is finished."""
+    job = jobs._Job("j1", {"narrativesDone": 0})
+    jobs.JOBS[job.id] = job
+    jobs.update_job("j1", narrativesDone=1)
+    assert _known(jobs.get_job("j1"))["narrativesDone"] == 1
+
+    done = jobs.finish_job("j1", "done", narrativesDone=2)
+    assert done is not None and done["state"] == "done"
+    jobs.update_job("j1", narrativesDone=3)
+    jobs.update_job("missing", narrativesDone=3)
+    # finishing twice keeps the first result
+    assert (
+        _known(jobs.finish_job("j1", "error", error="late"))["state"] == "done"
+    )
+    assert _known(jobs.get_job("j1"))["narrativesDone"] == 2
+    assert jobs.finish_job("missing", "done") is None
+
+
+def test_history_is_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test only the newest finished jobs are kept.
+
+    :param monkeypatch: Pytest fixture for patching.
+    """
+    monkeypatch.setattr(jobs, "JOBS_HISTORY", 2)
+    for jid in ("a", "b", "c"):
+        jobs.JOBS[jid] = jobs._Job(jid)
+        jobs.finish_job(jid, "done")
+    assert sorted(jobs.JOBS) == ["b", "c"]
+    assert _known(jobs.last_finished_job())["id"] == "c"
+
+    # jobs dropped by gc no longer count as the last one
+    jobs.JOBS.pop("c")
+    assert _known(jobs.last_finished_job())["id"] == "b"
+    jobs.gc_jobs(max_age_sec=-1)
+    assert jobs.last_finished_job() is None
+
+
+def test_persisted_jobs_survive_restart(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test finished jobs are saved to and restored from the database.
+
+    :param monkeypatch: Pytest fixture for patching.
+    """
+    monkeypatch.setattr(jobs, "JOBS_PERSIST", True)
+    jobs.JOBS["persisted"] = jobs._Job("persisted", {"mode": "dev"}, 3)
+    jobs.update_job("persisted", narrativesDone=1)
+    jobs.finish_job("persisted", "error", error="boom")
+    jobs.flush_jobs()
+
+    # another worker only sees the database
+    jobs.clear_jobs()
+    loaded = jobs.get_job("persisted")
+    assert loaded is not None
+    assert loaded["state"] == "error"
+    assert loaded["narrativesDone"] == 1
+    assert jobs.get_job("unknown-job") is None
+
+    jobs.restore_jobs()
+    restored = jobs.last_finished_job()
+    assert restored is not None
+    assert restored["id"] == "persisted"
+    assert restored["priority"] == 3
+    assert restored["error"] == "boom"
+    assert restored["mode"] == "dev"
+    # restoring twice does not duplicate jobs
+    jobs.restore_jobs()
+    assert list(jobs.JOBS) == ["persisted"]
+
+
+def _persist_running(jid: str, owner: str) -> None:
+    job = jobs._Job(jid)
+    job.state = "running"
+    with patch.object(jobs, "_OWNER", owner):
+        jobs._persist(job)
+
+
+def test_restore_fails_only_orphaned_jobs(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test only jobs of stopped workers are errored on restore.
+
+    :param monkeypatch: Pytest fixture for patching.
+    """
+    monkeypatch.setattr(jobs, "JOBS_PERSIST", True)
+    ids = ["interrupted", "rebooted", "legacy", "elsewhere", "foreign"]
+    # a worker that exited, this worker before a restart, a row written
+    # before owners were recorded, and two workers still running
+    _persist_running("interrupted", "4194305:gone")
+    _persist_running("rebooted", f"{os.getpid()}:before")
+    _persist_running("legacy", "")
+    _persist_running("elsewhere", f"{os.getppid()}:live")
+    _persist_running("foreign", "1:other-user")
+    jobs.flush_jobs()
+
+    def _kill(pid: int, _signal: int) -> None:
+        if pid == 4194305:
+            raise ProcessLookupError(pid)
+        if pid == 1:
+            raise PermissionError(pid)
+
+    with patch("os.kill", side_effect=_kill):
+        jobs.restore_jobs()
+    restored = _known(jobs.get_job("interrupted"))
+    assert restored["state"] == "error"
+    assert restored["error"] == "interrupted by restart"
+    assert "owner" not in restored
+    jobs.clear_jobs()
+    states = {jid: _known(jobs.get_job(jid))["state"] for jid in ids}
+    assert states == {
+        "interrupted": "error",
+        "rebooted": "error",
+        "legacy": "error",
+        "elsewhere": "running",
+        "foreign": "running",
+    }
+    with SessionLocal() as s:
+        s.execute(delete(RefreshJob).where(RefreshJob.id.in_(ids)))
+        s.commit()
+
+
+def test_gc_prunes_persisted_jobs(
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test old finished job rows are pruned and write errors logged.
+
+    :param monkeypatch: Pytest fixture for patching.
+    :param caplog: Pytest fixture for capturing logs.
+    """
+    monkeypatch.setattr(jobs, "JOBS_PERSIST", True)
+    job = jobs._Job("old-job")
+    jobs.JOBS[job.id] = job
+    jobs.finish_job(job.id, "done")
+    job.ts -= 7200
+    jobs._persist(job)
+    jobs.gc_jobs(3600)
+    jobs.flush_jobs()
+    assert jobs.get_job("old-job") is None
+
+    def _fail() -> None:
+        raise OSError("disk full")
+
+    jobs._write(_fail)
+    jobs.flush_jobs()
+    assert "database write failed" in caplog.text
+
+
+def test_restore_jobs_disabled() -> None:
+    """Test restoring is a no-op without persistence."""
+    jobs.restore_jobs()
+    assert not jobs.JOBS
+    assert jobs.get_job("persisted") is None
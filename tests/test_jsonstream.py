@@ -0,0 +1,84 @@
+"""Tests for streaming parsing of provider search responses."""
+
+import json
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.adapters import source
+from backend.adapters.httpcache import HttpCache
+from backend.adapters.jsonstream import iter_array
+
+
+def test_iter_array_yields_member_items() -> None:
+    """Test only the named array's items are yielded, in order."""
+    text = ' { "a": {"pairs": [0]}, "pairs" : [ {"b": 1} , 2 ], "c": null } '
+    assert list(iter_array(text, "pairs")) == [{"b": 1}, 2]
+    assert not list(iter_array("{}", "pairs"))
+    assert not list(iter_array('{"pairs": []}', "pairs"))
+    assert not list(iter_array('{"pairs": null}', "pairs"))
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "[]", "{1: 2}", '{"pairs": [1 2]}', '{"pairs": [1]', '{"a" 1}'],
+)
+def test_iter_array_rejects_malformed_json(text: str) -> None:
+    """Test malformed bodies raise ValueError like ``json.loads``.
+
+    :param text: Response body text.
+    """
+    with pytest.raises(ValueError):
+        list(iter_array(text, "pairs"))
+
+
+def _pair(i: int, chain: str = "sol", vol: float | None = None) -> dict:
+    return {
+        "baseToken": {"address": f"A{i % 40}", "symbol": f"S{i}"},
+        "chainId": chain,
+        "volume": {"h24": vol if vol is not None else i % 17},
+        "liquidity": {"usd": i % 5},
+    }
+
+
+def _ranked(data: dict) -> list[tuple]:
+    with patch.object(source, "_get_json", return_value=data):
+        items = source.parents_for_dexscreener("n", ["term"])
+    return [(it["parent"], it["matches"], it["vol24h"]) for it in items]
+
+
+@patch("time.sleep")
+def test_streamed_search_ranks_like_full_parse(_mock_sleep: MagicMock) -> None:
+    """Test pruning while streaming does not change the ranking.
+
+    :param _mock_sleep: Mock for time.sleep function.
+    """
+    rng = random.Random(7)
+    pairs: list = [{"chainId": "sol"}, "junk"]
+    pairs += [_pair(i, rng.choice(["sol", "eth"])) for i in range(300)]
+    text = json.dumps({"schemaVersion": "1", "pairs": pairs})
+
+    streamed = source._parse_ds_search(text)
+    assert len(streamed["pairs"]) == source.DS_MAX_PARENTS
+    full = {"pairs": [p for p in pairs if isinstance(p, dict)]}
+    assert _ranked(streamed) == _ranked(full)
+
+
+def test_streamed_search_keeps_best_pair_per_key() -> None:
+    """Test only the highest-volume pair per key is kept."""
+    pairs = [_pair(0, vol=5), _pair(40, vol=9), _pair(80, vol=1)]
+    streamed = source._parse_ds_search(json.dumps({"pairs": pairs}))
+    assert streamed == {"pairs": [pairs[1]]}
+
+
+def test_cache_keys_parsed_bodies_by_parser() -> None:
+    """Test a body parsed by one parser is not served to another."""
+    cache = HttpCache()
+    response = MagicMock(status_code=200, headers={"ETag": "e"})
+    response.text = '{"pairs": [1, 2]}'
+    assert cache.resolve("u", None, response, source._parse_ds_search) == {
+        "pairs": [],
+    }
+    assert cache.request_headers("u", None, source._parse_ds_search)
+    assert not cache.request_headers("u", None)
@@ -0,0 +1,72 @@
+"""Tests for per-job provider call accounting."""
+
+import asyncio
+import contextvars
+import threading
+
+from backend import ledger
+from backend.executor import fan_out
+
+
+def test_ledger_counts_by_host_across_threads() -> None:
+    """Test calls from many threads are all counted, by host."""
+
+    def _calls() -> None:
+        for _ in range(100):
+            ledger.record_call("a.test")
+
+    with ledger.counting() as calls:
+        threads = [
+            threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(_calls,),
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        fan_out(
+            {name: lambda: ledger.record_call("b.test") for name in "xyz"},
+            dict.fromkeys("xyz", 5.0),
+        )
+        calls.merge({"b.test": 2})
+        assert ledger.calls_used() == 405
+    assert calls.to_dict() == {"a.test": 400, "b.test": 5}
+    assert calls.get("c.test") == 0
+    # the block's calls did not leak into the enclosing ledger
+    assert ledger.calls_used() == 0
+
+
+def test_ledgers_of_concurrent_tasks_are_separate() -> None:
+    """Test overlapping tasks each count only their own calls."""
+
+    async def _job(host: str, n: int) -> dict[str, int]:
+        own = ledger.begin()
+        for _ in range(n):
+            ledger.record_call(host)
+            await asyncio.sleep(0)
+        return own.to_dict()
+
+    async def _main() -> list[dict[str, int]]:
+        return list(
+            await asyncio.gather(_job("a.test", 3), _job("b.test", 5)),
+        )
+
+    assert asyncio.run(_main()) == [{"a.test": 3}, {"b.test": 5}]
+    assert ledger.calls_used() == 0
+
+
+def test_job_reports_calls_by_host(client) -> None:
+    """Test a job starts with an empty ledger and reports it.
+
+    :param client: Pytest fixture for test client.
+    """
+    # calls made outside of jobs do not count against them
+    ledger.record_call("outside.test")
+    job_id = client.post("/refresh/async?mode=dev").json()["jobId"]
+    status = client.get(f"/refresh/status/{job_id}").json()
+    assert status["calls_used"] == 0
+    assert status["callsByHost"] == {}
+    ledger.current().clear()
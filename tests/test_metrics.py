@@ -0,0 +1,243 @@
+"""Tests for the refresh pipeline and cache metrics."""
+
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, Mock, patch
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from backend import parents
+from backend.adapters import breaker, source
+from backend.adapters.httpcache import HttpCache
+from backend.adapters.ratelimit import AdaptiveLimiter
+
+
+def _count(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(f"{name}_count", labels) or 0.0
+
+
+def _total(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(f"{name}_total", labels) or 0.0
+
+
+def _response(status: int, body: object = None) -> Mock:
+    response = Mock(status_code=status, headers={})
+    response.json.return_value = body
+    return response
+
+
+@patch("backend.adapters.source.sess")
+@patch("time.sleep")
+def test_get_json_records_requests_and_retries(
+    _mock_sleep: MagicMock,
+    mock_session: MagicMock,
+) -> None:
+    """Test request latency by status and retry backoff are recorded.
+
+    :param _mock_sleep: Mock for time.sleep function.
+    :param mock_session: Mock for the requests session.
+    """
+    host = "metrics.test"
+    latency = "primecipher_provider_request_seconds"
+    before = {s: _count(latency, host=host, status=s) for s in ("503", "200")}
+    retries = _total(
+        "primecipher_provider_retries",
+        host=host,
+        reason="status",
+    )
+    backoffs = _count("primecipher_provider_backoff_seconds", host=host)
+    mock_session.get.side_effect = [_response(503), _response(200, [1])]
+
+    assert source._get_json(f"https://{host}/x") == [1]
+    for status in ("503", "200"):
+        assert _count(latency, host=host, status=status) == before[status] + 1
+    assert (
+        _total("primecipher_provider_retries", host=host, reason="status")
+        == retries + 1
+    )
+    assert (
+        _count("primecipher_provider_backoff_seconds", host=host)
+        == backoffs + 1
+    )
+
+
+def test_httpx_get_json_records_failed_requests() -> None:
+    """Test transport errors are recorded with the 'error' status."""
+    host = "metrics-httpx.test"
+    name = "primecipher_provider_request_seconds"
+    before = _count(name, host=host, status="error")
+    with patch("httpx.Client") as mock_client:
+        get = mock_client.return_value.__enter__.return_value.get
+        get.side_effect = httpx.ConnectError("down")
+        with pytest.raises(httpx.ConnectError):
+            breaker.httpx_get_json(f"https://{host}/x", {})
+    assert _count(name, host=host, status="error") == before + 1
+
+
+def test_limiter_records_waits() -> None:
+    """Test every token acquisition records its wait."""
+    limiter = AdaptiveLimiter("wait.test", 1000.0, 2)
+    limiter.acquire()
+    limiter.acquire()
+    assert _count("primecipher_limiter_wait_seconds", host="wait.test") == 2
+
+
+def test_compute_records_stages_and_narratives() -> None:
+    """Test a compute pass records each stage and narrative it runs."""
+    stage = "primecipher_refresh_stage_seconds"
+    narrative = "primecipher_refresh_narrative_seconds"
+    before = {s: _count(stage, stage=s) for s in ("seed_semantics", "scoring")}
+    mode = parents.Source().name
+    done = _count(narrative, mode=mode)
+
+    computed = parents.compute_all()
+    for s, count in before.items():
+        assert _count(stage, stage=s) == count + len(computed)
+    assert _count(narrative, mode=mode) == done + len(computed)
+
+    merges = _count(stage, stage="merge")
+    source._merge_parents([], [])
+    assert _count(stage, stage="merge") == merges + 1
+
+
+def test_raw_and_search_caches_record_lookups() -> None:
+    """Test cache hits, misses and expiries are counted by provider."""
+    events = "primecipher_cache_events"
+    key = ("metrics", ("term",))
+    before = {
+        e: _total(events, cache="raw", provider="metrics", event=e)
+        for e in ("hit", "miss", "expired")
+    }
+    assert source._memo_raw("metrics", ["term"], lambda: [{"a": 1}])
+    assert source._memo_raw("metrics", ["Term "], list) == [{"a": 1}]
+    with patch.object(source, "_now", return_value=1e12):
+        assert source._get_raw_cached(key) is None
+    for event in ("hit", "miss", "expired"):
+        assert (
+            _total(events, cache="raw", provider="metrics", event=event)
+            == before[event] + 1
+        )
+    # sizes are reported on scrape
+    assert (
+        REGISTRY.get_sample_value(
+            "primecipher_cache_entries",
+            {"cache": "raw", "provider": "metrics"},
+        )
+        == 1
+    )
+    assert REGISTRY.get_sample_value(
+        "primecipher_cache_bytes",
+        {"cache": "raw", "provider": "metrics"},
+    ) == len('[{"a":1}]')
+    # entries stored directly are measured when first reported
+    source._raw_cache[("metrics", ("other",))] = (0.0, [])
+    assert ("raw", "metrics", 2, 11) in source._cache_sizes()
+    # a replaced value is measured again, without serializing on store
+    with patch.object(source, "_approx_bytes", return_value=0) as measure:
+        source._set_raw_cached(key, [{"a": 12}])
+        measure.assert_not_called()
+        source._raw_cache[("metrics", ("other",))] = (0.0, [])
+        assert ("raw", "metrics", 2, 0) in source._cache_sizes()
+    del source._raw_cache[key]
+    del source._raw_cache[("metrics", ("other",))]
+
+    search = {"cache": "search", "provider": "coingecko"}
+    hits = _total(events, **search, event="hit")
+    source.clear_search_cache()
+    source._set_search_cached("metrics", ["x"])
+    assert source._get_search_cached("METRICS") == ["x"]
+    assert _total(events, **search, event="hit") == hits + 1
+    assert REGISTRY.get_sample_value("primecipher_cache_entries", search) == 1
+    source.clear_search_cache()
+
+
+def test_cache_sizes_while_entries_are_stored() -> None:
+    """Test scrapes do not fail while refresh threads store entries."""
+    keys = [("metrics", (str(i),)) for i in range(2000)]
+    stop = threading.Event()
+
+    def _store() -> None:
+        while not stop.is_set():
+            # a few stores at a time, each one mid-scrape
+            for key in keys[::50]:
+                source._set_raw_cached(key, [{"a": 1}])
+                time.sleep(0)
+
+    for key in keys:
+        source._set_raw_cached(key, [{"a": 1}])
+    writer = threading.Thread(target=_store)
+    interval = sys.getswitchinterval()
+    # switch threads often so a scrape overlaps the stores
+    sys.setswitchinterval(1e-6)
+    writer.start()
+    try:
+        for _ in range(50):
+            source._cache_sizes()
+    finally:
+        stop.set()
+        writer.join()
+        sys.setswitchinterval(interval)
+    assert (
+        "raw",
+        "metrics",
+        len(keys),
+        9 * len(keys),
+    ) in source._cache_sizes()
+    for key in keys:
+        del source._raw_cache[key]
+    source._cache_sizes()
+    assert not set(keys) & set(source._raw_bytes)
+
+
+def test_http_cache_records_lookups_and_evictions() -> None:
+    """Test the HTTP cache counts revalidations and evictions per host."""
+    cache = HttpCache(max_entries=1)
+    labels = {"cache": "http", "provider": "cache.test"}
+    events = "primecipher_cache_events"
+    before = {
+        e: _total(events, **labels, event=e)
+        for e in ("hit", "miss", "expired", "eviction")
+    }
+    first = _response(200, [1])
+    first.headers = {"ETag": "a"}
+    first.content = b"[1]"
+    cache.resolve("https://cache.test/a", None, first)
+    cache.resolve("https://cache.test/a", None, _response(304))
+    cache.resolve("https://cache.test/a", None, first)
+    cache.resolve("https://cache.test/b", None, first)
+    for event, count in (
+        ("hit", 1),
+        ("miss", 2),
+        ("expired", 1),
+        ("eviction", 1),
+    ):
+        assert _total(events, **labels, event=event) == before[event] + count
+    assert cache.sizes() == [("http", "cache.test", 1, 3)]
+
+
+def test_debug_caches_requires_token(client, monkeypatch) -> None:
+    """Test the cache report is served behind the refresh token.
+
+    :param client: Pytest fixture for test client.
+    :param monkeypatch: Pytest fixture for patching.
+    """
+    monkeypatch.setenv("REFRESH_TOKEN", "s3cr3t")
+    assert client.get("/debug/caches").status_code == 401
+
+    source._set_search_cached("report", ["x"])
+    source._get_search_cached("report")
+    r = client.get(
+        "/debug/caches",
+        headers={"Authorization": "Bearer s3cr3t"},
+    )
+    source.clear_search_cache()
+    assert r.status_code == 200
+    body = r.json()
+    assert body["ttl"] == {"raw": source.TTL_SEC, "search": 900}
+    row = body["caches"]["search"]["coingecko"]
+    assert row["entries"] == 1
+    assert row["hit"] >= 1
+    assert 0 < row["hitRatio"] <= 1
@@ -0,0 +1,172 @@
+"""Tests for budget-aware refresh planning."""
+
+import time
+import typing as t
+from unittest.mock import patch
+
+from backend import ledger, planner, storage
+from backend.adapters import source
+from backend.api.routes import refresh as refresh_module
+
+_TERMS = ["dog", "wif", "bonk", "shiba"]
+
+
+def _narrative(name: str, weight: float = 1.0) -> dict[str, t.Any]:
+    return {"name": name, "terms": list(_TERMS), "weight": weight}
+
+
+def test_estimate_calls_per_mode() -> None:
+    """Test the estimated calls of each mode with empty caches."""
+    with (
+        patch.dict(source._raw_cache, clear=True),
+        patch.dict(
+            source._search_cache,
+            clear=True,
+        ),
+    ):
+        assert planner.estimate_calls("real_ds", _TERMS) == 3
+        assert planner.estimate_calls("real_cg", _TERMS) == 3
+        assert planner.estimate_calls("blend", _TERMS) == 6
+        assert planner.estimate_calls("real", _TERMS) == 3
+        assert planner.estimate_calls("real_mix", _TERMS) == 7
+        assert planner.estimate_calls("real_mix", []) == 0
+        assert planner.estimate_calls("real_cg", ["fun"]) == 0
+        assert planner.estimate_calls("dev", _TERMS) == 0
+
+
+def test_estimate_calls_uses_caches() -> None:
+    """Test cached searches and raw results cost nothing."""
+    now = source._now()
+    with (
+        patch.dict(source._raw_cache, clear=True),
+        patch.dict(
+            source._search_cache,
+            clear=True,
+        ),
+    ):
+        source._search_cache["dog"] = (now, ["doge"])
+        # stale entries are fetched again
+        source._search_cache["wif"] = (now - 10**6, ["wif"])
+        assert planner.estimate_calls("real_cg", _TERMS) == 2
+
+        key = source._normalize_terms(_TERMS)
+        source._raw_cache[("coingecko", key)] = (now, [])
+        assert planner.estimate_calls("real_cg", _TERMS) == 0
+        assert planner.estimate_calls("blend", _TERMS) == 3
+        source._raw_cache[("blend", key)] = (now, [])
+        assert planner.estimate_calls("blend", _TERMS) == 0
+
+
+def test_staleness_in_ttls() -> None:
+    """Test staleness is the age since the last refresh in TTLs."""
+    now = time.time()
+    with patch.dict(storage._metadata, clear=True):
+        assert planner.staleness("dogs", now) is None
+        storage._metadata["dogs"] = {"computedAt": now - planner.TTL_SEC}
+        assert planner.staleness("dogs", now) == 1.0
+        age = planner.staleness("dogs")
+        assert age is not None and age >= 1.0
+
+
+def test_plan_ranks_and_fills_the_budget() -> None:
+    """Test narratives are ranked and skipped only when too expensive."""
+    now = time.time()
+    seeds = [
+        _narrative("fresh"),
+        _narrative("stale"),
+        _narrative("weighty", weight=3.0),
+        _narrative("new"),
+        {"name": "cheap", "terms": ["dog"]},
+    ]
+    with patch.dict(storage._metadata, clear=True):
+        storage._metadata["fresh"] = {"computedAt": now}
+        for name in ("stale", "weighty", "cheap"):
+            storage._metadata[name] = {"computedAt": now - planner.TTL_SEC}
+        plan = planner.make_plan(seeds, "real_ds", 7)
+
+    assert [s.narrative for s in plan.steps] == [
+        "new",
+        "weighty",
+        "stale",
+        "cheap",
+        "fresh",
+    ]
+    # "stale" would overrun the budget, "cheap" still fits
+    assert [s.narrative for s in plan.planned] == ["new", "weighty", "cheap"]
+    assert [s.narrative for s in plan.deferred] == ["stale", "fresh"]
+    doc = plan.to_dict()
+    assert (doc["cost"], doc["planned"], doc["deferred"]) == (7, 3, 2)
+    assert doc["steps"][0] == {
+        "narrative": "new",
+        "cost": 3,
+        "weight": 1.0,
+        "staleness": None,
+        "planned": True,
+    }
+
+
+def test_refresh_plan_dry_run(client) -> None:
+    """Test the plan preview of a provider refresh.
+
+    :param client: Pytest fixture for test client.
+    """
+    r = client.post(
+        "/refresh?dryRun=1&plan=1&mode=real_ds"
+        "&narratives=dogs&narratives=ai",
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert body["dryRun"] is True
+    doc = body["plan"]
+    assert doc["mode"] == "real_ds"
+    assert {s["narrative"] for s in doc["steps"]} == {"dogs", "ai"}
+    assert doc["budget"] == refresh_module.REFRESH_MAX_CALLS
+
+
+def test_provider_job_defers_what_the_budget_cannot_cover(client) -> None:
+    """Test a provider job runs the plan and reports the deferred rest.
+
+    :param client: Pytest fixture for test client.
+    """
+    with (
+        patch.object(refresh_module, "REFRESH_MAX_CALLS", 3),
+        patch.object(
+            refresh_module,
+            "_fetch_parents",
+            return_value=[],
+        ) as fetch,
+    ):
+        r = client.post(
+            "/refresh/async?mode=real_ds&narratives=dogs&narratives=ai",
+        )
+        status = client.get(f"/refresh/status/{r.json()['jobId']}").json()
+
+    assert fetch.call_count == 1
+    assert status["state"] == "done"
+    assert status["reason"] == "budget_exhausted"
+    assert status["narrativesDone"] == 1
+    assert status["errors"][-1]["code"] == "BUDGET_EXCEEDED"
+
+
+def test_provider_job_stops_when_estimates_fall_short(client) -> None:
+    """Test a job stops once real calls leave too little for the next.
+
+    :param client: Pytest fixture for test client.
+    """
+
+    def _fetch(*_: t.Any) -> list[dict]:
+        # retries cost more than the plan expected
+        ledger.current().add(source.DS_HOST, 5)
+        return []
+
+    with (
+        patch.object(refresh_module, "REFRESH_MAX_CALLS", 6),
+        patch.object(refresh_module, "_fetch_parents", side_effect=_fetch),
+    ):
+        r = client.post(
+            "/refresh/async?mode=real_ds&narratives=dogs&narratives=ai",
+        )
+        status = client.get(f"/refresh/status/{r.json()['jobId']}").json()
+
+    assert status["reason"] == "budget_exhausted"
+    assert status["narrativesDone"] == 1
@@ -0,0 +1,146 @@
+"""Tests for the sampling profiler and its endpoints."""
+
+import threading
+import time
+import typing as t
+from unittest.mock import patch
+
+from backend import profiler
+
+
+def _busy(stop: threading.Event) -> None:
+    while not stop.is_set():
+        time.sleep(0.001)
+
+
+def test_sampler_counts_stacks_of_watched_threads() -> None:
+    """Test samples are taken from watched threads only."""
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy, args=(stop,))
+    worker.start()
+    try:
+        sampler = profiler.Sampler(interval=0.5, threads=set())
+        sampler.sample()
+        assert not sampler.stacks
+        sampler.watch(t.cast(int, worker.ident))
+        sampler.sample()
+        sampler.sample()
+        sampler.unwatch(t.cast(int, worker.ident))
+        sampler.sample()
+    finally:
+        stop.set()
+        worker.join()
+
+    assert sum(sampler.stacks.values()) == 2
+    line = sampler.collapsed().splitlines()[0]
+    stack, count = line.rsplit(" ", 1)
+    assert count == "2"
+    assert "_busy (" in stack.split(";")[-1]
+
+    doc = sampler.speedscope("test")
+    (prof,) = doc["profiles"]
+    names = [f["name"] for f in doc["shared"]["frames"]]
+    assert names[prof["samples"][0][-1]] == "_busy"
+    assert prof["endValue"] == prof["weights"][0] == 1.0
+    sampler.clear()
+    assert sampler.collapsed() == ""
+
+
+def test_sampler_thread_samples_until_stopped() -> None:
+    """Test a started sampler records every thread but its own."""
+    sampler = profiler.Sampler(interval=0.001)
+    sampler.start()
+    sampler.start()
+    time.sleep(0.05)
+    sampler.stop()
+    assert not sampler.running
+    assert sampler.stacks
+    assert all(stack[-1][0] != "Sampler._run" for stack in sampler.stacks)
+    # watching has no effect when every thread is sampled
+    sampler.watch(1)
+    sampler.unwatch(1)
+    assert sampler.threads is None
+
+
+def test_profile_job_only_when_armed() -> None:
+    """Test only the job after arming is profiled, and few are kept."""
+    with profiler.profile_job("plain"):
+        pass
+    assert profiler.job_profile("plain") is None
+
+    with patch.object(profiler, "PROFILE_HISTORY", 1):
+        for jid in ("first", "second"):
+            profiler.arm_next_job()
+            assert profiler.next_job_armed()
+            with profiler.profile_job(jid):
+                sampler = profiler.job_profile(jid)
+                assert sampler is not None and sampler.running
+            assert not profiler.next_job_armed()
+    assert profiler.job_profile("first") is None
+    assert not t.cast(profiler.Sampler, profiler.job_profile("second")).running
+
+
+def test_profiled_handlers_watch_their_thread() -> None:
+    """Test handlers are sampled only while request profiling is on."""
+    seen: list[set[int] | None] = []
+
+    @profiler.profiled
+    def _handler(value: int) -> int:
+        seen.append(set(profiler.REQUESTS.threads or ()))
+        return value
+
+    assert _handler(1) == 1
+    profiler.set_request_profiling(True)
+    try:
+        assert _handler(2) == 2
+    finally:
+        profiler.set_request_profiling(False)
+    assert seen == [set(), {threading.get_ident()}]
+    assert not profiler.REQUESTS.threads
+
+
+def test_profile_endpoints(client, monkeypatch) -> None:
+    """Test the profile endpoints behind the refresh token.
+
+    :param client: Pytest fixture for test client.
+    :param monkeypatch: Pytest fixture for patching.
+    """
+    monkeypatch.setenv("REFRESH_TOKEN", "s3cr3t")
+    headers = {"Authorization": "Bearer s3cr3t"}
+    assert client.get("/debug/profile").status_code == 401
+
+    r = client.get("/debug/profile?seconds=0.05", headers=headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    r = client.get(
+        "/debug/profile?seconds=0.05&format=speedscope",
+        headers=headers,
+    )
+    assert r.json()["name"] == "window 0.05s"
+    assert client.get("/debug/profile?seconds=0", headers=headers).is_error
+
+    r = client.put("/debug/profile/requests?enabled=true", headers=headers)
+    assert r.json() == {"enabled": True}
+    try:
+        assert client.get("/heatmap").status_code == 200
+    finally:
+        client.put("/debug/profile/requests?enabled=false", headers=headers)
+    r = client.get("/debug/profile/requests", headers=headers)
+    assert r.status_code == 200
+
+    assert client.post(
+        "/debug/profile/next-job",
+        headers=headers,
+    ).json() == {"armed": True}
+    job_id = client.post(
+        "/refresh/async?mode=dev",
+        headers=headers,
+    ).json()["jobId"]
+    r = client.get(
+        f"/debug/profile/jobs/{job_id}?format=speedscope",
+        headers=headers,
+    )
+    assert r.status_code == 200
+    assert r.json()["name"] == f"job {job_id}"
+    r = client.get("/debug/profile/jobs/unknown", headers=headers)
+    assert r.status_code == 404
@@ -0,0 +1,155 @@
+"""Tests for the adaptive provider rate limiters."""
+
+import email.utils
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from prometheus_client import REGISTRY
+
+from backend.adapters import ratelimit, source
+from backend.adapters.ratelimit import AdaptiveLimiter, TokenBucket
+
+
+def _rate_metric(host: str) -> float | None:
+    return REGISTRY.get_sample_value(
+        "primecipher_rate_limit_rps",
+        {"host": host},
+    )
+
+
+def test_token_bucket_is_thread_safe() -> None:
+    """Test concurrent callers each reserve their own token."""
+    bucket = TokenBucket(rps=1000.0, burst=5)
+    with patch("time.sleep") as mock_sleep:
+        workers = [threading.Thread(target=bucket.acquire) for _ in range(5)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        mock_sleep.assert_not_called()
+        bucket.acquire()
+    mock_sleep.assert_called_once()
+    assert bucket.tokens < 0
+
+
+def test_success_increases_rate_up_to_max() -> None:
+    """Test each 2xx adds a step until the maximum rate."""
+    limiter = AdaptiveLimiter("up.test", 1.0, 1, min_rps=0.5, max_rps=1.5)
+    limiter.feedback(200, {})
+    assert limiter.rps == pytest.approx(1.05)
+    for _ in range(50):
+        limiter.feedback(200, {})
+    assert limiter.rps == 1.5
+    assert _rate_metric("up.test") == 1.5
+
+    # other statuses leave the rate alone
+    limiter.feedback(404, {})
+    assert limiter.rps == 1.5
+
+
+def test_429_halves_rate_and_pauses() -> None:
+    """Test a 429 halves the rate and honours Retry-After."""
+    limiter = AdaptiveLimiter("down.test", 1.0, 1)
+    limiter.feedback(429, {"Retry-After": "3"})
+    assert limiter.rps == 0.5
+    assert limiter.paused_until > time.monotonic() + 2
+
+    for _ in range(10):
+        limiter.feedback(429, {})
+    assert limiter.rps == limiter.min_rps == 0.125
+    assert _rate_metric("down.test") == 0.125
+
+
+def test_acquire_waits_out_pause() -> None:
+    """Test acquire sleeps until a provider pause is over."""
+    limiter = AdaptiveLimiter("pause.test", 1.0, 1)
+    limiter.paused_until = time.monotonic() + 5
+    with patch("time.sleep") as mock_sleep:
+        limiter.acquire()
+    assert mock_sleep.call_args_list[0].args[0] > 4
+
+
+@pytest.mark.parametrize(
+    "reset",
+    [
+        "60",
+        str(time.time() + 60),
+        email.utils.formatdate(time.time() + 60, usegmt=True),
+    ],
+)
+def test_exhausted_quota_pauses_until_reset(reset: str) -> None:
+    """Test Remaining: 0 holds callers until the window resets.
+
+    :param reset: Reset header as seconds, epoch or HTTP date.
+    """
+    limiter = AdaptiveLimiter("quota.test", 1.0, 1)
+    limiter.feedback(
+        200,
+        {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset},
+    )
+    assert limiter.paused_until > time.monotonic() + 30
+
+
+def test_remaining_quota_caps_rate() -> None:
+    """Test the rate never spends the quota faster than the window."""
+    limiter = AdaptiveLimiter("cap.test", 2.0, 1)
+    limiter.feedback(
+        200,
+        {"RateLimit-Remaining": "10", "RateLimit-Reset": "20"},
+    )
+    assert limiter.rps == 0.5
+
+    # plenty of quota: the rate is not capped
+    limiter.feedback(
+        200,
+        {"RateLimit-Remaining": "100", "RateLimit-Reset": "1"},
+    )
+    assert limiter.rps > 0.5
+
+
+def test_unparseable_headers_are_ignored() -> None:
+    """Test malformed rate-limit headers do not change the limiter."""
+    limiter = AdaptiveLimiter("bad.test", 1.0, 1)
+    limiter.feedback(
+        429,
+        {
+            "Retry-After": "soon",
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": "later",
+        },
+    )
+    assert limiter.paused_until == 0.0
+    assert limiter.rps == 0.5
+
+
+def test_limiter_per_host() -> None:
+    """Test hosts get their own limiter and CoinGecko its configured one."""
+    other = ratelimit.limiter_for("per-host.test")
+    assert ratelimit.limiter_for("per-host.test") is other
+    assert other.rps == ratelimit.RATE_DEFAULT_RPS
+    assert ratelimit.limiter_for(source.CG_HOST) is source._cg_limiter
+
+
+@patch("backend.adapters.source.sess")
+@patch("time.sleep")
+def test_get_json_feeds_back_responses(
+    _mock_sleep: MagicMock,
+    mock_session: MagicMock,
+) -> None:
+    """Test _get_json reports each response to the host's limiter.
+
+    :param _mock_sleep: Mock for time.sleep function.
+    :param mock_session: Mock for the requests session.
+    """
+    limited = MagicMock(status_code=429, headers={"Retry-After": "1"})
+    ok = MagicMock(status_code=200, headers={})
+    ok.json.return_value = {"ok": True}
+    mock_session.get.side_effect = [limited, ok]
+    limiter = ratelimit.register_limiter(
+        AdaptiveLimiter("feedback.test", 1.0, 1, min_rps=0.1, max_rps=1.0),
+    )
+
+    assert source._get_json("https://feedback.test/x") == {"ok": True}
+    assert limiter.rps == pytest.approx(0.545)
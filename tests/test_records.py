@@ -0,0 +1,72 @@
+"""Tests for compact parent records."""
+
+from backend.interning import coin_id, coin_url, interned
+from backend.parents import _with_scores
+from backend.records import ParentColumns, ParentRecord
+from backend.storage import get_parents, get_records, set_parents
+
+
+def test_record_round_trip_keeps_extra_keys() -> None:
+    """Test unknown keys survive and unset fields are left out."""
+    item = {"name": "Dog", "matches": 3, "vol24h": 1.5, "symbol": None}
+    record = ParentRecord.from_dict(item)
+    assert record.matches == 3
+    assert record.extra == {"name": "Dog"}
+    assert record.to_dict() == {"name": "Dog", "matches": 3, "vol24h": 1.5}
+
+
+def test_scoring_does_not_modify_stored_records() -> None:
+    """Test scores are set on copies of the shared stored records."""
+    set_parents("rec", [{"parent": "a", "matches": 1}])
+    scored = _with_scores(get_records("rec"))
+    assert scored[0].score == 0.0
+    assert get_records("rec")[0].score is None
+    assert get_parents("rec") == [{"parent": "a", "matches": 1}]
+
+
+def test_columns_round_trip_and_share_strings() -> None:
+    """Test columns rebuild records and keep each string once."""
+    records = [
+        ParentRecord(parent="a", matches=2, chain="sol", vol24h=1.5),
+        ParentRecord(
+            parent="b",
+            chain="sol",
+            sources=["dexscreener"],
+            children=[{"pair": "p"}],
+        ),
+    ]
+    cols = ParentColumns(records)
+    assert cols.records() == records
+    assert cols.strings == [None, "a", "sol", "b", "dexscreener"]
+    assert cols.match_counts() == [2, 0]
+    assert cols.number("vol24h", 1) == 0.0
+    assert cols.record(0, score=1.0).score == 1.0
+
+
+def test_columns_derive_coin_urls_and_share_sources() -> None:
+    """Test coin page URLs are stored as IDs and sources lists shared."""
+    records = [
+        ParentRecord(url=coin_url("dogwifhat"), sources=["a", "b"]),
+        ParentRecord(url=coin_url("bonk"), sources=["a", "b"]),
+        ParentRecord(url="https://dexscreener.com/solana/x", sources=[]),
+    ]
+    cols = ParentColumns(records)
+    assert cols.records() == records
+    assert cols.strings == [
+        None,
+        "dogwifhat",
+        "a\x1fb",
+        "bonk",
+        "https://dexscreener.com/solana/x",
+        "",
+    ]
+
+
+def test_coin_id_and_interned() -> None:
+    """Test only plain coin page URLs map back to an ID."""
+    assert coin_id(coin_url("bonk")) == "bonk"
+    assert coin_id(coin_url("")) is None
+    assert coin_id(coin_url("bonk?x=1")) is None
+    assert coin_id("https://example.com/bonk") is None
+    assert interned(None) is None
+    assert interned("".join(["sol", "ana"])) is interned("solana")
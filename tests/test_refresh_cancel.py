@@ -0,0 +1,163 @@
+"""Tests for cancelling refresh jobs."""
+
+import asyncio
+import contextvars
+import typing as t
+from unittest.mock import patch
+
+import pytest
+
+import backend.api.routes.refresh as refresh_module
+from backend import jobs, parents
+from backend.adapters import source
+from backend.seeds import list_narrative_names
+
+
+def _in_job(jid: str, fn: t.Callable[..., t.Any], *args: t.Any) -> t.Any:
+    # run fn as if it were the body of job jid
+    ctx = contextvars.copy_context()
+    ctx.run(jobs._CURRENT_JOB.set, jid)
+    return ctx.run(fn, *args)
+
+
+def test_checkpoint_outside_job_is_noop() -> None:
+    """Test checkpoints and sleeps outside of jobs behave normally."""
+    jobs.checkpoint()
+    with patch("time.sleep") as mock_sleep:
+        jobs.cancellable_sleep(1.5)
+    mock_sleep.assert_called_once_with(1.5)
+
+
+def test_cancellable_sleep_wakes_on_cancel(
+    running_job: t.Callable[..., str],
+) -> None:
+    """Test a sleeping job wakes up and stops once cancelled.
+
+    :param running_job: Pytest fixture registering a running job.
+    """
+    running_job("sleepy")
+    _in_job("sleepy", jobs.cancellable_sleep, 0)
+
+    jobs.cancel_job("sleepy")
+    with pytest.raises(jobs.JobCancelled):
+        _in_job("sleepy", jobs.cancellable_sleep, 30)
+
+
+def test_get_json_stops_before_provider_call(
+    running_job: t.Callable[..., str],
+) -> None:
+    """Test _get_json checks for cancellation before each call.
+
+    :param running_job: Pytest fixture registering a running job.
+    """
+    running_job("cg-job")
+    jobs.cancel_job("cg-job")
+    with (
+        patch.object(source._session(), "get") as mock_get,
+        pytest.raises(jobs.JobCancelled),
+    ):
+        _in_job("cg-job", source._get_json, "https://example.test")
+    mock_get.assert_not_called()
+
+
+def test_dev_job_cancelled_between_narratives(
+    monkeypatch: pytest.MonkeyPatch,
+    running_job: t.Callable[..., str],
+) -> None:
+    """Test a cancelled dev job keeps finished narratives and stops.
+
+    :param monkeypatch: Pytest fixture for patching.
+    :param running_job: Pytest fixture registering a running job.
+    """
+    processed: list[str] = []
+
+    def _process(narrative: str, job_id: str, **_kwargs: t.Any) -> tuple:
+        processed.append(narrative)
+        if len(processed) == 2:
+            jobs.cancel_job(job_id)
+        return True, None
+
+    monkeypatch.setattr(refresh_module, "_process_single_narrative", _process)
+    monkeypatch.setattr(refresh_module, "REFRESH_PER_NARRATIVE_CAP", 0)
+    running_job("dev-job")
+
+    _in_job(
+        "dev-job",
+        refresh_module._process_dev_mode_job,
+        "dev-job",
+        "dev",
+        "24h",
+        len(list_narrative_names()),
+    )
+
+    job = jobs.get_job("dev-job")
+    assert job is not None
+    assert job["state"] == "cancelled"
+    assert job["reason"] == "cancelled"
+    assert job["narrativesDone"] == 2
+    assert processed == list_narrative_names()[:2]
+
+
+def test_refresh_all_keeps_finished_narratives(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test refresh_all writes each narrative before checking to stop.
+
+    :param monkeypatch: Pytest fixture for patching.
+    """
+    names = list_narrative_names()
+    calls: list[None] = []
+
+    def _checkpoint() -> None:
+        calls.append(None)
+        if len(calls) == 2:
+            raise jobs.JobCancelled("prod-job")
+
+    monkeypatch.setattr(parents, "checkpoint", _checkpoint)
+    with (
+        patch.object(parents, "set_parents") as mock_set,
+        pytest.raises(jobs.JobCancelled),
+    ):
+        parents.refresh_all(names[:3])
+    assert [c.args[0] for c in mock_set.call_args_list] == [names[0]]
+
+
+def test_prod_job_cancelled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a prod job stopped at a checkpoint ends up cancelled.
+
+    :param monkeypatch: Pytest fixture for patching.
+    """
+
+    def _refresh_all(_narratives: list[str] | None) -> None:
+        raise jobs.JobCancelled("stopped")
+
+    monkeypatch.setattr(refresh_module, "refresh_all", _refresh_all)
+    job = asyncio.run(refresh_module.start_or_get_job())
+    cancelled = jobs.get_job(job["id"])
+    assert cancelled is not None and cancelled["state"] == "cancelled"
+
+
+def test_cancel_endpoint(
+    client: t.Any,
+    running_job: t.Callable[..., str],
+) -> None:
+    """Test DELETE /refresh/{job_id} for running, queued and unknown jobs.
+
+    :param client: Pytest fixture for test client.
+    :param running_job: Pytest fixture registering a running job.
+    """
+    running_job("running-job", holds_slot=True, narratives=["dogs"])
+    queued_id = client.post("/refresh/async").json()["jobId"]
+
+    r = client.delete(f"/refresh/{queued_id}")
+    assert r.status_code == 200
+    assert r.json()["state"] == "cancelled"
+
+    r = client.delete("/refresh/running-job")
+    assert r.status_code == 200
+    assert r.json()["state"] == "running"
+    assert r.json()["cancelRequested"] is True
+
+    r = client.delete("/refresh/nope")
+    assert r.status_code == 404
+    assert r.json()["ok"] is False
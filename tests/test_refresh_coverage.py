@@ -1,7 +1,9 @@
 """Additional tests to improve coverage for refresh.py."""
 
+import typing as t
 from unittest.mock import MagicMock, Mock, patch
 
+from backend import jobs
 from backend.adapters import NoopAdapter
 from backend.api.routes.refresh import (
     _process_dev_mode_job,
@@ -111,17 +113,17 @@ def test_process_dev_mode_job_real_cg_mode_coverage() -> None:
         mock_update.assert_called_once()
 
 
-def test_process_narrative_real_cg_coverage() -> None:
-    """Test _process_narrative_real_cg to improve coverage."""
+def test_process_narrative_real_cg_coverage(
+    running_job: t.Callable[..., str],
+) -> None:
+    """Test _process_narrative_real_cg to improve coverage.
+
+    :param running_job: Pytest fixture registering a running job.
+    """
     from backend.api.routes.refresh import _process_narrative_real_cg
 
-    with (
-        patch("backend.adapters.get_adapter") as mock_get_adapter,
-        patch(
-            "backend.api.routes.refresh.current_running_job",
-            {"id": "test_job"},
-        ),
-    ):
+    running_job("test_job")
+    with patch("backend.adapters.get_adapter") as mock_get_adapter:
         mock_adapter = MagicMock()
         mock_adapter.fetch_parents.return_value = [{"name": "test_item"}]
         mock_get_adapter.return_value = mock_adapter
@@ -169,29 +171,33 @@ def test_create_completed_job_coverage() -> None:
     assert job["calls_used"] == 0  # Counter starts at 0
 
 
-def test_finalize_job_coverage() -> None:
-    """Test _finalize_job to improve coverage."""
+def test_finalize_job_coverage(
+    running_job: t.Callable[..., str],
+) -> None:
+    """Test _finalize_job to improve coverage.
+
+    :param running_job: Pytest fixture registering a running job.
+    """
     from backend.api.routes.refresh import _finalize_job
 
-    with (
-        patch("backend.api.routes.refresh.mark_refreshed") as mock_mark,
-        patch("backend.api.routes.refresh.current_running_job", None),
-        patch("backend.api.routes.refresh.last_completed_job", None),
-        patch("backend.api.routes.refresh.debounce_until", 0),
-        patch("backend.api.routes.refresh.last_success_at", 0),
-    ):
+    running_job("test_job")
+    with patch("backend.api.routes.refresh.mark_refreshed") as mock_mark:
         _finalize_job("test_job", "real_cg", "1h", 10, 5, [])
 
         mock_mark.assert_called_once()
+    job = jobs.get_job("test_job")
+    assert job is not None
+    assert job["state"] == "done"
+    assert job["narrativesDone"] == 5
 
 
 def test_process_narrative_real_cg_budget_exceeded_coverage() -> None:
     """Test _process_narrative_real_cg budget exceeded path for coverage."""
     from backend.api.routes.refresh import _process_narrative_real_cg
 
-    # Mock get_cg_calls_count to return high value to trigger budget exceeded
+    # Mock calls_used to return high value to trigger budget exceeded
     with patch(
-        "backend.api.routes.refresh.get_cg_calls_count",
+        "backend.ledger.calls_used",
     ) as mock_get_calls:
         mock_get_calls.return_value = 999999
 
@@ -303,9 +309,9 @@ def test_budget_exceeded_max_calls_coverage() -> None:
     """Test budget exceeded max calls for coverage."""
     from backend.api.routes.refresh import _check_budget_limits
 
-    # Mock get_cg_calls_count to return high value
+    # Mock calls_used to return high value
     with patch(
-        "backend.api.routes.refresh.get_cg_calls_count",
+        "backend.ledger.calls_used",
     ) as mock_get_calls:
         mock_get_calls.return_value = 999999
 
@@ -323,28 +329,22 @@ def test_budget_exceeded_max_calls_coverage() -> None:
             assert error["narrative"] == "*"
 
 
-def test_finalize_job_with_reason_coverage() -> None:
-    """Test _finalize_job with reason for coverage."""
+def test_finalize_job_with_reason_coverage(
+    running_job: t.Callable[..., str],
+) -> None:
+    """Test _finalize_job with reason for coverage.
+
+    :param running_job: Pytest fixture registering a running job.
+    """
     from backend.api.routes.refresh import _finalize_job
 
     with patch(
-        "backend.api.routes.refresh.get_cg_calls_count",
+        "backend.ledger.calls_used",
     ) as mock_get_calls:
         mock_get_calls.return_value = 0
 
-        with (
-            patch("backend.api.routes.refresh.current_running_job", None),
-            patch(
-                "backend.api.routes.refresh.last_completed_job",
-                None,
-            ),
-            patch("backend.api.routes.refresh.debounce_until", 0),
-            patch(
-                "backend.api.routes.refresh.last_success_at",
-                0,
-            ),
-            patch("backend.api.routes.refresh.mark_refreshed") as mock_mark,
-        ):
+        running_job("test_job")
+        with patch("backend.api.routes.refresh.mark_refreshed") as mock_mark:
             _finalize_job(
                 "test_job",
                 "real_cg",
@@ -355,20 +355,24 @@ def test_finalize_job_with_reason_coverage() -> None:
                 reason="test_reason",
             )
 
-            # Check that the global variable was set
-            from backend.api.routes.refresh import last_completed_job
-
-            assert last_completed_job is not None
-            assert last_completed_job["reason"] == "test_reason"
+            # Check that the finished job was recorded
+            last_job = jobs.last_finished_job()
+            assert last_job is not None
+            assert last_job["reason"] == "test_reason"
             mock_mark.assert_called_once()
 
 
-def test_budget_exceeded_finalize_job_coverage() -> None:
-    """Test budget exceeded finalize job for coverage."""
+def test_budget_exceeded_finalize_job_coverage(
+    running_job: t.Callable[..., str],
+) -> None:
+    """Test budget exceeded finalize job for coverage.
+
+    :param running_job: Pytest fixture registering a running job.
+    """
 
-    # Mock get_cg_calls_count to return high value
+    # Mock calls_used to return high value
     with patch(
-        "backend.api.routes.refresh.get_cg_calls_count",
+        "backend.ledger.calls_used",
     ) as mock_get_calls:
         mock_get_calls.return_value = 999999
 
@@ -384,44 +388,29 @@ def test_budget_exceeded_finalize_job_coverage() -> None:
         ):
             mock_list.return_value = ["narrative1", "narrative2"]
 
-            # Mock the job state
-            with patch(
-                "backend.api.routes.refresh.current_running_job",
-                {
-                    "id": "test_job",
-                    "state": "running",
-                    "ts": 0,
-                    "error": None,
-                    "jobId": "test_job",
-                    "mode": "real",
-                    "window": "1h",
-                    "narrativesTotal": 2,
-                    "narrativesDone": 0,
-                    "errors": [],
-                    "calls_used": 0,
-                },
-            ):
-                _process_dev_mode_job("test_job", "real", "1h", 2)
-
-                # Check that the job was finalized with budget_exhausted reason
-                from backend.api.routes.refresh import last_completed_job
-
-                assert last_completed_job is not None
-                assert last_completed_job["reason"] == "budget_exhausted"
-
-
-def test_process_narrative_blend_coverage() -> None:
-    """Test _process_narrative_blend to improve coverage."""
+            running_job("test_job")
+            _process_dev_mode_job("test_job", "real", "1h", 2)
+
+            # Check that the job was finalized with budget_exhausted reason
+            last_job = jobs.last_finished_job()
+            assert last_job is not None
+            assert last_job["reason"] == "budget_exhausted"
+
+
+def test_process_narrative_blend_coverage(
+    running_job: t.Callable[..., str],
+) -> None:
+    """Test _process_narrative_blend to improve coverage.
+
+    :param running_job: Pytest fixture registering a running job.
+    """
     with (
         patch(
-            "backend.api.routes.refresh.get_cg_calls_count",
+            "backend.ledger.calls_used",
         ) as mock_calls_count,
         patch("backend.adapters.get_adapter") as mock_get_adapter,
-        patch(
-            "backend.api.routes.refresh.current_running_job",
-            {"id": "test_job", "calls_used": 0},
-        ),
     ):
+        running_job("test_job")
         # Test successful blend mode processing
         mock_calls_count.return_value = 0
         mock_adapter = Mock()
@@ -466,7 +455,7 @@ def test_process_narrative_blend_memo_cache_coverage() -> None:
 def test_process_narrative_blend_budget_exceeded_coverage() -> None:
     """Test _process_narrative_blend with budget exceeded."""
     with patch(
-        "backend.api.routes.refresh.get_cg_calls_count",
+        "backend.ledger.calls_used",
     ) as mock_calls_count:
         # Set calls count to exceed budget (blend uses 2 calls)
         mock_calls_count.return_value = 999  # Exceeds REFRESH_MAX_CALLS
@@ -493,10 +482,6 @@ def test_process_dev_mode_job_blend_mode_coverage() -> None:
             "backend.api.routes.refresh._write_narrative_to_storage",
         ) as mock_write,
         patch("backend.api.routes.refresh._finalize_job") as mock_finalize,
-        patch(
-            "backend.api.routes.refresh.current_running_job",
-            {"id": "test_job"},
-        ),
     ):
         mock_process_blend.return_value = (True, [{"parent": "test_token"}])
 
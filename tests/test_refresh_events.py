@@ -0,0 +1,171 @@
+"""Tests for the refresh job event stream."""
+
+import asyncio
+import json
+import threading
+import time
+import typing as t
+
+import pytest
+
+import backend.api.routes.refresh as refresh_module
+from backend import broadcast, jobs
+
+
+def _events(lines: t.Iterable[str]) -> list[tuple[str, dict]]:
+    out = []
+    name = ""
+    for line in lines:
+        if line.startswith("event: "):
+            name = line.removeprefix("event: ")
+        elif line.startswith("data: "):
+            out.append((name, json.loads(line.removeprefix("data: "))))
+    return out
+
+
+def test_broadcaster_delivers_across_threads() -> None:
+    """Test events published from a thread reach matching watchers."""
+    channel = broadcast.Broadcaster()
+
+    async def _main() -> tuple[list, list]:
+        mine = channel.subscribe("a")
+        everything = channel.subscribe()
+        assert channel.has_watchers("b")
+
+        def _publish() -> None:
+            channel.publish("a", "one")
+            channel.publish("b", "two", final=True)
+
+        worker = threading.Thread(target=_publish)
+        worker.start()
+        worker.join()
+        await asyncio.sleep(0)
+        got_mine = [mine.queue.get_nowait() for _ in range(mine.queue.qsize())]
+        got_all = [
+            everything.queue.get_nowait()
+            for _ in range(everything.queue.qsize())
+        ]
+        channel.unsubscribe(mine)
+        channel.unsubscribe(mine)
+        channel.unsubscribe(everything)
+        assert not channel.has_watchers("a")
+        return got_mine, got_all
+
+    got_mine, got_all = asyncio.run(_main())
+    assert got_mine == [(False, "one")]
+    assert got_all == [(False, "one"), (True, "two")]
+
+
+def test_slow_watcher_drops_oldest(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a lagging watcher keeps the newest events.
+
+    :param monkeypatch: Pytest fixture for patching.
+    """
+    monkeypatch.setattr(broadcast, "QUEUE_SIZE", 2)
+
+    async def _main() -> list:
+        watcher = broadcast.Broadcaster().subscribe("a")
+        for i in range(3):
+            watcher.offer((i == 2, str(i)))
+        return [watcher.queue.get_nowait() for _ in range(2)]
+
+    assert asyncio.run(_main()) == [(False, "1"), (True, "2")]
+
+
+def test_publish_to_closed_loop_unsubscribes() -> None:
+    """Test watchers whose event loop is gone are dropped."""
+    channel = broadcast.Broadcaster()
+
+    async def _subscribe() -> None:
+        channel.subscribe("a")
+
+    asyncio.run(_subscribe())
+    channel.publish("a", "late")
+    assert not channel.has_watchers("a")
+
+
+def test_events_unknown_job(client: t.Any) -> None:
+    """Test streaming an unknown job returns 404.
+
+    :param client: Pytest fixture for test client.
+    """
+    r = client.get("/refresh/events/nope")
+    assert r.status_code == 404
+    assert not broadcast.JOB_EVENTS.has_watchers("nope")
+
+
+def test_events_finished_job(
+    client: t.Any,
+    running_job: t.Callable[..., str],
+) -> None:
+    """Test a finished job streams a single final event.
+
+    :param client: Pytest fixture for test client.
+    :param running_job: Pytest fixture registering a running job.
+    """
+    running_job("old", narrativesDone=0)
+    jobs.finish_job("old", "done")
+    r = client.get("/refresh/events/old")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = _events(r.text.splitlines())
+    assert [name for name, _ in events] == ["done"]
+    assert events[0][1]["id"] == "old"
+
+
+def test_events_stream_progress_until_done(
+    client: t.Any,
+    running_job: t.Callable[..., str],
+) -> None:
+    """Test watchers get progress events and the final state.
+
+    :param client: Pytest fixture for test client.
+    :param running_job: Pytest fixture registering a running job.
+    """
+    running_job("live", narrativesDone=0)
+
+    def _work() -> None:
+        while not broadcast.JOB_EVENTS.has_watchers("live"):
+            time.sleep(0.01)
+        jobs.update_job("live", narrativesDone=1)
+        jobs.finish_job("live", "done", narrativesDone=2)
+
+    worker = threading.Thread(target=_work)
+    worker.start()
+    with client.stream("GET", "/refresh/events/live") as r:
+        events = _events(r.iter_lines())
+    worker.join()
+
+    names = [name for name, _ in events]
+    assert names[0] == "progress"
+    assert names[-1] == "done"
+    assert events[-1][1]["narrativesDone"] == 2
+    assert not broadcast.JOB_EVENTS.has_watchers("live")
+
+
+def test_event_stream_keepalive(
+    monkeypatch: pytest.MonkeyPatch,
+    running_job: t.Callable[..., str],
+) -> None:
+    """Test idle streams send keep-alive comments.
+
+    :param monkeypatch: Pytest fixture for patching.
+    :param running_job: Pytest fixture registering a running job.
+    """
+    monkeypatch.setattr(refresh_module, "SSE_KEEPALIVE_SEC", 0.01)
+    running_job("idle", narrativesDone=0)
+
+    async def _main() -> list[str]:
+        watcher = broadcast.JOB_EVENTS.subscribe("idle")
+        first = jobs.get_job("idle")
+        assert first is not None
+        stream = refresh_module._job_event_stream("idle", watcher, first)
+        frames = [await anext(stream), await anext(stream)]
+        jobs.finish_job("idle", "cancelled")
+        frames.extend([frame async for frame in stream])
+        return frames
+
+    frames = asyncio.run(_main())
+    assert frames[0].startswith("event: progress")
+    assert frames[1] == ": keepalive\n\n"
+    assert frames[-1].startswith("event: cancelled")
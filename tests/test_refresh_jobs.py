@@ -9,6 +9,8 @@ import typing as t
 
 import pytest
 
+from backend import jobs
+
 
 def _auth_headers(token: str = "testtoken") -> dict[str, str]:
     return {"Authorization": f"Bearer {token}"}
@@ -27,7 +29,6 @@ def _reload_with_token(
     import backend.api.routes.refresh as rj
 
     importlib.reload(rj)
-    from backend import jobs
 
     importlib.reload(jobs)
     # Clear any existing jobs for test isolation
@@ -35,6 +36,16 @@ def _reload_with_token(
     return rj, jobs
 
 
+def _add_job(jid: str, state: str = "running", **info: t.Any) -> None:
+    # Register a job directly in the registry
+    job = jobs._Job(jid, info)
+    jobs.JOBS[jid] = job
+    if state in jobs.FINISHED:
+        jobs.finish_job(jid, t.cast(jobs.State, state))
+    else:
+        job.state = t.cast(jobs.State, state)
+
+
 def _spin_until(
     cond: t.Callable[[], bool],
     timeout: float = 1.0,
@@ -59,7 +70,7 @@ def test_refresh_async_and_status_done(
     :param monkeypatch: Pytest fixture for patching.
     """
     # Arrange
-    jobs = _reload_with_token(monkeypatch)[1]
+    _reload_with_token(monkeypatch)
 
     # Make the background job fast & deterministic
     # Patch the _run_refresh to tick the state machine without doing any
@@ -101,7 +112,7 @@ def test_refresh_async_error_and_status(
     _reload_with_token(monkeypatch)
 
     # Patch the refresh_all function to raise an error
-    def _boom() -> None:
+    def _boom(_narratives: list[str] | None = None) -> None:
         raise RuntimeError("kaboom")
 
     # Patch at the module level where it's imported
@@ -132,7 +143,6 @@ def test_refresh_async_error_and_status(
 def test_jobs_gc_removes_old_done() -> None:
     """Test that garbage collection removes old completed jobs."""
     # Work directly with the jobs module to hit GC branches
-    from backend import jobs
 
     importlib.reload(jobs)
 
@@ -180,7 +190,7 @@ def test_refresh_async_executes_do_calls(
     # Count calls to the inner functions invoked by _do()
     counters = {"refresh": 0, "mark": 0}
 
-    def fake_refresh_all() -> None:
+    def fake_refresh_all(_narratives: list[str] | None = None) -> None:
         counters["refresh"] += 1
 
     def fake_mark_refreshed() -> None:
@@ -360,7 +370,7 @@ def test_refresh_exception_handling(
     # Mock the refresh_all function to raise an exception
     import backend.api.routes.refresh as refresh_mod
 
-    def mock_refresh_all():
+    def mock_refresh_all(_narratives: list[str] | None = None):
         raise RuntimeError("Simulated error during refresh")
 
     monkeypatch.setattr(refresh_mod, "refresh_all", mock_refresh_all)
@@ -673,10 +683,7 @@ def test_refresh_overview_last_success_at_coverage(
     # Arrange - make auth pass
     _reload_with_token(monkeypatch)
 
-    # Import the module to access its state
-    from backend.api.routes import refresh as refresh_module
-
-    # First, complete a job to set last_success_at
+    # First, complete a job to set lastSuccessAt
     response = client.post("/refresh/async", headers=_auth_headers())
     assert response.status_code == 200
     first_job_id = response.json()["jobId"]
@@ -695,23 +702,8 @@ def test_refresh_overview_last_success_at_coverage(
         timeout=2.0,
     ), "first job did not complete in time"
 
-    # Now manually set up the state to ensure we hit line 394
-    # Set a running job and ensure last_success_at > 0
-    refresh_module.current_running_job = {
-        "id": "test-job-id",
-        "state": "running",
-        "ts": time.time(),
-        "error": None,
-        "jobId": "test-job-id",
-        "mode": "prod",
-        "window": "24h",
-        "narrativesTotal": 1,
-        "narrativesDone": 0,
-        "errors": [],
-    }
-    refresh_module.last_success_at = (
-        time.time() - 10
-    )  # Set a past success time
+    # Now register a running job next to the finished one
+    _add_job("test-job-id", mode="prod", window="24h", narrativesTotal=1)
 
     # Act - check status
     response = client.get("/refresh/status", headers=_auth_headers())
@@ -728,9 +720,6 @@ def test_refresh_overview_last_success_at_coverage(
     assert isinstance(data["lastSuccessAt"], (int, float))
     assert data["lastSuccessAt"] > 0
 
-    # Clean up
-    refresh_module.current_running_job = None
-
 
 def test_start_or_get_running_job_returns_existing_job(
     client: t.Any,  # pylint: disable=unused-argument
@@ -852,11 +841,11 @@ def test_refresh_returns_same_job_id_when_running(
     # Note: No cleanup needed for the new implementation
 
 
-def test_get_job_by_id_coverage(
+def test_get_job_coverage(
     client: t.Any,  # pylint: disable=unused-argument
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    """Test _get_job_by_id function for coverage.
+    """Test job lookup through the registry for coverage.
 
     :param client: Pytest fixture for test client.
     :param monkeypatch: Pytest fixture for patching.
@@ -865,66 +854,26 @@ def test_get_job_by_id_coverage(
     _reload_with_token(monkeypatch)
 
     # Import the function to test
-    from backend.api.routes.refresh import _get_job_by_id, start_or_get_job
+    from backend.api.routes.refresh import start_or_get_job
 
     # Test with no jobs
-    result = _get_job_by_id("nonexistent")
-    assert result is None
+    assert jobs.get_job("nonexistent") is None
 
     # Create a job and test lookup
     job = asyncio.run(start_or_get_job())
     job_id = job["jobId"]
 
-    # Test lookup of running job (covers line 36-37)
-    result = _get_job_by_id(job_id)
+    result = jobs.get_job(job_id)
     assert result is not None
     assert result["id"] == job_id
+    assert result["state"] == "done"
 
-    # Wait for job to complete
-    time.sleep(0.5)
-
-    # Test lookup of completed job (covers line 38-39)
-    result = _get_job_by_id(job_id)
+    # Test lookup of a running job
+    _add_job("running-test-job")
+    result = jobs.get_job("running-test-job")
     assert result is not None
-    assert result["id"] == job_id
-
-
-def test_get_job_by_id_running_job_coverage(
-    client: t.Any,  # pylint: disable=unused-argument
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    """Test _get_job_by_id function specifically for running job coverage.
-
-    :param client: Pytest fixture for test client.
-    :param monkeypatch: Pytest fixture for patching.
-    """
-    # Arrange - make auth pass
-    _reload_with_token(monkeypatch)
-
-    # Import the function to test
-    import backend.api.routes.refresh as refresh_module
-    from backend.api.routes.refresh import _get_job_by_id
-
-    # Set up a running job state directly
-    test_job = {
-        "id": "running-test-job",
-        "state": "running",
-        "ts": 1234567890.0,
-        "error": None,
-        "jobId": "running-test-job",
-    }
-    refresh_module.current_running_job = test_job
-    refresh_module.last_completed_job = None
-
-    # Test lookup of running job (should hit line 38)
-    result = _get_job_by_id("running-test-job")
-    assert result is not None
-    assert result["id"] == "running-test-job"
     assert result["state"] == "running"
 
-    # Clean up
-    refresh_module.current_running_job = None
-
 
 def test_debounce_window_expiry_coverage(
     client: t.Any,  # pylint: disable=unused-argument
@@ -944,13 +893,13 @@ def test_debounce_window_expiry_coverage(
 
     # Create a job and wait for it to complete
     job1 = asyncio.run(start_or_get_job())
-    time.sleep(0.5)  # Wait for completion
+    done = jobs.get_job(job1["jobId"])
+    assert done is not None and done["state"] == "done"
 
-    # Manually set debounce_until to simulate expired debounce window
-    refresh_module.debounce_until = time.time() - 10  # 10 seconds ago
+    # Disable the debounce window so the finished job is not reused
+    monkeypatch.setattr(refresh_module, "DEBOUNCE_SEC", -1)
 
-    # Create another job - this should trigger the debounce expiry code
-    # (line 79)
+    # Create another job - this should skip the expired finished job
     job2 = asyncio.run(start_or_get_job())
 
     # Jobs should be different since debounce window expired
@@ -974,9 +923,9 @@ def test_running_job_status_coverage(
 
     original_refresh_all = refresh_module.refresh_all
 
-    def slow_refresh() -> None:
+    def slow_refresh(narratives: list[str] | None = None) -> None:
         time.sleep(0.1)  # Make the job run for a bit
-        original_refresh_all()
+        original_refresh_all(narratives)
 
     monkeypatch.setattr(refresh_module, "refresh_all", slow_refresh)
 
@@ -1018,44 +967,21 @@ def test_coverage_edge_cases(
     # Arrange - make auth pass
     _reload_with_token(monkeypatch)
 
-    import backend.api.routes.refresh as refresh_module
-    from backend.api.routes.refresh import _get_job_by_id, start_or_get_job
-
-    # Test case 1: Cover line 39 - return last_completed_job in _get_job_by_id
-    # Set up state where current_running_job is None but last_completed_job
-    # exists
-    refresh_module.current_running_job = None
-    refresh_module.last_completed_job = {
-        "id": "test-job-123",
-        "state": "done",
-        "ts": 1234567890.0,
-        "error": None,
-        "jobId": "test-job-123",
-    }
-
-    # This should hit line 39
-    result = _get_job_by_id("test-job-123")
+    from backend.api.routes.refresh import start_or_get_job
+
+    # Test case 1: a finished job can be looked up by id
+    _add_job("test-job-123", "done")
+    result = jobs.get_job("test-job-123")
     assert result is not None
     assert result["id"] == "test-job-123"
 
-    # Test case 2: Cover line 62 - return current_running_job when running
-    # Set up a running job state
-    refresh_module.current_running_job = {
-        "id": "running-job-456",
-        "state": "running",
-        "ts": 1234567890.0,
-        "error": None,
-        "jobId": "running-job-456",
-    }
-    refresh_module.last_started_ts = 1234567890.0
-
-    # This should hit line 62
+    # Test case 2: a running job is reused instead of starting a new one
+    _add_job("running-job-456")
     result = asyncio.run(start_or_get_job())
     assert result["id"] == "running-job-456"
     assert result["state"] == "running"
 
-    # Test case 3: Cover line 210 - return running job in status endpoint
-    # The running job is already set up above
+    # Test case 3: the status endpoint reports the running job
     response = client.get("/refresh/status", headers=_auth_headers())
     assert response.status_code == 200
     data = response.json()
@@ -1063,11 +989,6 @@ def test_coverage_edge_cases(
     assert data["id"] == "running-job-456"
     assert data["state"] == "running"
 
-    # Clean up
-    refresh_module.current_running_job = None
-    refresh_module.last_completed_job = None
-    refresh_module.last_started_ts = 0.0
-
 
 def test_refresh_valueerror_handling(
     client: t.Any,
@@ -1084,7 +1005,7 @@ def test_refresh_valueerror_handling(
     # Mock the refresh_all function to raise a ValueError
     import backend.api.routes.refresh as refresh_mod
 
-    def mock_refresh_all():
+    def mock_refresh_all(_narratives: list[str] | None = None):
         raise ValueError("Invalid value during refresh")
 
     monkeypatch.setattr(refresh_mod, "refresh_all", mock_refresh_all)
@@ -1122,7 +1043,7 @@ def test_refresh_oserror_handling(
     # Mock the refresh_all function to raise an OSError
     import backend.api.routes.refresh as refresh_mod
 
-    def mock_refresh_all():
+    def mock_refresh_all(_narratives: list[str] | None = None):
         raise OSError("File system error during refresh")
 
     monkeypatch.setattr(refresh_mod, "refresh_all", mock_refresh_all)
@@ -1147,7 +1068,6 @@ def test_refresh_oserror_handling(
 
 def test_jobs_start_refresh_job_valueerror() -> None:
     """Test that jobs.start_refresh_job handles exceptions properly."""
-    from backend import jobs
 
     importlib.reload(jobs)
 
@@ -1174,7 +1094,6 @@ def test_jobs_start_refresh_job_valueerror() -> None:
 
 def test_jobs_start_refresh_job_oserror() -> None:
     """Test that jobs.start_refresh_job handles OSError exceptions properly."""
-    from backend import jobs
 
     importlib.reload(jobs)
 
@@ -1267,13 +1186,15 @@ def test_refresh_dev_mode_coverage(  # pylint: disable=too-many-locals
     )
 
     # Run the dev mode job
+    _add_job(job_id)
     _process_dev_mode_job(job_id, mode, window, narratives_total)
 
     # Verify the job was completed successfully
-    assert refresh_module.last_completed_job is not None
-    assert refresh_module.last_completed_job["id"] == job_id
-    assert refresh_module.last_completed_job["state"] == "done"
-    assert refresh_module.current_running_job is None
+    last_job = jobs.last_finished_job()
+    assert last_job is not None
+    assert last_job["id"] == job_id
+    assert last_job["state"] == "done"
+    assert not jobs.list_jobs("running")
 
     # Test dev mode path in start_or_get_job (line 249)
     # This should trigger the dev mode processing
@@ -1289,8 +1210,9 @@ def test_refresh_dev_mode_coverage(  # pylint: disable=too-many-locals
     time.sleep(0.1)
 
     # Verify the job completed successfully
-    assert refresh_module.last_completed_job is not None
-    assert refresh_module.current_running_job is None
+    last_job = jobs.last_finished_job()
+    assert last_job is not None
+    assert not jobs.list_jobs("running")
 
 
 def test_refresh_dev_mode_fallback_coverage(
@@ -1443,18 +1365,7 @@ def test_refresh_dev_mode_exception_handling_coverage(
         raise ValueError(f"Error processing {narrative}")
 
     # Set up a running job state to test error handling
-    refresh_module.current_running_job = {
-        "id": job_id,
-        "state": "running",
-        "ts": time.time(),
-        "error": None,
-        "jobId": job_id,
-        "mode": mode,
-        "window": window,
-        "narrativesTotal": narratives_total,
-        "narrativesDone": 0,
-        "errors": [],
-    }
+    _add_job(job_id)
 
     monkeypatch.setattr(
         "backend.seeds.list_narrative_names",
@@ -1470,20 +1381,21 @@ def test_refresh_dev_mode_exception_handling_coverage(
     _process_dev_mode_job(job_id, mode, window, narratives_total)
 
     # Verify the job was completed with errors (lines 142-154)
-    assert refresh_module.last_completed_job is not None
-    assert refresh_module.last_completed_job["id"] == job_id
-    assert refresh_module.last_completed_job["state"] == "done"
-    assert refresh_module.last_completed_job["errors"] is not None
-    assert len(refresh_module.last_completed_job["errors"]) > 0
+    last_job = jobs.last_finished_job()
+    assert last_job is not None
+    assert last_job["id"] == job_id
+    assert last_job["state"] == "done"
+    assert last_job["errors"] is not None
+    assert len(last_job["errors"]) > 0
     # Check that there's a structured error entry
-    error_entry = refresh_module.last_completed_job["errors"][0]
+    error_entry = last_job["errors"][0]
     assert isinstance(error_entry, dict)
     assert "narrative" in error_entry
     assert "code" in error_entry
     assert "detail" in error_entry
     assert error_entry["code"] == "PROCESSING_ERROR"
     assert "Error processing" in error_entry["detail"]
-    assert refresh_module.current_running_job is None
+    assert not jobs.list_jobs("running")
 
 
 def test_refresh_dev_mode_budget_control_coverage(
@@ -1520,19 +1432,7 @@ def test_refresh_dev_mode_budget_control_coverage(
         ]
 
     # Set up a running job state
-    refresh_module.current_running_job = {
-        "id": job_id,
-        "state": "running",
-        "ts": time.time(),
-        "error": None,
-        "jobId": job_id,
-        "mode": mode,
-        "window": window,
-        "narrativesTotal": narratives_total,
-        "narrativesDone": 0,
-        "errors": [],
-        "calls_used": 0,
-    }
+    _add_job(job_id)
 
     monkeypatch.setattr(
         "backend.api.routes.refresh.list_narrative_names",
@@ -1547,23 +1447,22 @@ def test_refresh_dev_mode_budget_control_coverage(
     _process_dev_mode_job(job_id, mode, window, narratives_total)
 
     # Verify the job was completed with budget error
-    assert refresh_module.last_completed_job is not None
-    assert refresh_module.last_completed_job["id"] == job_id
-    assert refresh_module.last_completed_job["state"] == "done"
-    assert (
-        refresh_module.last_completed_job["calls_used"] == 0
-    )  # Counter starts at 0
+    last_job = jobs.last_finished_job()
+    assert last_job is not None
+    assert last_job["id"] == job_id
+    assert last_job["state"] == "done"
+    assert last_job["calls_used"] == 0  # Counter starts at 0
     assert (
-        refresh_module.last_completed_job["narrativesDone"] == 5
+        last_job["narrativesDone"] == 5
     )  # All narratives processed, but 4 skipped due to cap
-    assert refresh_module.last_completed_job["errors"] is not None
-    assert len(refresh_module.last_completed_job["errors"]) > 0
+    assert last_job["errors"] is not None
+    assert len(last_job["errors"]) > 0
 
     # Check for budget exceeded error
-    budget_error = refresh_module.last_completed_job["errors"][0]
+    budget_error = last_job["errors"][0]
     assert budget_error["code"] == "BUDGET_EXCEEDED"
     assert budget_error["detail"] == "per-narrative cap"
-    assert refresh_module.current_running_job is None
+    assert not jobs.list_jobs("running")
 
 
 def test_refresh_dev_mode_per_narrative_cap_coverage(
@@ -1594,19 +1493,7 @@ def test_refresh_dev_mode_per_narrative_cap_coverage(
         return ["narrative1", "narrative2", "narrative3"]
 
     # Set up a running job state
-    refresh_module.current_running_job = {
-        "id": job_id,
-        "state": "running",
-        "ts": time.time(),
-        "error": None,
-        "jobId": job_id,
-        "mode": mode,
-        "window": window,
-        "narrativesTotal": narratives_total,
-        "narrativesDone": 0,
-        "errors": [],
-        "calls_used": 0,
-    }
+    _add_job(job_id)
 
     monkeypatch.setattr(
         "backend.api.routes.refresh.list_narrative_names",
@@ -1621,22 +1508,21 @@ def test_refresh_dev_mode_per_narrative_cap_coverage(
     _process_dev_mode_job(job_id, mode, window, narratives_total)
 
     # Verify the job was completed with per-narrative cap errors
-    assert refresh_module.last_completed_job is not None
-    assert refresh_module.last_completed_job["id"] == job_id
-    assert refresh_module.last_completed_job["state"] == "done"
-    assert refresh_module.last_completed_job["calls_used"] == 0
-    assert refresh_module.last_completed_job["narrativesDone"] == 3
-    assert refresh_module.last_completed_job["errors"] is not None
-    assert (
-        len(refresh_module.last_completed_job["errors"]) == 2
-    )  # narratives 2 and 3
+    last_job = jobs.last_finished_job()
+    assert last_job is not None
+    assert last_job["id"] == job_id
+    assert last_job["state"] == "done"
+    assert last_job["calls_used"] == 0
+    assert last_job["narrativesDone"] == 3
+    assert last_job["errors"] is not None
+    assert len(last_job["errors"]) == 2  # narratives 2 and 3
 
     # Check for per-narrative cap errors
-    for i, error in enumerate(refresh_module.last_completed_job["errors"]):
+    for i, error in enumerate(last_job["errors"]):
         assert error["code"] == "BUDGET_EXCEEDED"
         assert error["detail"] == "per-narrative cap"
         assert error["narrative"] == f"narrative{i+2}"  # narratives 2 and 3
-    assert refresh_module.current_running_job is None
+    assert not jobs.list_jobs("running")
 
 
 def test_refresh_dev_mode_job_exception_coverage(
@@ -1665,18 +1551,7 @@ def test_refresh_dev_mode_job_exception_coverage(
     narratives_total = 1
 
     # Set up a running job state
-    refresh_module.current_running_job = {
-        "id": job_id,
-        "state": "running",
-        "ts": time.time(),
-        "error": None,
-        "jobId": job_id,
-        "mode": mode,
-        "window": window,
-        "narrativesTotal": narratives_total,
-        "narrativesDone": 0,
-        "errors": [],
-    }
+    _add_job(job_id)
 
     # Mock mark_refreshed to raise an exception (this will trigger the
     # job-level exception handling)
@@ -1692,14 +1567,12 @@ def test_refresh_dev_mode_job_exception_coverage(
         _process_dev_mode_job(job_id, mode, window, narratives_total)
 
     # Verify the job was marked as error (lines 175-193)
-    assert refresh_module.last_completed_job is not None
-    assert refresh_module.last_completed_job["id"] == job_id
-    assert refresh_module.last_completed_job["state"] == "error"
-    assert (
-        refresh_module.last_completed_job["error"]
-        == "Failed to mark refreshed"
-    )
-    assert refresh_module.current_running_job is None
+    last_job = jobs.last_finished_job()
+    assert last_job is not None
+    assert last_job["id"] == job_id
+    assert last_job["state"] == "error"
+    assert last_job["error"] == "Failed to mark refreshed"
+    assert not jobs.list_jobs("running")
 
 
 def test_refresh_dev_mode_start_job_coverage(
@@ -1716,7 +1589,6 @@ def test_refresh_dev_mode_start_job_coverage(
     # Arrange - make auth pass
     _reload_with_token(monkeypatch)
 
-    import backend.api.routes.refresh as refresh_module
     from backend.api.routes.refresh import start_or_get_job
 
     # Test dev mode path in start_or_get_job (line 248)
@@ -1733,5 +1605,6 @@ def test_refresh_dev_mode_start_job_coverage(
     time.sleep(0.1)
 
     # Verify the job completed successfully
-    assert refresh_module.last_completed_job is not None
-    assert refresh_module.current_running_job is None
+    last_job = jobs.last_finished_job()
+    assert last_job is not None
+    assert not jobs.list_jobs("running")
@@ -0,0 +1,224 @@
+"""Tests for per-narrative partial refresh."""
+
+import asyncio
+import time
+import typing as t
+
+import pytest
+from fastapi import HTTPException
+
+import backend.api.routes.refresh as refresh_module
+from backend import jobs
+from backend.parents import compute_all
+from backend.seeds import list_narrative_names
+
+
+def _fresh_meta(fresh: set[str]) -> t.Callable[[str], dict | None]:
+    def _get_meta(narrative: str) -> dict | None:
+        if narrative in fresh:
+            return {"computedAt": time.time()}
+        return None
+
+    return _get_meta
+
+
+def test_resolve_narratives_defaults_to_all() -> None:
+    """Test that no names and no selector means every narrative."""
+    assert refresh_module._resolve_narratives() is None
+    assert refresh_module._resolve_narratives([], "all") is None
+
+
+def test_resolve_narratives_keeps_seed_order_and_dedups() -> None:
+    """Test repeated and comma separated names resolve in seed order."""
+    names = list_narrative_names()
+    first, second = names[0], names[1]
+    result = refresh_module._resolve_narratives(
+        [f"{second}, {first}", first],
+    )
+    assert result == [first, second]
+
+
+def test_resolve_narratives_unknown_name() -> None:
+    """Test that unknown narrative names are rejected."""
+    with pytest.raises(HTTPException) as exc:
+        refresh_module._resolve_narratives(["does-not-exist"])
+    assert exc.value.status_code == 404
+
+
+def test_resolve_narratives_invalid_select() -> None:
+    """Test that an unknown selector is rejected."""
+    with pytest.raises(HTTPException) as exc:
+        refresh_module._resolve_narratives(None, "oldest")
+    assert exc.value.status_code == 400
+
+
+def test_resolve_narratives_stale_selector(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that ``select=stale`` keeps only narratives due for refresh.
+
+    :param monkeypatch: Pytest fixture for patching.
+    """
+    names = list_narrative_names()
+    monkeypatch.setattr(
+        refresh_module,
+        "get_meta",
+        _fresh_meta({names[0]}),
+    )
+    assert refresh_module._resolve_narratives(None, "stale") == names[1:]
+    # names narrow the stale pool
+    assert refresh_module._resolve_narratives(names[:2], "stale") == [
+        names[1],
+    ]
+    assert refresh_module._resolve_narratives([names[0]], "stale") == []
+
+
+def test_refresh_nothing_stale_starts_no_job(
+    client: t.Any,
+    monkeypatch: pytest.MonkeyPatch,
+    running_job: t.Callable[..., str],
+) -> None:
+    """Test an empty stale selection neither queues nor reuses a job.
+
+    :param client: Pytest fixture for test client.
+    :param monkeypatch: Pytest fixture for patching.
+    :param running_job: Pytest fixture registering a running job.
+    """
+    names = set(list_narrative_names())
+    monkeypatch.setattr(refresh_module, "get_meta", _fresh_meta(names))
+    # an unrelated job is running
+    running_job("unrelated", narratives=None)
+    for path in ("/refresh", "/refresh/async"):
+        r = client.post(path, params={"select": "stale"})
+        assert r.status_code == 200
+        assert r.json() == {"jobId": None, "narrativesTotal": 0}
+    assert list(jobs.JOBS) == ["unrelated"]
+
+
+def test_covers() -> None:
+    """Test narrative set coverage between jobs and requests."""
+    assert refresh_module._covers({"narratives": None}, ["a"])
+    assert refresh_module._covers({}, None)
+    assert not refresh_module._covers({"narratives": ["a"]}, None)
+    assert refresh_module._covers({"narratives": ["a", "b"]}, ["b"])
+    assert not refresh_module._covers({"narratives": ["a"]}, ["a", "b"])
+
+
+def test_compute_all_subset() -> None:
+    """Test that compute_all only computes the requested narratives."""
+    names = list_narrative_names()
+    out = compute_all([names[0]])
+    assert list(out) == [names[0]]
+
+
+def test_refresh_dry_run_subset(client: t.Any) -> None:
+    """Test that a dry run previews only the requested narratives.
+
+    :param client: Pytest fixture for test client.
+    """
+    names = list_narrative_names()
+    r = client.post(
+        "/refresh",
+        params={"dryRun": 1, "narratives": f"{names[0]},{names[1]}"},
+    )
+    assert r.status_code == 200
+    assert sorted(r.json()["items"]) == sorted(names[:2])
+
+
+def test_refresh_unknown_narrative_404(client: t.Any) -> None:
+    """Test that refreshing an unknown narrative returns 404.
+
+    :param client: Pytest fixture for test client.
+    """
+    r = client.post("/refresh/async", params={"narratives": "nope"})
+    assert r.status_code == 404
+    assert r.json()["ok"] is False
+
+
+def test_dev_job_refreshes_subset_only(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a dev job processes and counts only its narratives.
+
+    :param monkeypatch: Pytest fixture for patching.
+    """
+    names = list_narrative_names()
+    written: list[str] = []
+    monkeypatch.setattr(
+        refresh_module,
+        "_write_narrative_to_storage",
+        lambda n, _items: written.append(n),
+    )
+    monkeypatch.setattr(refresh_module, "REFRESH_PER_NARRATIVE_CAP", 0)
+
+    job = asyncio.run(
+        refresh_module.start_or_get_job(mode="dev", narratives=[names[1]]),
+    )
+    assert job["narrativesTotal"] == 1
+    assert job["narratives"] == [names[1]]
+
+    done = jobs.last_finished_job()
+    assert done is not None
+    assert done["id"] == job["id"]
+    assert done["narratives"] == [names[1]]
+    assert done["narrativesDone"] == 1
+    assert written == [names[1]]
+
+
+def _add_job(jid: str, state: jobs.State, narratives: list[str]) -> None:
+    job = jobs._Job(jid, {"narratives": narratives})
+    jobs.JOBS[jid] = job
+    if state in jobs.FINISHED:
+        jobs.finish_job(jid, state)
+    else:
+        job.state = state
+
+
+def test_start_or_get_job_dedups_per_narrative_set() -> None:
+    """Test running and debounced jobs are reused only when they cover."""
+    _add_job("running-subset", "running", ["dogs"])
+    jobs._RUNNING.add("running-subset")
+    job = asyncio.run(refresh_module.start_or_get_job(narratives=["dogs"]))
+    assert job["id"] == "running-subset"
+
+    # a full refresh is not covered by a running subset: it is queued
+    queued = asyncio.run(refresh_module.start_or_get_job())
+    assert queued["id"] != "running-subset"
+    assert queued["state"] == "queued"
+    assert jobs.queued_job_ids() == [queued["id"]]
+
+    # and reused while it waits
+    again = asyncio.run(refresh_module.start_or_get_job(narratives=["ai"]))
+    assert again["id"] == queued["id"]
+
+
+def test_start_or_get_job_debounce_per_narrative_set() -> None:
+    """Test a debounced subset job is not reused for another narrative."""
+    _add_job("done-subset", "done", ["dogs"])
+    job = asyncio.run(refresh_module.start_or_get_job(narratives=["dogs"]))
+    assert job["id"] == "done-subset"
+
+    job = asyncio.run(
+        refresh_module.start_or_get_job(mode="dev", narratives=["ai"]),
+    )
+    assert job["id"] != "done-subset"
+    assert job["narrativesTotal"] == 1
+
+
+def test_refresh_queues_behind_running_job(client: t.Any) -> None:
+    """Test the refresh endpoint queues a job for another narrative set.
+
+    :param client: Pytest fixture for test client.
+    """
+    _add_job("running-subset", "running", ["dogs"])
+    jobs._RUNNING.add("running-subset")
+    r = client.post("/refresh", params={"narratives": "ai", "priority": 5})
+    assert r.status_code == 200
+    job_id = r.json()["jobId"]
+    assert job_id != "running-subset"
+
+    status = client.get("/refresh/status").json()
+    assert status["running"] is True
+    assert status["id"] == "running-subset"
+    assert status["queued"] == [job_id]
+    assert client.get(f"/refresh/status/{job_id}").json()["priority"] == 5
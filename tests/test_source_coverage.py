@@ -1,11 +1,13 @@
 """Tests for missing coverage in source.py module."""
 
+import threading
 import time
 from unittest.mock import MagicMock, patch
 
 import requests
 
-from backend.adapters.source import TokenBucket, _get_json
+from backend.adapters.ratelimit import TokenBucket
+from backend.adapters.source import _get_json
 
 
 class TestTokenBucketCoverage:
@@ -564,6 +566,49 @@ class TestDexscreenerCoverage:
         assert len(result) == 1
         assert result[0]["matches"] == 10
 
+    @patch("backend.adapters.source._get_json")
+    def test_parents_for_dexscreener_searches_concurrently(
+        self,
+        mock_get_json: MagicMock,
+    ) -> None:
+        """Test terms are searched together and merged once all answer.
+
+        :param mock_get_json: Mock for the _get_json function.
+        """
+        from backend.adapters.source import parents_for_dexscreener
+
+        # every search waits until all three are in flight
+        together = threading.Barrier(3, timeout=5)
+
+        def _search(_url: str, params: dict, **_kwargs: object) -> dict:
+            together.wait()
+            volume = {"bitcoin": "1000", "ethereum": "3000"}.get(params["q"])
+            if volume is None:
+                raise requests.RequestException("down")
+            return {
+                "pairs": [
+                    {
+                        "baseToken": {
+                            "name": f"Token {params['q']}",
+                            "symbol": "T",
+                            "address": "0xABC",
+                        },
+                        "chainId": "ethereum",
+                        "volume": {"h24": volume},
+                    },
+                ],
+            }
+
+        mock_get_json.side_effect = _search
+        result = parents_for_dexscreener(
+            "test",
+            ["bitcoin", "ethereum", "solana"],
+        )
+        assert not together.broken
+        assert mock_get_json.call_count == 3
+        # one record per (chain, address), the higher vol24h wins
+        assert [r["parent"] for r in result] == ["Token ethereum"]
+
     @patch("backend.adapters.source._get_json")
     @patch("backend.adapters.source.time.sleep")
     def test_parents_for_dexscreener_missing_fields_coverage(
@@ -0,0 +1,56 @@
+"""Tests for the synthetic provider."""
+
+from unittest.mock import MagicMock, patch
+
+from backend.adapters import source
+from backend.parents import _validate_items
+
+
+def test_synthetic_items_are_deterministic() -> None:
+    """Test the same terms and seed give the same parents."""
+    first = source._synthetic_items(["wif", "bonk"], 50, seed=3)
+    assert first == source._synthetic_items(["Bonk ", "wif"], 50, seed=3)
+    assert first != source._synthetic_items(["wif", "bonk"], 50, seed=4)
+    assert len({it["parent"] for it in first}) == 50
+    # valid parents, ranked like provider results
+    assert len(_validate_items(first)) == 50
+    assert first[0]["matches"] == 100
+    assert [it["matches"] for it in first] == sorted(
+        (it["matches"] for it in first),
+        reverse=True,
+    )
+
+
+def test_synthetic_items_have_spread_out_volumes() -> None:
+    """Test volume, liquidity and market cap span orders of magnitude."""
+    items = source._synthetic_items(["dog"], 500)
+    vols = sorted(it["vol24h"] for it in items)
+    assert vols[-1] > 100 * vols[len(vols) // 2] > 0
+    assert all(it["liquidityUsd"] > 0 for it in items)
+    assert all(it["marketCap"] > 0 for it in items)
+    assert {it["chain"] for it in items} == set(source._SYNTHETIC_CHAINS)
+    assert not source._synthetic_items([], 0)
+
+
+@patch.object(source, "cancellable_sleep")
+def test_synthetic_adapter_applies_seed_rules(mock_sleep: MagicMock) -> None:
+    """Test the adapter filters by block lists and injects latency.
+
+    :param mock_sleep: Mock for the cancellable sleep.
+    """
+    adapter = source.Source("synthetic")
+    with (
+        patch.object(source, "SYNTHETIC_PARENTS", 200),
+        patch.object(source, "SYNTHETIC_LATENCY_MS", 40),
+    ):
+        everything = adapter.parents_for("dogs", ["wif", "bonk"])
+        blocked = adapter.parents_for(
+            "dogs",
+            ["wif", "bonk"],
+            block=["scam", "rug", "fake"],
+        )
+    assert len(everything) == 200
+    assert 0 < len(blocked) < 200
+    # one request per term; the second call is served from the memo
+    assert [c.args for c in mock_sleep.call_args_list] == [(0.04,), (0.04,)]
+    assert adapter._impl.fetch_parents("cats", ["cat"])
@@ -0,0 +1,107 @@
+"""Tests for per-job refresh traces."""
+
+import contextvars
+import typing as t
+from unittest.mock import Mock, patch
+
+from backend import tracing
+from backend.adapters.ratelimit import AdaptiveLimiter
+from backend.jobs import get_job_trace
+
+
+def _traced(fn: t.Callable[[], None]) -> dict[str, t.Any]:
+    # run fn as the body of a traced job, return its trace
+    ctx = contextvars.copy_context()
+    trace = ctx.run(tracing.begin)
+    ctx.run(fn)
+    return trace.to_dict()
+
+
+def test_trace_attributes_work_to_narratives() -> None:
+    """Test calls, cache lookups, sleeps and rows are recorded."""
+
+    def _job() -> None:
+        tracing.record_cache("raw", "miss")
+        tracing.narrative_started("dogs")
+        tracing.record_call("ds.test", "200", 0.25, Mock(content=b"12345"))
+        tracing.record_call("ds.test", "304", 0.01, Mock(content=b""))
+        tracing.record_cache("http", "hit")
+        tracing.record_wait("limiter", 0.5)
+        tracing.record_wait("backoff", 1.0)
+        tracing.record_rows(3)
+        tracing.narrative_started("cats")
+        tracing.record_call("cg.test", "error", 2.0)
+
+    trace = _traced(_job)
+    dogs, cats = trace["narratives"]
+    assert dogs["name"] == "dogs"
+    assert dogs["startMs"] <= dogs["endMs"] == cats["startMs"]
+    assert cats["endMs"] is not None
+    assert {k: dogs[k] for k in ("calls", "bytes", "rows")} == {
+        "calls": 2,
+        "bytes": 5,
+        "rows": 3,
+    }
+    assert (dogs["limiterWaitMs"], dogs["backoffMs"]) == (500.0, 1000.0)
+    assert dogs["cacheHits"] == {"http": 1}
+    assert not dogs["cacheMisses"]
+    # lookups outside a narrative count for the job only
+    assert trace["totals"]["cacheMisses"] == {"raw": 1}
+    assert trace["totals"]["calls"] == 3
+
+    calls = trace["calls"]
+    assert [(c["narrative"], c["status"], c["cached"]) for c in calls] == [
+        ("dogs", "200", False),
+        ("dogs", "304", True),
+        ("cats", "error", False),
+    ]
+    assert calls[0]["ms"] == 250.0
+
+
+def test_trace_lists_calls_up_to_the_limit() -> None:
+    """Test calls beyond TRACE_MAX_CALLS are counted, not listed."""
+
+    def _job() -> None:
+        for _ in range(3):
+            tracing.record_call("h", "200", 0.0)
+
+    with patch.object(tracing, "TRACE_MAX_CALLS", 2):
+        trace = _traced(_job)
+    assert len(trace["calls"]) == 2
+    assert trace["callsDropped"] == 1
+    assert trace["totals"]["calls"] == 3
+
+
+def test_nothing_is_recorded_outside_jobs() -> None:
+    """Test the record functions are no-ops without a job trace."""
+    tracing.narrative_started("dogs")
+    tracing.record_call("h", "200", 0.1)
+    tracing.record_cache("raw", "hit")
+    tracing.record_wait("backoff", 1.0)
+    tracing.record_rows(1)
+    assert tracing._TRACE.get() is None
+
+
+def test_limiter_waits_are_traced() -> None:
+    """Test rate-limiter waits add to the job trace."""
+    limiter = AdaptiveLimiter("trace.test", 1000.0, 1)
+    trace = _traced(limiter.acquire)
+    assert trace["totals"]["limiterWaitMs"] >= 0
+
+
+def test_refresh_status_serves_trace(client) -> None:
+    """Test a finished job's trace is served with trace=1.
+
+    :param client: Pytest fixture for test client.
+    """
+    job_id = client.post("/refresh/async?mode=dev").json()["jobId"]
+    status = client.get(f"/refresh/status/{job_id}").json()
+    assert status["state"] == "done"
+    assert "trace" not in status
+
+    trace = client.get(f"/refresh/status/{job_id}?trace=1").json()["trace"]
+    names = [n["name"] for n in trace["narratives"]]
+    assert names == [n["name"] for n in trace["narratives"] if n["endMs"]]
+    assert len(names) == status["narrativesDone"]
+    assert trace["totals"]["rows"] > 0
+    assert get_job_trace("unknown") is None
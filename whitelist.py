@@ -1,69 +1,89 @@
-REGISTRY  # unused variable (backend/adapters/__init__.py:33)
-_make_test  # unused function (backend/adapters/source.py:380)
-_make_dev  # unused function (backend/adapters/source.py:411)
-get_heatmap  # unused function (backend/api/routes/heatmap.py:18)
-list_narratives  # unused function (backend/api/routes/narratives.py:33)
-get_parents_for_narrative  # unused function (backend/api/routes/parents.py:37)
-last_started_ts  # unused variable (backend/api/routes/refresh.py:33)
-refresh_async  # unused function (backend/api/routes/refresh.py:742)
-refresh_status  # unused function (backend/api/routes/refresh.py:761)
-refresh_overview  # unused function (backend/api/routes/refresh.py:785)
-http_exc_handler  # unused function (backend/main.py:55)
-unhandled_exc_handler  # unused function (backend/main.py:69)
-health  # unused function (backend/main.py:88)
-readyz  # unused function (backend/main.py:97)
-boom_for_tests  # unused function (backend/main.py:115)
-updated_at  # unused variable (backend/models.py:46)
+_make_test  # unused function (backend/adapters/source.py:637)
+_make_dev  # unused function (backend/adapters/source.py:668)
+_make_synthetic  # unused function (backend/adapters/source.py:695)
+debug_caches  # unused function (backend/api/routes/debug.py:42)
+debug_profile  # unused function (backend/api/routes/debug.py:58)
+debug_profile_next_job  # unused function (backend/api/routes/debug.py:82)
+debug_profile_job  # unused function (backend/api/routes/debug.py:96)
+debug_profile_requests_toggle  # unused function (backend/api/routes/debug.py:120)
+debug_profile_requests  # unused function (backend/api/routes/debug.py:136)
+get_heatmap  # unused function (backend/api/routes/heatmap.py:19)
+list_narratives  # unused function (backend/api/routes/narratives.py:34)
+get_parents_for_narrative  # unused function (backend/api/routes/parents.py:39)
+refresh_async  # unused function (backend/api/routes/refresh.py:1012)
+refresh_status  # unused function (backend/api/routes/refresh.py:1048)
+refresh_events  # unused function (backend/api/routes/refresh.py:1115)
+refresh_cancel  # unused function (backend/api/routes/refresh.py:1144)
+refresh_overview  # unused function (backend/api/routes/refresh.py:1167)
+http_exc_handler  # unused function (backend/main.py:65)
+unhandled_exc_handler  # unused function (backend/main.py:79)
+health  # unused function (backend/main.py:99)
+readyz  # unused function (backend/main.py:108)
+boom_for_tests  # unused function (backend/main.py:126)
+updated_at  # unused variable (backend/models.py:54)
+liquidityUsd  # unused variable (backend/records.py:44)
 dex  # unused variable (backend/schemas.py:13)
 liquidityUsd  # unused variable (backend/schemas.py:36)
 lastRefresh  # unused variable (backend/schemas.py:44)
 lastUpdated  # unused variable (backend/schemas.py:46)
 nextCursor  # unused variable (backend/schemas.py:57)
 RefreshResp  # unused class (backend/schemas.py:60)
-ok  # unused variable (backend/schemas.py:63)
 dryRun  # unused variable (backend/schemas.py:66)
 JobState  # unused class (backend/schemas.py:70)
 jobId  # unused variable (backend/schemas.py:73)
-running  # unused variable (backend/schemas.py:74)
 startedAt  # unused variable (backend/schemas.py:75)
 narrativesTotal  # unused variable (backend/schemas.py:78)
-_init_db  # unused function (tests/conftest.py:30)
-_clear_refresh_token_env  # unused function (tests/conftest.py:45)
-_clear_refresh_module_state  # unused function (tests/conftest.py:54)
-_.last_started_ts  # unused attribute (tests/conftest.py:66)
-_clear_search_cache  # unused function (tests/conftest.py:69)
+_init_db  # unused function (tests/conftest.py:34)
+_clear_refresh_token_env  # unused function (tests/conftest.py:49)
+_clear_refresh_module_state  # unused function (tests/conftest.py:58)
+_clear_search_cache  # unused function (tests/conftest.py:71)
+_clear_call_ledger  # unused function (tests/conftest.py:84)
+_reset_breakers  # unused function (tests/conftest.py:93)
+_clear_http_cache  # unused function (tests/conftest.py:105)
+executor_pools  # unused function (tests/conftest.py:142)
 _dummy  # unused function (tests/test_adapter_registry_extra.py:12)
 _.side_effect  # unused attribute (tests/test_blend_adapter.py:211)
 _.side_effect  # unused attribute (tests/test_blend_adapter.py:215)
+_.side_effect  # unused attribute (tests/test_breaker.py:117)
+_.side_effect  # unused attribute (tests/test_breaker.py:145)
+_.side_effect  # unused attribute (tests/test_breaker.py:149)
 _.side_effect  # unused attribute (tests/test_coingecko_adapter.py:105)
 _.side_effect  # unused attribute (tests/test_coingecko_adapter.py:174)
 _.side_effect  # unused attribute (tests/test_coingecko_adapter.py:528)
-_.side_effect  # unused attribute (tests/test_dexscreener_adapter.py:92)
-_.side_effect  # unused attribute (tests/test_dexscreener_adapter.py:223)
+_.side_effect  # unused attribute (tests/test_deadline.py:88)
+_.side_effect  # unused attribute (tests/test_deadline.py:110)
+_.side_effect  # unused attribute (tests/test_deadline.py:221)
+_.side_effect  # unused attribute (tests/test_dexscreener_adapter.py:95)
+_.side_effect  # unused attribute (tests/test_dexscreener_adapter.py:226)
+_.side_effect  # unused attribute (tests/test_httpcache.py:65)
+_.side_effect  # unused attribute (tests/test_httpcache.py:99)
+_.side_effect  # unused attribute (tests/test_httpcache.py:114)
+_.side_effect  # unused attribute (tests/test_metrics.py:52)
+_.side_effect  # unused attribute (tests/test_metrics.py:74)
 _.side_effect  # unused attribute (tests/test_mixed_adapter.py:385)
 _.side_effect  # unused attribute (tests/test_mixed_adapter.py:444)
 _.side_effect  # unused attribute (tests/test_mixed_adapter.py:470)
 _.side_effect  # unused attribute (tests/test_mixed_adapter.py:474)
-_.last_started_ts  # unused attribute (tests/test_refresh_jobs.py:1050)
-_.last_started_ts  # unused attribute (tests/test_refresh_jobs.py:1069)
+_.side_effect  # unused attribute (tests/test_ratelimit.py:149)
 _.side_effect  # unused attribute (tests/test_search_cache.py:129)
 _.side_effect  # unused attribute (tests/test_search_cache.py:166)
 FakeClient  # unused class (tests/test_source_cg.py:63)
 make_resp  # unused function (tests/test_source_cg.py:91)
 _.side_effect  # unused attribute (tests/test_source_cg_methods.py:162)
 _.side_effect  # unused attribute (tests/test_source_cg_methods.py:335)
-_.side_effect  # unused attribute (tests/test_source_coverage.py:67)
-_.side_effect  # unused attribute (tests/test_source_coverage.py:74)
-_.side_effect  # unused attribute (tests/test_source_coverage.py:102)
-_.side_effect  # unused attribute (tests/test_source_coverage.py:109)
-_.side_effect  # unused attribute (tests/test_source_coverage.py:130)
-_.side_effect  # unused attribute (tests/test_source_coverage.py:137)
-_.side_effect  # unused attribute (tests/test_source_coverage.py:158)
-_.side_effect  # unused attribute (tests/test_source_coverage.py:178)
-_.side_effect  # unused attribute (tests/test_source_coverage.py:200)
-_.side_effect  # unused attribute (tests/test_source_coverage.py:223)
-_.side_effect  # unused attribute (tests/test_source_coverage.py:263)
-_.side_effect  # unused attribute (tests/test_source_coverage.py:277)
-_.side_effect  # unused attribute (tests/test_source_coverage.py:293)
-_.side_effect  # unused attribute (tests/test_source_coverage.py:387)
-_.side_effect  # unused attribute (tests/test_source_coverage.py:446)
+_.side_effect  # unused attribute (tests/test_source_coverage.py:69)
+_.side_effect  # unused attribute (tests/test_source_coverage.py:76)
+_.side_effect  # unused attribute (tests/test_source_coverage.py:104)
+_.side_effect  # unused attribute (tests/test_source_coverage.py:111)
+_.side_effect  # unused attribute (tests/test_source_coverage.py:132)
+_.side_effect  # unused attribute (tests/test_source_coverage.py:139)
+_.side_effect  # unused attribute (tests/test_source_coverage.py:160)
+_.side_effect  # unused attribute (tests/test_source_coverage.py:180)
+_.side_effect  # unused attribute (tests/test_source_coverage.py:202)
+_.side_effect  # unused attribute (tests/test_source_coverage.py:225)
+_.side_effect  # unused attribute (tests/test_source_coverage.py:265)
+_.side_effect  # unused attribute (tests/test_source_coverage.py:279)
+_.side_effect  # unused attribute (tests/test_source_coverage.py:295)
+_.side_effect  # unused attribute (tests/test_source_coverage.py:389)
+_.side_effect  # unused attribute (tests/test_source_coverage.py:448)
+_.side_effect  # unused attribute (tests/test_source_coverage.py:602)